@@ -32,4 +32,108 @@ TAKE_SCREENSHOTS = os.getenv("TAKE_SCREENSHOTS", "true").lower() == "true"
 SCREENSHOT_DIR = "reports/screenshots"
 
 
+EVENTS_DIR = os.getenv("EVENTS_DIR", "reports/events")
+STREAM_REPORT = os.getenv("STREAM_REPORT", "reports/stream_report.html")
+
+
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", "reports/artifacts")
+ARTIFACT_MAX_AGE_DAYS = float(os.getenv("ARTIFACT_MAX_AGE_DAYS", "30"))
+ARTIFACT_MAX_SIZE_MB = float(os.getenv("ARTIFACT_MAX_SIZE_MB", "2048"))
+
+
+FLIGHT_RECORDER = os.getenv("FLIGHT_RECORDER", "false").lower() == "true"
+FLIGHT_RECORDER_SECONDS = float(os.getenv("FLIGHT_RECORDER_SECONDS", "10"))
+FLIGHT_RECORDER_FPS = float(os.getenv("FLIGHT_RECORDER_FPS", "4"))
+FLIGHT_RECORDER_MAX_MB = float(os.getenv("FLIGHT_RECORDER_MAX_MB", "32"))
+
+
+NETWORK_STATS = os.getenv("NETWORK_STATS", "false").lower() == "true"
+
+
+ROUTE_LATENCY = os.getenv("ROUTE_LATENCY", "false").lower() == "true"
+ROUTE_LATENCY_DIR = os.getenv("ROUTE_LATENCY_DIR", "reports/route_latency")
+ROUTE_LATENCY_REPORT = os.getenv("ROUTE_LATENCY_REPORT", "reports/route_latency.json")
+
+
+STATIC_CACHE = os.getenv("STATIC_CACHE", "false").lower() == "true"
+STATIC_CACHE_DIR = os.getenv("STATIC_CACHE_DIR", ".static_cache")
+STATIC_CACHE_MAX_MB = float(os.getenv("STATIC_CACHE_MAX_MB", "512"))
+STATIC_CACHE_TTL = float(os.getenv("STATIC_CACHE_TTL", "3600"))
+
+
+ADAPTIVE_TIMEOUTS = os.getenv("ADAPTIVE_TIMEOUTS", "false").lower() == "true"
+ADAPTIVE_TIMEOUT_MULTIPLE = float(os.getenv("ADAPTIVE_TIMEOUT_MULTIPLE", "3"))
+ADAPTIVE_TIMEOUT_FLOOR = int(os.getenv("ADAPTIVE_TIMEOUT_FLOOR", "2000"))
+ADAPTIVE_TIMEOUT_CEILING = int(os.getenv("ADAPTIVE_TIMEOUT_CEILING", str(DEFAULT_TIMEOUT)))
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = int(os.getenv("ADAPTIVE_TIMEOUT_MIN_SAMPLES", "5"))
+
+
+STABILIZE = os.getenv("STABILIZE", "false").lower() == "true"
+STABILIZE_OVERLAYS = [
+    selector for selector in os.getenv(
+        "STABILIZE_OVERLAYS",
+        "#cookie-consent,.cookie-consent,.cookie-banner,#cookie-notice,.cc-window,#onetrust-banner-sdk",
+    ).split(",") if selector.strip()
+]
+
+
+# Fill page-object forms in one in-page evaluation instead of field by field
+FORM_FILL_BATCHED = os.getenv("FORM_FILL_BATCHED", "true").lower() == "true"
+
+
+# Product the checkout_page fixture puts in the cart over HTTP
+CHECKOUT_PRODUCT_ID = int(os.getenv("CHECKOUT_PRODUCT_ID", "28"))
+
+# Account seeding over HTTP: opt-in because every seeded class registers a
+# customer and places real orders on the shop; parallel sessions and the
+# products that go on seeded wish lists (no required options, so they add
+# in one request)
+SEED_ACCOUNTS = os.getenv("SEED_ACCOUNTS", "false").lower() == "true"
+SEED_WORKERS = int(os.getenv("SEED_WORKERS", "8"))
+SEED_PRODUCT_IDS = [
+    int(product_id) for product_id in os.getenv("SEED_PRODUCT_IDS", "28,29,30,33,34,36,40,43,46,48,49").split(",")
+    if product_id.strip()
+]
+
+
+# Chrome trace + V8 CPU profile per test (Chromium only)
+PERF_TRACE = os.getenv("PERF_TRACE", "false").lower() == "true"
+
+# --workers=auto-perf: worker count from the measured per-worker footprint
+# (browser RSS and CPU) and the machine's free memory and cores; idle
+# workers pause while system memory use is above AUTOSCALE_MEMORY_THRESHOLD
+AUTOSCALE_MEMORY_MARGIN = float(os.getenv("AUTOSCALE_MEMORY_MARGIN", "0.2"))
+AUTOSCALE_MEMORY_THRESHOLD = float(os.getenv("AUTOSCALE_MEMORY_THRESHOLD", "90"))
+AUTOSCALE_HISTORY_MAX_AGE_HOURS = float(os.getenv("AUTOSCALE_HISTORY_MAX_AGE_HOURS", "24"))
+AUTOSCALE_MAX_WORKERS = int(os.getenv("AUTOSCALE_MAX_WORKERS", "0"))
+
+# Buffered logging (opt-in, or --buffer-logs): records are kept per test in a
+# ring buffer and only written when the test fails; LOG_CONSOLE_LEVEL and up
+# are written between tests. It replaces pytest's logging plugin, so caplog
+# and --log-level/--log-cli-* need it off.
+LOG_BUFFER = os.getenv("LOG_BUFFER", "false").lower() == "true"
+LOG_BUFFER_CAPACITY = int(os.getenv("LOG_BUFFER_CAPACITY", "500"))
+LOG_CONSOLE_LEVEL = os.getenv("LOG_CONSOLE_LEVEL", "WARNING").upper()
+
+# Python-side profile of every test: IPC wait vs harness vs test code
+PROFILE_TESTS = os.getenv("PROFILE_TESTS", "false").lower() == "true"
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "reports/profiles")
+PROFILE_REPORT = os.getenv("PROFILE_REPORT", "reports/profile_hotspots.json")
+
+
+SITE_HEALTH = os.getenv("SITE_HEALTH", "true").lower() == "true"
+SITE_HEALTH_DIR = os.getenv("SITE_HEALTH_DIR", "reports/site_health")
+SITE_HEALTH_ROUTES = os.getenv(
+    "SITE_HEALTH_ROUTES", "common/home,account/login,account/register,checkout/cart"
+).split(",")
+SITE_HEALTH_TIMEOUT = float(os.getenv("SITE_HEALTH_TIMEOUT", "10"))
+SITE_HEALTH_FAILURE_THRESHOLD = int(os.getenv("SITE_HEALTH_FAILURE_THRESHOLD", "3"))
+
+
+BROWSER_SERVER_DIR = os.getenv("BROWSER_SERVER_DIR", ".browser_server")
+BROWSER_SERVER_IDLE_SECONDS = float(os.getenv("BROWSER_SERVER_IDLE_SECONDS", "900"))
+BROWSER_POOL = [endpoint for endpoint in os.getenv("BROWSER_POOL", "").split(",") if endpoint.strip()]
+
+
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
\ No newline at end of file
@@ -1,70 +1,358 @@
 import pytest
 import logging
-import os
+import tempfile
 from pathlib import Path
+from contextlib import contextmanager
 from playwright.sync_api import sync_playwright, Page
+from config import (
+    BASE_URL, DEFAULT_TIMEOUT, NAVIGATION_TIMEOUT, HEADLESS, SLOW_MO, BROWSER_SERVER_DIR,
+    BROWSER_SERVER_IDLE_SECONDS, BROWSER_POOL, ARTIFACT_DIR, FLIGHT_RECORDER, FLIGHT_RECORDER_SECONDS,
+    FLIGHT_RECORDER_FPS, FLIGHT_RECORDER_MAX_MB, NETWORK_STATS, ROUTE_LATENCY, STATIC_CACHE,
+    STATIC_CACHE_DIR, STATIC_CACHE_MAX_MB, STATIC_CACHE_TTL, CHECKOUT_PRODUCT_ID,
+    SEED_ACCOUNTS, SEED_WORKERS, SEED_PRODUCT_IDS, PERF_TRACE
+)
+from pages import CheckoutPage
+from utils.artifact_store import ArtifactStore
+from utils.browser_server import BrowserServer, close_stale_contexts
+from utils.browser_pool import BrowserPool, PooledBrowser
+from utils.checkout_session import CheckoutFastForward
+from utils.seeding import Seeder
+from utils.flight_recorder import FlightRecorder
+from utils.network_recorder import NetworkRecorder
+from utils.perf_trace import PerfTrace
+from utils.readonly_pages import ReadonlyPagePool
+from utils.thread_runner import current_worker
+from utils.route_latency import get_collector
+from utils.static_cache import StaticAssetCache
+from utils import dom_waiters, stabilization
+from utils.event_stream import emit, current_run_id
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+pytest_plugins = ["pytest_plugins"]
+
 logger = logging.getLogger(__name__)
 
 
-BASE_URL = "https://ecommerce-playground.lambdatest.io"
+def browser_pool_endpoints(config) -> list:
+    option = config.getoption("browser_pool")
+    if option:
+        return [endpoint.strip() for endpoint in option.split(",") if endpoint.strip()]
+    return BROWSER_POOL
 
 @pytest.fixture(scope="session")
-def browser():
+def browser(request):
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False, slow_mo=500)
-        logger.info("Browser launched")
-        yield browser
-        browser.close()
-        logger.info("Browser closed")
+        pool_endpoints = browser_pool_endpoints(request.config)
+        if pool_endpoints:
+            pool = BrowserPool(
+                p, pool_endpoints, BROWSER_SERVER_DIR, current_run_id(),
+                current_worker(), slow_mo=SLOW_MO,
+            )
+            browser = PooledBrowser(pool)
+            yield browser
+            close_stale_contexts(browser)
+            browser.close()
+            return
+
+        if not request.config.getoption("reuse_browser"):
+            browser = p.chromium.launch(headless=HEADLESS, slow_mo=SLOW_MO)
+            logger.info("Browser launched")
+            yield browser
+            browser.close()
+            logger.info("Browser closed")
+            return
+
+        server = BrowserServer(BROWSER_SERVER_DIR, {"headless": HEADLESS}, BROWSER_SERVER_IDLE_SECONDS)
+        server.acquire()
+        try:
+            browser = p.chromium.connect(server.ensure(), slow_mo=SLOW_MO)
+            logger.info("Connected to warm browser server")
+            yield browser
+            closed = close_stale_contexts(browser)
+            if closed:
+                logger.info(f"Closed {closed} contexts left open by tests")
+            # Only drops this connection; the server stays up for the next run
+            browser.close()
+        finally:
+            server.release()
+
+@pytest.fixture(scope="session")
+def static_asset_cache(request):
+    if not (request.config.getoption("static_cache") or STATIC_CACHE):
+        yield None
+        return
+
+    cache = StaticAssetCache(
+        STATIC_CACHE_DIR,
+        max_bytes=int(STATIC_CACHE_MAX_MB * 1024 * 1024),
+        default_ttl=STATIC_CACHE_TTL,
+    )
+    yield cache
+    logger.info(f"Static cache stats: {cache.stats()}")
+    cache.record_run(current_run_id(), current_worker())
+    cache.close()
+
+def setup_context(context, static_asset_cache, stabilize=True):
+    if static_asset_cache is not None:
+        static_asset_cache.install(context)
+    dom_waiters.install(context)
+    stabilization.current().install(context, opted_out=not stabilize)
 
 @pytest.fixture
-def context(browser):
-    context = browser.new_context(viewport={"width": 1920, "height": 1080})
+def context(browser, static_asset_cache, request):
+    stabilize = request.node.get_closest_marker("no_stabilization") is None
+    context = browser.new_context(
+        viewport={"width": 1920, "height": 1080},
+        **stabilization.current().context_options(opted_out=not stabilize),
+    )
+    setup_context(context, static_asset_cache, stabilize)
     logger.info("New browser context created")
     yield context
     context.close()
     logger.info("Browser context closed")
 
+def route_latency_enabled(config) -> bool:
+    return config.getoption("route_latency") or ROUTE_LATENCY
+
 @pytest.fixture
-def page(context):
-    page = context.new_page()
+def network_recorder(context, request):
+    enabled = (
+        request.config.getoption("network_stats")
+        or NETWORK_STATS
+        or route_latency_enabled(request.config)
+        or request.node.get_closest_marker("page_weight_budget") is not None
+    )
+    if not enabled:
+        yield None
+        return
 
+    route_latency = get_collector(BASE_URL) if route_latency_enabled(request.config) else None
+    recorder = NetworkRecorder(context, route_latency=route_latency)
+    yield recorder
 
-    page.set_default_timeout(30000)
-    page.set_default_navigation_timeout(30000)
+    summary = recorder.summary()
+    request.node.network_summary = summary
+    logger.info(
+        f"Network: {summary['requests']} requests, {summary['bytes']} bytes, "
+        f"{summary['cache_hits']} cache hits"
+    )
+    emit("network", **summary)
+    recorder.detach()
 
-    logger.info("New page created")
-    yield page
+@pytest.fixture(scope="session")
+def artifact_store():
+    store = ArtifactStore(ARTIFACT_DIR)
+    yield store
+    store.close()
+
+def attach_artifact(request, artifact_store, data: bytes, kind: str, name: str, **details):
+    digest = artifact_store.put(
+        data,
+        nodeid=request.node.nodeid,
+        kind=kind,
+        name=name,
+        run=current_run_id(),
+    )
+    blob_path = artifact_store.blob_path(digest)
+    request.node.artifacts = getattr(request.node, "artifacts", []) + [
+        {"kind": kind, "hash": digest, "path": str(blob_path)}
+    ]
+    emit("artifact", kind=kind, hash=digest, path=str(blob_path), **details)
+    return blob_path
+
+def flight_recorder_enabled(config) -> bool:
+    return config.getoption("flight_recorder") or FLIGHT_RECORDER
+
+def perf_trace_enabled(request) -> bool:
+    return (
+        request.config.getoption("perf_trace")
+        or PERF_TRACE
+        or request.node.get_closest_marker("perf_trace") is not None
+    )
+
+def save_perf_trace(request, artifact_store, tracer: PerfTrace):
+    name = f"{request.node.name}-{tracer.label}"
+    trace_path = attach_artifact(
+        request, artifact_store, tracer.trace_json(), "perf_trace", f"{name}.json", label=tracer.label
+    )
+    profile_path = attach_artifact(
+        request, artifact_store, tracer.cpuprofile_json(), "cpuprofile", f"{name}.cpuprofile", label=tracer.label
+    )
+    # Reaches the controller with the teardown report, also under xdist
+    request.node.user_properties.append(("perf_trace", tracer.summary()))
+    logger.info(f"Performance trace saved: {trace_path} (CPU profile {profile_path})")
+
+@pytest.fixture(scope="session")
+def readonly_pages(browser, static_asset_cache):
+    pool = ReadonlyPagePool(
+        browser,
+        {"viewport": {"width": 1920, "height": 1080}, **stabilization.current().context_options()},
+        lambda context: setup_context(context, static_asset_cache),
+    )
+    yield pool
+    logger.info(f"Shared read-only pages: {pool.stats()}")
+    emit("readonly_pages", **pool.stats())
+    pool.close()
+
+def capture_screenshot(request, artifact_store, page):
+    try:
+        blob_path = attach_artifact(
+            request, artifact_store, page.screenshot(), "screenshot", f"{request.node.name}.png"
+        )
+        logger.info(f"Screenshot saved: {blob_path}")
+    except Exception as e:
+        logger.error(f"Failed to capture screenshot: {e}")
 
+def shared_page(request, artifact_store, marker):
+    # Tests marked readonly_page reuse one loaded page per module and worker
+    url = marker.kwargs.get("url", marker.args[0] if marker.args else None)
+    prepare = marker.kwargs.get("prepare")
+    key = (request.node.module.__name__, url, getattr(prepare, "__qualname__", None))
+    pool = request.getfixturevalue("readonly_pages")
+    page = pool.checkout(key, url, prepare)
+    page.set_default_timeout(DEFAULT_TIMEOUT)
+    page.set_default_navigation_timeout(NAVIGATION_TIMEOUT)
+    logger.info(f"Using shared read-only page for {url}")
+    yield page
 
     if not page.is_closed():
+        capture_screenshot(request, artifact_store, page)
+    rep_call = getattr(request.node, "rep_call", None)
+    reasons = pool.checkin(key, request.node.nodeid, failed=rep_call is None or rep_call.failed)
+    if reasons and rep_call is not None and rep_call.passed:
+        emit("readonly_page_mutated", reasons=reasons)
+
+def shared_pages_allowed(request) -> bool:
+    config = request.config
+    # The shared context always follows the run-wide stabilization setting,
+    # and run-wide recorders need a page of the test's own
+    if request.node.get_closest_marker("no_stabilization") is not None or config.getoption("no_shared_pages"):
+        return False
+    return not (
+        config.getoption("network_stats") or NETWORK_STATS or route_latency_enabled(config)
+        or flight_recorder_enabled(config) or perf_trace_enabled(request)
+    )
+
+@pytest.fixture
+def page(request, artifact_store):
+    marker = request.node.get_closest_marker("readonly_page")
+    if marker is not None and shared_pages_allowed(request):
+        yield from shared_page(request, artifact_store, marker)
+        return
 
-        screenshot_dir = Path("reports/screenshots")
-        screenshot_dir.mkdir(parents=True, exist_ok=True)
+    # Requested here so a shared page never opens a context of its own
+    context = request.getfixturevalue("context")
+    network_recorder = request.getfixturevalue("network_recorder")
+    page = context.new_page()
+    if network_recorder is not None:
+        network_recorder.attach(page)
 
 
-        test_name = page.context.browser.contexts[0].__dict__.get('_name', 'unknown')
-        screenshot_path = screenshot_dir / f"{test_name}.png"
+    page.set_default_timeout(DEFAULT_TIMEOUT)
+    page.set_default_navigation_timeout(NAVIGATION_TIMEOUT)
 
-        try:
-            page.screenshot(path=str(screenshot_path))
-            logger.info(f"Screenshot saved: {screenshot_path}")
-        except Exception as e:
-            logger.error(f"Failed to capture screenshot: {e}")
+    recorder = None
+    if flight_recorder_enabled(request.config):
+        recorder = FlightRecorder(
+            page,
+            seconds=FLIGHT_RECORDER_SECONDS,
+            fps=FLIGHT_RECORDER_FPS,
+            max_bytes=int(FLIGHT_RECORDER_MAX_MB * 1024 * 1024),
+        )
+        recorder.start()
+
+    tracer = None
+    if perf_trace_enabled(request):
+        tracer = PerfTrace(page, "test")
+        tracer.start()
+
+    logger.info("New page created")
+    yield page
+
+    if tracer is not None and not page.is_closed():
+        tracer.stop()
+        save_perf_trace(request, artifact_store, tracer)
 
+    if recorder is not None:
+        recorder.stop()
+        logger.info(f"Flight recorder stats: {recorder.stats}")
+        rep_call = getattr(request.node, "rep_call", None)
+        if rep_call is not None and rep_call.failed and recorder.frames:
+            try:
+                with tempfile.TemporaryDirectory() as tmp:
+                    clip = recorder.encode(tmp, request.node.name)
+                    blob_path = attach_artifact(
+                        request, artifact_store, clip.read_bytes(), "screencast", clip.name, **recorder.stats
+                    )
+                logger.info(f"Flight recorder clip saved: {blob_path}")
+            except Exception as e:
+                logger.error(f"Failed to save flight recorder clip: {e}")
+
+    if not page.is_closed():
+
+        capture_screenshot(request, artifact_store, page)
         page.close()
         logger.info("Page closed")
 
+@pytest.fixture
+def perf_trace(page, request, artifact_store):
+    # with perf_trace("checkout"): ... traces just that block of actions
+    @contextmanager
+    def capture(label: str):
+        tracer = PerfTrace(page, label)
+        tracer.start()
+        try:
+            yield tracer
+        finally:
+            tracer.stop()
+            save_perf_trace(request, artifact_store, tracer)
+    return capture
+
 @pytest.fixture(scope="session")
 def base_url():
     return BASE_URL
 
+@pytest.fixture
+def checkout_page(page, login_credentials, request):
+    # Reaches the checkout_stage marker's stage over HTTP, then opens the checkout
+    marker = request.node.get_closest_marker("checkout_stage")
+    options = dict(marker.kwargs) if marker is not None else {}
+    stage = options.pop("stage", marker.args[0] if marker is not None and marker.args else "cart")
+    options.setdefault("product_id", CHECKOUT_PRODUCT_ID)
+
+    CheckoutFastForward(page.context.request, BASE_URL).to_stage(
+        stage, login_credentials["valid_email"], login_credentials["valid_password"], **options
+    )
+    page.goto(f"{BASE_URL}/index.php?route=checkout/checkout")
+    return CheckoutPage(page)
+
+@pytest.fixture(scope="class")
+def seeded_account(request):
+    # A fresh customer per class, with the history its seed marker asks for;
+    # None when seeding is off, so tests fall back to the shared account
+    if not (request.config.getoption("seed_accounts") or SEED_ACCOUNTS):
+        return None
+    marker = request.node.get_closest_marker("seed")
+    options = marker.kwargs if marker is not None else {}
+    wishlist = options.get("wishlist", 0)
+    if wishlist > len(SEED_PRODUCT_IDS):
+        raise pytest.UsageError(f"seed(wishlist={wishlist}) needs more than the {len(SEED_PRODUCT_IDS)} SEED_PRODUCT_IDS")
+
+    seeder = Seeder(BASE_URL, workers=SEED_WORKERS)
+    try:
+        account = seeder.create_account(prefix=f"seed-{current_worker()}")
+        seeded = seeder.seed(
+            account,
+            orders=options.get("orders", 0),
+            wishlist=SEED_PRODUCT_IDS[:wishlist],
+            addresses=options.get("addresses", 0),
+            order_product_id=CHECKOUT_PRODUCT_ID,
+        )
+    finally:
+        seeder.close()
+    emit("seed", email=account["email"], **seeded)
+    return {"email": account["email"], "password": account["password"], **seeded}
+
 @pytest.fixture
 def login_credentials():
     return {
@@ -1,9 +1,12 @@
 from playwright.sync_api import Page
 import logging
+from utils.adaptive_timeouts import adaptive_actions
+from utils.form_fill import FormFiller
 
 logger = logging.getLogger(__name__)
 
 
+@adaptive_actions
 class AccountPage:
 
     def __init__(self, page: Page):
@@ -46,6 +49,7 @@ class AccountPage:
         self.logout_link.click()
 
 
+@adaptive_actions
 class OrderHistoryPage:
 
     def __init__(self, page: Page):
@@ -73,21 +77,21 @@ class OrderHistoryPage:
 
     def get_orders_count(self) -> int:
         count = self.orders_table.count()
-        logger.info(f"Orders count: {count}")
+        logger.info("Orders count: %s", count)
         return count
 
     def click_order(self, order_index: int):
-        logger.info(f"Clicking order at index {order_index}")
+        logger.info("Clicking order at index %s", order_index)
         self.order_ids.nth(order_index).click()
 
     def get_order_status(self, order_index: int) -> str:
         status = self.order_statuses.nth(order_index).inner_text()
-        logger.info(f"Order status: {status}")
+        logger.info("Order status: %s", status)
         return status
 
     def get_order_total(self, order_index: int) -> str:
         total = self.order_totals.nth(order_index).inner_text()
-        logger.info(f"Order total: {total}")
+        logger.info("Order total: %s", total)
         return total
 
     def reorder_product(self):
@@ -100,10 +104,11 @@ class OrderHistoryPage:
 
     def get_order_items_count(self) -> int:
         count = self.order_items.count()
-        logger.info(f"Order items count: {count}")
+        logger.info("Order items count: %s", count)
         return count
 
 
+@adaptive_actions
 class WishListPage:
 
     def __init__(self, page: Page):
@@ -116,18 +121,19 @@ class WishListPage:
 
     def get_wishlist_items_count(self) -> int:
         count = self.wishlist_items.count()
-        logger.info(f"Wish list items count: {count}")
+        logger.info("Wish list items count: %s", count)
         return count
 
     def add_item_to_cart(self, item_index: int):
-        logger.info(f"Adding wish list item {item_index} to cart")
+        logger.info("Adding wish list item %s to cart", item_index)
         self.add_to_cart_buttons.nth(item_index).click()
 
     def remove_item(self, item_index: int):
-        logger.info(f"Removing wish list item {item_index}")
+        logger.info("Removing wish list item %s", item_index)
         self.remove_buttons.nth(item_index).click()
 
 
+@adaptive_actions
 class AddressBookPage:
 
     def __init__(self, page: Page):
@@ -146,26 +152,35 @@ class AddressBookPage:
         self.country = page.locator("select[name='country_id']")
         self.state = page.locator("select[name='zone_id']")
         self.save_button = page.get_by_role("button", name="Save")
+        self.address_form = FormFiller(page, "address_book", {
+            "first_name": self.firstname,
+            "last_name": self.lastname,
+            "address": self.address1,
+            "city": self.city,
+            "postcode": self.postcode,
+        })
 
     def get_addresses_count(self) -> int:
         count = self.addresses.count()
-        logger.info(f"Addresses count: {count}")
+        logger.info("Addresses count: %s", count)
         return count
 
     def add_new_address(self, first_name: str, last_name: str, address: str, city: str, postcode: str):
-        logger.info(f"Adding new address for {first_name} {last_name}")
+        logger.info("Adding new address for %s %s", first_name, last_name)
         self.add_address_button.click()
-        self.firstname.fill(first_name)
-        self.lastname.fill(last_name)
-        self.address1.fill(address)
-        self.city.fill(city)
-        self.postcode.fill(postcode)
+        self.address_form.fill({
+            "first_name": first_name,
+            "last_name": last_name,
+            "address": address,
+            "city": city,
+            "postcode": postcode,
+        })
         self.save_button.click()
 
     def edit_address(self, address_index: int):
-        logger.info(f"Editing address at index {address_index}")
+        logger.info("Editing address at index %s", address_index)
         self.edit_buttons.nth(address_index).click()
 
     def delete_address(self, address_index: int):
-        logger.info(f"Deleting address at index {address_index}")
+        logger.info("Deleting address at index %s", address_index)
         self.delete_buttons.nth(address_index).click()
\ No newline at end of file
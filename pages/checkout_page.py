@@ -1,9 +1,12 @@
 from playwright.sync_api import Page
 import logging
+from utils.adaptive_timeouts import adaptive_actions
+from utils.form_fill import FormFiller
 
 logger = logging.getLogger(__name__)
 
 
+@adaptive_actions
 class CartPage:
 
     def __init__(self, page: Page):
@@ -31,31 +34,31 @@ class CartPage:
 
     def get_cart_items_count(self) -> int:
         count = self.cart_items.count()
-        logger.info(f"Cart items count: {count}")
+        logger.info("Cart items count: %s", count)
         return count
 
     def update_item_quantity(self, item_index: int, quantity: int):
-        logger.info(f"Updating item {item_index} quantity to {quantity}")
+        logger.info("Updating item %s quantity to %s", item_index, quantity)
         self.item_quantities.nth(item_index).clear()
         self.item_quantities.nth(item_index).fill(str(quantity))
         self.update_cart_button.click()
 
     def remove_item(self, item_index: int):
-        logger.info(f"Removing item at index {item_index}")
+        logger.info("Removing item at index %s", item_index)
         self.remove_buttons.nth(item_index).click()
 
     def get_subtotal(self) -> str:
         amount = self.subtotal.inner_text()
-        logger.info(f"Subtotal: {amount}")
+        logger.info("Subtotal: %s", amount)
         return amount
 
     def get_total(self) -> str:
         amount = self.total_amount.inner_text()
-        logger.info(f"Total: {amount}")
+        logger.info("Total: %s", amount)
         return amount
 
     def apply_coupon(self, coupon_code: str):
-        logger.info(f"Applying coupon: {coupon_code}")
+        logger.info("Applying coupon: %s", coupon_code)
         self.coupon_input.fill(coupon_code)
         self.apply_coupon_button.click()
 
@@ -68,6 +71,7 @@ class CartPage:
         return count == 0
 
 
+@adaptive_actions
 class CheckoutPage:
 
     def __init__(self, page: Page):
@@ -86,6 +90,12 @@ class CheckoutPage:
         self.billing_state = page.locator("select[name='zone_id']").first
 
 
+        # Address book choice of the payment address step
+        self.existing_address_option = page.locator("input[name='payment_address'][value='existing']").first
+        self.saved_address_select = page.locator("select[name='address_id']").first
+        self.payment_address_continue = page.locator("#button-payment-address")
+        self.shipping_address_continue = page.locator("#button-shipping-address")
+
         self.shipping_checkbox = page.locator("input[name='shipping_address']")
         self.shipping_firstname = page.get_by_label("Shipping First Name")
         self.shipping_lastname = page.get_by_label("Shipping Last Name")
@@ -100,32 +110,55 @@ class CheckoutPage:
         self.continue_button = page.get_by_role("button", name="Continue")
         self.confirm_button = page.get_by_role("button", name="Confirm Order")
         self.confirm_order_button = page.get_by_role("button", name="Confirm Order")
+        self.billing_form = FormFiller(page, "billing_address", {
+            "first_name": self.billing_firstname,
+            "last_name": self.billing_lastname,
+            "email": self.billing_email,
+            "phone": self.billing_phone,
+            "address": self.billing_address1,
+            "city": self.billing_city,
+            "postcode": self.billing_postcode,
+        })
 
     def fill_billing_address(self, first_name: str, last_name: str, email: str, 
                             phone: str, address: str, city: str, postcode: str):
-        logger.info(f"Filling billing address for {first_name} {last_name}")
-        self.billing_firstname.fill(first_name)
-        self.billing_lastname.fill(last_name)
-        self.billing_email.fill(email)
-        self.billing_phone.fill(phone)
-        self.billing_address1.fill(address)
-        self.billing_city.fill(city)
-        self.billing_postcode.fill(postcode)
+        logger.info("Filling billing address for %s %s", first_name, last_name)
+        self.billing_form.fill({
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "phone": phone,
+            "address": address,
+            "city": city,
+            "postcode": postcode,
+        })
 
     def select_country(self, country_name: str):
-        logger.info(f"Selecting country: {country_name}")
+        logger.info("Selecting country: %s", country_name)
         self.billing_country.select_option(country_name)
 
     def select_state(self, state_id: str):
-        logger.info(f"Selecting state: {state_id}")
+        logger.info("Selecting state: %s", state_id)
         self.billing_state.select_option(state_id)
 
+    def get_selected_address_id(self) -> str:
+        return self.saved_address_select.input_value()
+
+    def is_existing_address_chosen(self) -> bool:
+        return self.existing_address_option.is_checked()
+
+    def continue_to_shipping_method(self):
+        logger.info("Continuing from the address steps to the shipping method")
+        self.payment_address_continue.click()
+        self.shipping_address_continue.click()
+        self.shipping_methods.first.wait_for(state="visible")
+
     def select_shipping_method(self, method_index: int):
-        logger.info(f"Selecting shipping method at index {method_index}")
+        logger.info("Selecting shipping method at index %s", method_index)
         self.shipping_methods.nth(method_index).check()
 
     def select_payment_method(self, method_index: int):
-        logger.info(f"Selecting payment method at index {method_index}")
+        logger.info("Selecting payment method at index %s", method_index)
         self.payment_methods.nth(method_index).check()
 
     def confirm_order(self):
@@ -1,9 +1,11 @@
 from playwright.sync_api import Page
 import logging
+from utils.adaptive_timeouts import adaptive_actions
 
 logger = logging.getLogger(__name__)
 
 
+@adaptive_actions
 class HomePage:
 
     def __init__(self, page: Page):
@@ -29,7 +31,7 @@ class HomePage:
         self.page.goto("https://ecommerce-playground.lambdatest.io/")
 
     def search_product(self, product_name: str):
-        logger.info(f"Searching for product: {product_name}")
+        logger.info("Searching for product: %s", product_name)
         self.search_input.fill(product_name)
         self.search_button.click()
 
@@ -57,5 +59,5 @@ class HomePage:
 
     def get_featured_products_count(self):
         count = self.featured_products.count()
-        logger.info(f"Featured products count: {count}")
+        logger.info("Featured products count: %s", count)
         return count
\ No newline at end of file
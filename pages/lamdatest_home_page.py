@@ -1,9 +1,11 @@
 from playwright.sync_api import Page
 import logging
+from utils.adaptive_timeouts import adaptive_actions
 
 logger = logging.getLogger(__name__)
 
 
+@adaptive_actions
 class HomePage:
     def __init__(self, page: Page):
         self.page = page
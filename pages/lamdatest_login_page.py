@@ -1,9 +1,11 @@
 from playwright.sync_api import Page
 import logging
+from utils.adaptive_timeouts import adaptive_actions
 
 logger = logging.getLogger(__name__)
 
 
+@adaptive_actions
 class LoginPage:
     def __init__(self, page: Page):
         self.page = page
@@ -12,7 +14,7 @@ class LoginPage:
         self.login_button = page.get_by_role("button", name="Login")
 
     def enter_username(self, username: str):    
-        logger.info(f"Entering username: {username}")
+        logger.info("Entering username: %s", username)
         self.username_input.fill(username)
 
     def enter_password(self, password: str):    
@@ -25,7 +27,7 @@ class LoginPage:
 
     def is_forgot_password_link_visible(self):
         is_visible = self.page.locator("a[href*='forgotten']").is_visible()
-        logger.info(f"Forgot password link visible: {is_visible}")
+        logger.info("Forgot password link visible: %s", is_visible)
         return is_visible
 
     def get_alert_message(self):
@@ -37,7 +39,7 @@ class LoginPage:
         self.page.click("a[href*='logout']")
 
     def login(self, username: str, password: str):    
-        logger.info(f"Performing login with username: {username}")
+        logger.info("Performing login with username: %s", username)
         self.enter_username(username)
         self.enter_password(password)
         self.click_login()
\ No newline at end of file
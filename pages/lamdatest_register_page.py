@@ -1,9 +1,12 @@
 from playwright.sync_api import Page
 import logging
+from utils.adaptive_timeouts import adaptive_actions
+from utils.form_fill import FormFiller
 
 logger = logging.getLogger(__name__)
 
 
+@adaptive_actions
 class RegisterPage:
     def __init__(self, page: Page):
         self.page = page
@@ -15,22 +18,26 @@ class RegisterPage:
         self.confirm_password_input = page.get_by_placeholder("Password Confirm")
         self.privacy_policy_checkbox = page.get_by_label("I have read and agree to the Privacy Policy")
         self.continue_button = page.get_by_role("button", name="Continue")
+        self.form = FormFiller(page, "register", {
+            "first_name": self.first_name_input,
+            "last_name": self.last_name_input,
+            "email": self.email_input,
+            "telephone": self.telephone_input,
+            "password": self.password_input,
+            "confirm_password": self.confirm_password_input,
+            "privacy_policy": self.privacy_policy_checkbox,
+        })
 
     def register_user(self, first_name, last_name, email, telephone, password):
-        logger.info(f"Registering user: {email}")
-        self.first_name_input.fill(first_name)
-        logger.info(f"Filled first name: {first_name}")
-        self.last_name_input.fill(last_name)
-        logger.info(f"Filled last name: {last_name}")
-        self.email_input.fill(email)
-        logger.info(f"Filled email: {email}")
-        self.telephone_input.fill(telephone)
-        logger.info(f"Filled telephone: {telephone}")
-        self.password_input.fill(password)
-        logger.info("Filled password")
-        self.confirm_password_input.fill(password)
-        logger.info("Filled password confirmation")
-        self.privacy_policy_checkbox.check()
-        logger.info("Checked privacy policy checkbox")
+        logger.info("Registering user: %s", email)
+        self.form.fill({
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "telephone": telephone,
+            "password": password,
+            "confirm_password": password,
+            "privacy_policy": True,
+        })
         self.continue_button.click()
         logger.info("Clicked continue button")
\ No newline at end of file
@@ -1,9 +1,11 @@
 from playwright.sync_api import Page
 import logging
+from utils.adaptive_timeouts import adaptive_actions
 
 logger = logging.getLogger(__name__)
 
 
+@adaptive_actions
 class ProductPage:
 
     def __init__(self, page: Page):
@@ -28,16 +30,16 @@ class ProductPage:
 
     def get_product_name(self) -> str:
         name = self.product_name.inner_text()
-        logger.info(f"Product name: {name}")
+        logger.info("Product name: %s", name)
         return name
 
     def get_product_price(self) -> str:
         price = self.product_price.inner_text()
-        logger.info(f"Product price: {price}")
+        logger.info("Product price: %s", price)
         return price
 
     def set_quantity(self, quantity: int):
-        logger.info(f"Setting quantity to: {quantity}")
+        logger.info("Setting quantity to: %s", quantity)
         self.quantity_input.clear()
         self.quantity_input.fill(str(quantity))
 
@@ -51,16 +53,17 @@ class ProductPage:
 
     def get_stock_status(self) -> str:
         status = self.stock_status.inner_text()
-        logger.info(f"Stock status: {status}")
+        logger.info("Stock status: %s", status)
         return status
 
     def is_product_in_stock(self) -> bool:
         stock = self.stock_status.inner_text()
         in_stock = "in stock" in stock.lower()
-        logger.info(f"In stock: {in_stock}")
+        logger.info("In stock: %s", in_stock)
         return in_stock
 
 
+@adaptive_actions
 class ProductListPage:
 
     def __init__(self, page: Page):
@@ -76,29 +79,29 @@ class ProductListPage:
 
     def get_products_count(self) -> int:
         count = self.product_items.count()
-        logger.info(f"Products displayed: {count}")
+        logger.info("Products displayed: %s", count)
         return count
 
     def click_product(self, product_index: int):
-        logger.info(f"Clicking product at index {product_index}")
+        logger.info("Clicking product at index %s", product_index)
         self.product_links.nth(product_index).click()
 
     def sort_products(self, sort_option: str):
-        logger.info(f"Sorting products by: {sort_option}")
+        logger.info("Sorting products by: %s", sort_option)
         self.sort_dropdown.select_option(sort_option)
 
     def set_products_per_page(self, limit: str):
-        logger.info(f"Setting products per page to: {limit}")
+        logger.info("Setting products per page to: %s", limit)
         self.limit_dropdown.select_option(limit)
 
     def filter_by_price(self, min_price: str, max_price: str):
-        logger.info(f"Filtering by price: {min_price} - {max_price}")
+        logger.info("Filtering by price: %s - %s", min_price, max_price)
         self.price_filter_min.fill(min_price)
         self.price_filter_max.fill(max_price)
         self.apply_filter_button.click()
 
     def search_in_list(self, search_term: str):
-        logger.info(f"Searching in list: {search_term}")
+        logger.info("Searching in list: %s", search_term)
         search_input = self.page.get_by_placeholder("Search")
         search_input.fill(search_term)
         search_input.locator("..").get_by_role("button").click()
\ No newline at end of file
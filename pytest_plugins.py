@@ -1,11 +1,299 @@
+import os
 import pytest
 import logging
 from pathlib import Path
+from contextlib import contextmanager
+from config import (
+    BASE_URL, EVENTS_DIR, STREAM_REPORT, ARTIFACT_DIR, ARTIFACT_MAX_AGE_DAYS, ARTIFACT_MAX_SIZE_MB,
+    ROUTE_LATENCY, ROUTE_LATENCY_DIR, ROUTE_LATENCY_REPORT, STATIC_CACHE, STATIC_CACHE_DIR,
+    DEFAULT_TIMEOUT, NAVIGATION_TIMEOUT, BROWSER_SERVER_DIR, BROWSER_POOL, ADAPTIVE_TIMEOUTS,
+    ADAPTIVE_TIMEOUT_MULTIPLE, ADAPTIVE_TIMEOUT_FLOOR, ADAPTIVE_TIMEOUT_CEILING,
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES, SITE_HEALTH, SITE_HEALTH_DIR, SITE_HEALTH_ROUTES,
+    SITE_HEALTH_TIMEOUT, SITE_HEALTH_FAILURE_THRESHOLD, STABILIZE, STABILIZE_OVERLAYS, FORM_FILL_BATCHED,
+    PROFILE_TESTS, PROFILE_INTERVAL_MS, PROFILE_DIR, PROFILE_REPORT, LOG_BUFFER,
+    LOG_BUFFER_CAPACITY, LOG_CONSOLE_LEVEL, HEADLESS, AUTOSCALE_MEMORY_MARGIN, AUTOSCALE_MEMORY_THRESHOLD,
+    AUTOSCALE_HISTORY_MAX_AGE_HOURS, AUTOSCALE_MAX_WORKERS
+)
+from utils import (
+    event_stream, route_latency, adaptive_timeouts, site_health, browser_pool, stabilization, form_fill,
+    perf_trace, harness_profiler, log_buffer, autoscale
+)
+from utils.artifact_store import ArtifactStore
+from utils.static_cache import run_summary as static_cache_summary
+from utils.scheduling import (
+    base_nodeid, load_durations, save_durations, group_items, order_longest_first, scope_group
+)
+from utils.prioritization import (
+    load_outcomes, save_outcomes, risk_scores, changed_files, order_by_risk
+)
+from utils.stream_report import build_report
+from utils.thread_runner import ThreadRunner
 
 logger = logging.getLogger(__name__)
 
 
+observed_durations = {}
+observed_failures = {}
+route_latency_lines = []
+static_cache_stats = {}
+perf_trace_summaries = []
+profile_lines = []
+autoscale_plan = {}
+observed_footprints = []
+footprint_sampler = None
+memory_throttle = None
+circuit_breaker = None
+site_health_skipped = 0
+terminal_reporter = None
+
+SITE_UNAVAILABLE = "Site unavailable"
+
+# Unit tests of the harness itself: no shop, no browser
+UNIT_TESTS_DIR = Path(__file__).parent / "tests" / "unit"
+
+
+def is_xdist_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def is_xdist_controller(config) -> bool:
+    # xdist registers its dsession plugin trylast, so check the options instead
+    if is_xdist_worker(config):
+        return False
+    return getattr(config.option, "dist", "no") != "no" and bool(
+        getattr(config.option, "numprocesses", None) or getattr(config.option, "tx", None)
+    )
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("playwright_demo")
+    group.addoption(
+        "--no-longest-first",
+        action="store_true",
+        default=False,
+        help="keep collection order instead of scheduling longest tests first",
+    )
+    group.addoption(
+        "--no-risk-first",
+        action="store_true",
+        default=False,
+        help="do not move recently failing, flaky or changed-code tests to the front "
+             "(combine with --maxfail=N to stop early on a broken build)",
+    )
+    group.addoption(
+        "--no-event-stream",
+        action="store_true",
+        default=False,
+        help="do not write the JSONL event stream",
+    )
+    group.addoption(
+        "--events-dir",
+        default=EVENTS_DIR,
+        help="directory for per-worker JSONL event files",
+    )
+    group.addoption(
+        "--flight-recorder",
+        action="store_true",
+        default=False,
+        help="keep a screencast ring buffer per page and save it when a test fails",
+    )
+    group.addoption(
+        "--network-stats",
+        action="store_true",
+        default=False,
+        help="record per-test request counts, transfer bytes and cache hits",
+    )
+    group.addoption(
+        "--route-latency",
+        action="store_true",
+        default=False,
+        help="collect TTFB/total latency histograms per OpenCart route",
+    )
+    group.addoption(
+        "--static-cache",
+        action="store_true",
+        default=False,
+        help="serve static assets from a disk cache shared by all contexts and workers",
+    )
+    group.addoption(
+        "--adaptive-timeouts",
+        action="store_true",
+        default=False,
+        help="time out page-object actions at a multiple of their historical p99",
+    )
+    group.addoption(
+        "--stabilize",
+        action="store_true",
+        default=False,
+        help="disable animations, freeze carousels and hide cookie banners in every context",
+    )
+    group.addoption(
+        "--sequential-forms",
+        action="store_true",
+        default=False,
+        help="fill page-object forms one Playwright call per field (the baseline for form fill timings)",
+    )
+    group.addoption(
+        "--perf-trace",
+        action="store_true",
+        default=False,
+        help="record a Chrome performance trace and JS CPU profile of every test's page",
+    )
+    group.addoption(
+        "--workers",
+        choices=["auto-perf"],
+        default=None,
+        help="auto-perf: pick the xdist worker count from measured browser memory/CPU and free resources, "
+             "and pause idle workers under memory pressure",
+    )
+    group.addoption(
+        "--threads",
+        type=int,
+        default=0,
+        help="run tests in this process on N threads, each with its own Playwright and browser "
+             "(instead of -n; see utils/thread_runner.py for which fixtures are per-thread)",
+    )
+    group.addoption(
+        "--buffer-logs",
+        action="store_true",
+        default=False,
+        help="keep each test's log records in memory and write them only if it fails "
+             "(replaces pytest's logging plugin: no caplog, --log-level or --log-cli-*)",
+    )
+    group.addoption(
+        "--sync-logging",
+        action="store_true",
+        default=False,
+        help="write every log record to the console as it is logged, even with --buffer-logs or LOG_BUFFER=true",
+    )
+    group.addoption(
+        "--profile-tests",
+        action="store_true",
+        default=False,
+        help="sample each test's Python stack and split its time into Playwright IPC, harness and test code",
+    )
+    group.addoption(
+        "--reuse-browser",
+        action="store_true",
+        default=False,
+        help="connect to a warm browser server kept alive between runs instead of launching Chromium",
+    )
+    group.addoption(
+        "--browser-pool",
+        default=None,
+        help="comma-separated browser-server ws:// endpoints to spread workers over (see python -m utils.browser_pool)",
+    )
+    group.addoption(
+        "--no-site-health",
+        action="store_true",
+        default=False,
+        help="skip the site preflight and the circuit breaker that stops the run when the shop is down",
+    )
+    group.addoption(
+        "--no-shared-pages",
+        action="store_true",
+        default=False,
+        help="give readonly_page tests a fresh page each instead of one shared loaded page",
+    )
+    group.addoption(
+        "--seed-accounts",
+        action="store_true",
+        default=False,
+        help="create seeded customers for seed-marked classes (registers accounts and places orders on the shop)",
+    )
+
+
+def is_unit_run(config) -> bool:
+    # Every selected path is under tests/unit, so nothing will touch the shop
+    paths = [(config.invocation_params.dir / arg.split("::")[0]).resolve() for arg in config.args]
+    return bool(paths) and all(path == UNIT_TESTS_DIR or UNIT_TESTS_DIR in path.parents for path in paths)
+
+
+def autoscaling(config) -> bool:
+    return config.getoption("workers") == "auto-perf"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    # Runs before xdist's own tryfirst implementation (conftest plugins are
+    # registered later), which resolves "auto" through the hook below
+    if autoscaling(config) and not is_xdist_worker(config):
+        config.option.numprocesses = "auto"
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    if not autoscaling(config):
+        return None
+    from _pytest.cacheprovider import Cache
+
+    # config.cache does not exist yet this early in the run
+    cache = Cache.for_config(config, _ispytest=True)
+    footprint = autoscale.load_history(cache, HEADLESS, AUTOSCALE_HISTORY_MAX_AGE_HOURS)
+    if not footprint:
+        try:
+            footprint = autoscale.calibrate(HEADLESS, f"{BASE_URL}/index.php?route=common/home")
+        except Exception as e:
+            logger.warning(f"Worker calibration failed: {e}")
+            footprint = {}
+        if footprint:
+            cache.set(autoscale.HISTORY_KEY, footprint)
+    cores = autoscale.cpu_count()
+    if footprint:
+        count, reasons = autoscale.choose_workers(
+            footprint, cores, autoscale.system_memory(), AUTOSCALE_MEMORY_MARGIN, AUTOSCALE_MAX_WORKERS
+        )
+    else:
+        count, reasons = cores, ["no footprint (calibration failed or usage cannot be measured here); one worker per core"]
+    autoscale_plan.update(workers=count, footprint=footprint, reasons=reasons)
+    logger.info(f"--workers=auto-perf: {count} workers ({'; '.join(reasons)})")
+    return count
+
+
+def buffered_logging(config) -> bool:
+    if config.getoption("sync_logging"):
+        return False
+    return config.getoption("buffer_logs") or LOG_BUFFER
+
+
+# pytest's logging plugin options; none of them has an effect while it is blocked
+LOGGING_PLUGIN_OPTIONS = ("log_level", "log_cli_level", "log_file", "log_file_level")
+
+
 def pytest_configure(config):
+    if config.getoption("threads") > 1:
+        if is_xdist_worker(config) or is_xdist_controller(config) or autoscaling(config):
+            raise pytest.UsageError("--threads runs tests in one process; it cannot be combined with -n or --workers")
+        if config.getoption("usepdb"):
+            raise pytest.UsageError("--pdb cannot be used with --threads")
+
+    if is_xdist_controller(config) and config.getvalue("dist") == "load":
+        # Plain -n means --dist load, where xdist ignores xdist_group and
+        # never suffixes nodeids. loadgroup balances ungrouped tests the same
+        # way and keeps scope, readonly_page and seeded_account groups whole.
+        # Set before xdist's trylast configure starts the workers.
+        config.option.dist = "loadgroup"
+    if is_xdist_worker(config) and config.workerinput.get("loadgroup"):
+        # Workers re-parse the command line, so -n alone reads as load there
+        config.option.loadgroup = True
+
+    if buffered_logging(config):
+        # pytest's logging plugin would capture and format every record the
+        # buffer holds back; blocked before its trylast configure registers
+        # it. Anything that relies on it is refused rather than ignored.
+        conflicts = [f"--{name.replace('_', '-')}" for name in LOGGING_PLUGIN_OPTIONS if config.getoption(name)]
+        if config.getini("log_cli"):
+            conflicts.append("log_cli")
+        if conflicts:
+            raise pytest.UsageError(
+                f"buffered logging (--buffer-logs / LOG_BUFFER=true) cannot be combined with "
+                f"{', '.join(conflicts)}; add --sync-logging to use pytest's logging plugin"
+            )
+        config.pluginmanager.set_blocked("logging-plugin")
+        log_buffer.configure(logging.INFO, logging.getLevelName(LOG_CONSOLE_LEVEL), LOG_BUFFER_CAPACITY)
+    else:
+        log_buffer.configure_sync(logging.INFO)
+
     config.addinivalue_line(
         "markers", "smoke: mark test as a smoke test"
     )
@@ -15,12 +303,181 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "critical: mark test as critical"
     )
+    config.addinivalue_line(
+        "markers",
+        "page_weight_budget(max_bytes=None, max_requests=None, url=None): "
+        "fail when a page load exceeds its byte or request budget",
+    )
+    config.addinivalue_line(
+        "markers",
+        "readonly_page(url, prepare=None): share one page loaded from url (then prepare(page)) "
+        "between the module's read-only tests on each worker (fresh pages while network stats, "
+        "flight recorder or perf traces are on; not allowed with page_weight_budget or perf_trace)",
+    )
+    config.addinivalue_line(
+        "markers", "no_stabilization: run without the --stabilize init-script pack"
+    )
+    config.addinivalue_line(
+        "markers",
+        "checkout_stage(stage='cart', product_id=None, quantity=1, address=None, shipping_method='flat.flat', "
+        "payment_method='cod'): checkout stage (cart, address, shipping, payment) the checkout_page "
+        "fixture reaches over HTTP before opening the checkout",
+    )
+    config.addinivalue_line(
+        "markers",
+        "seed(orders=0, wishlist=0, addresses=0): history the class-scoped seeded_account fixture "
+        "creates for a fresh customer before the class's tests run (with --seed-accounts or "
+        "SEED_ACCOUNTS=true; otherwise the fixture is None and tests use the shared account)",
+    )
+    config.addinivalue_line(
+        "markers",
+        "perf_trace: record a Chrome trace and JS CPU profile of the test's page "
+        "(the perf_trace fixture traces a block instead)",
+    )
 
 
     Path("reports").mkdir(exist_ok=True)
     Path("reports/screenshots").mkdir(exist_ok=True)
 
 
+    # Every process learns action latencies; workers ship theirs back
+    # through workeroutput and the controller stores the merged history.
+    adaptive_timeouts.configure(
+        config,
+        enabled=config.getoption("adaptive_timeouts") or ADAPTIVE_TIMEOUTS,
+        multiple=ADAPTIVE_TIMEOUT_MULTIPLE,
+        floor=ADAPTIVE_TIMEOUT_FLOOR,
+        ceiling=ADAPTIVE_TIMEOUT_CEILING,
+        min_samples=ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+        default_timeout=DEFAULT_TIMEOUT,
+        navigation_timeout=NAVIGATION_TIMEOUT,
+    )
+    # Page-object action times are split by stabilized/baseline pages
+    stabilize = stabilization.configure(
+        config, enabled=config.getoption("stabilize") or STABILIZE, overlays=STABILIZE_OVERLAYS
+    )
+    adaptive_timeouts.current_tracker().observers.append(stabilize.comparison.observe)
+    form_fill.configure(config, batched=FORM_FILL_BATCHED and not config.getoption("sequential_forms"))
+    if config.getoption("profile_tests") or PROFILE_TESTS:
+        harness_profiler.configure(PROFILE_INTERVAL_MS)
+
+    global footprint_sampler
+    if autoscaling(config) and is_xdist_worker(config):
+        footprint_sampler = autoscale.FootprintSampler()
+
+
+    # The controller (or a plain run) fixes the run id before any worker is
+    # spawned, so workers inherit it through the environment.
+    if not is_xdist_worker(config):
+        event_stream.current_run_id()
+        for stale in Path(ROUTE_LATENCY_DIR).glob("*.json"):
+            stale.unlink()
+        for stale in Path(SITE_HEALTH_DIR).glob("*.json"):
+            stale.unlink()
+
+    global circuit_breaker
+    if SITE_HEALTH and not config.getoption("no_site_health") and not is_unit_run(config):
+        circuit_breaker = site_health.CircuitBreaker(
+            SITE_HEALTH_DIR, event_stream.current_run_id(), BASE_URL, SITE_HEALTH_ROUTES,
+            SITE_HEALTH_FAILURE_THRESHOLD, SITE_HEALTH_TIMEOUT,
+        )
+
+    # A collect-only run (verify_setup.py does one) leaves the last run's
+    # events, stream report and artifacts alone
+    if config.getoption("no_event_stream") or config.option.collectonly:
+        return
+
+    # Same for the event directory; only test-running processes stream.
+    if not is_xdist_worker(config):
+        event_stream.clear_events(config.getoption("events_dir"))
+    if not is_xdist_controller(config):
+        worker = config.workerinput["workerid"] if is_xdist_worker(config) else "main"
+        stream = event_stream.start_stream(config.getoption("events_dir"), worker)
+        stream.emit("session_start")
+
+
+def pytest_sessionstart(session):
+    global terminal_reporter
+    # Runs before xdist spawns workers, so a dead shop costs one probe round
+    config = session.config
+    # A worker's terminal is not shown; its held log lines go to stderr
+    if not is_xdist_worker(config):
+        terminal_reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if circuit_breaker is None or is_xdist_worker(config) or config.option.collectonly:
+        return
+    results = site_health.probe_all(BASE_URL, SITE_HEALTH_ROUTES, SITE_HEALTH_TIMEOUT)
+    for result in results:
+        logger.info(f"Preflight {result.describe()}")
+    if not all(result.healthy for result in results):
+        circuit_breaker.trip("preflight probes failed", results)
+        pytest.exit(
+            f"{SITE_UNAVAILABLE}: preflight probes failed\n"
+            + "\n".join(result.describe() for result in results if not result.healthy),
+            returncode=pytest.ExitCode.TESTS_FAILED,
+        )
+
+
+@contextmanager
+def test_scope(item):
+    # Per-test state around setup, call and teardown, on the thread that
+    # runs the test: the log ring buffer, action attribution and, with
+    # --profile-tests, the profiler (so fixture time lands in "harness")
+    pipeline = log_buffer.current()
+    if pipeline is not None:
+        pipeline.buffer.start(item.nodeid)
+    stream = event_stream.get_stream()
+    if stream is not None:
+        stream.current_nodeid = base_nodeid(item.nodeid)
+    profile = harness_profiler.profile_test(item) if harness_profiler.is_enabled() else None
+    if profile is not None:
+        profile.start()
+    try:
+        yield
+    finally:
+        if profile is not None:
+            profile.stop()
+            profile.write(Path(PROFILE_DIR) / event_stream.current_run_id())
+        if pipeline is not None:
+            pipeline.buffer.discard()
+        if stream is not None:
+            stream.current_nodeid = None
+        if footprint_sampler is not None:
+            footprint_sampler.sample()
+
+
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    with test_scope(item):
+        yield
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    threads = session.config.getoption("threads")
+    if threads <= 1:
+        return None
+    if session.testsfailed and not session.config.option.continue_on_collection_errors:
+        raise session.Interrupted(
+            f"{session.testsfailed} error{'s' if session.testsfailed != 1 else ''} during collection"
+        )
+    if session.config.option.collectonly:
+        return True
+
+    # Global output capture cannot tell threads apart; tests print straight through
+    capman = session.config.pluginmanager.getplugin("capturemanager")
+    if capman is not None:
+        capman.stop_global_capturing()
+        session.config.pluginmanager.unregister(capman)
+    ThreadRunner(session, threads, test_scope).run()
+    return True
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    if circuit_breaker is not None and circuit_breaker.is_open():
+        pytest.skip(f"{SITE_UNAVAILABLE}: {circuit_breaker.state().get('reason', 'circuit breaker open')}")
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
@@ -30,8 +487,145 @@ def pytest_runtest_makereport(item, call):
     setattr(item, f"rep_{rep.when}", rep)
 
 
+    if circuit_breaker is not None and rep.when in ("setup", "call") and not rep.skipped:
+        if rep.failed:
+            circuit_breaker.observe(item.nodeid, False, site_health.is_site_failure(call.excinfo))
+        elif rep.when == "call":
+            circuit_breaker.observe(item.nodeid, True, False)
+
+
+    # Artifacts live in the content-addressed store; the HTML report only links them
+    if rep.when == "teardown" and getattr(item, "artifacts", None):
+        htmlpath = getattr(item.config.option, "htmlpath", None)
+        if htmlpath and item.config.pluginmanager.hasplugin("html"):
+            import pytest_html
+            report_dir = Path(htmlpath).parent
+            extras = getattr(rep, "extras", [])
+            for artifact in item.artifacts:
+                url = Path(os.path.relpath(artifact["path"], report_dir)).as_posix()
+                extras.append(pytest_html.extras.url(url, name=f"{artifact['kind']} {artifact['hash'][:12]}"))
+            rep.extras = extras
+
+    # Buffered log records are only written out for tests that fail
+    pipeline = log_buffer.current()
+    if pipeline is not None and pipeline.buffer.nodeid == item.nodeid:
+        if rep.failed:
+            text = pipeline.buffer.flush_records()
+            if text:
+                rep.sections.append(("Captured log (buffered)", text))
+        elif rep.when == "teardown" and any(
+            getattr(getattr(item, f"rep_{when}", None), "failed", False) for when in ("setup", "call")
+        ):
+            pipeline.buffer.flush_records()
+
+    if rep.when == "teardown" and getattr(item, "network_summary", None):
+        if item.config.pluginmanager.hasplugin("html"):
+            import pytest_html
+            extras = getattr(rep, "extras", [])
+            extras.append(pytest_html.extras.json(item.network_summary, name="network"))
+            rep.extras = extras
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    result = yield
+
+    marker = item.get_closest_marker("page_weight_budget")
+    recorder = getattr(item, "funcargs", {}).get("network_recorder")
+    if marker is not None and recorder is not None:
+        violations = recorder.budget_violations(**marker.kwargs)
+        if violations:
+            pytest.fail("Page weight budget exceeded:\n" + "\n".join(violations))
+    return result
+
+
+def pytest_collection_finish(session):
+    event_stream.emit("collection", count=len(session.items))
+
+
+def pytest_runtest_logstart(nodeid, location):
+    stream = event_stream.get_stream()
+    if stream is not None:
+        stream.current_nodeid = base_nodeid(nodeid)
+        stream.emit("test_start")
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    stream = event_stream.get_stream()
+    if stream is not None:
+        stream.current_nodeid = None
+    write_console_lines()
+
+
+def write_console_lines():
+    # Buffered logging's console-level records, written once the test's
+    # report is on screen; records still queued follow the next test
+    pipeline = log_buffer.current()
+    if pipeline is None:
+        return
+    lines = pipeline.console_lines()
+    if not lines:
+        return
+    if terminal_reporter is None:
+        pipeline.stream.write("".join(line + "\n" for line in lines))
+        return
+    terminal_reporter.ensure_newline()
+    for line in lines:
+        terminal_reporter.write_line(line)
+
+
+def pytest_runtest_logreport(report):
+    nodeid = base_nodeid(report.nodeid)
+    observed_durations[nodeid] = observed_durations.get(nodeid, 0.0) + report.duration
+
+    if not report.skipped:
+        observed_failures[nodeid] = observed_failures.get(nodeid, False) or report.failed
+
+    if report.when == "teardown":
+        for name, value in report.user_properties:
+            if name == "perf_trace":
+                perf_trace_summaries.append((nodeid, value))
+
+    global site_health_skipped
+    if report.skipped and SITE_UNAVAILABLE in str(report.longrepr):
+        site_health_skipped += 1
+
+    event_stream.emit(
+        "phase",
+        nodeid=nodeid,
+        when=report.when,
+        outcome=report.outcome,
+        duration=round(report.duration, 3),
+        message=report.longreprtext[-4000:] if report.outcome != "passed" else "",
+    )
+
+
+def readonly_page_conflicts(item) -> list:
+    # A shared read-only page carries no per-test network recorder or trace,
+    # so these would silently check nothing
+    if item.get_closest_marker("readonly_page") is None:
+        return []
+    conflicts = [name for name in ("page_weight_budget", "perf_trace") if item.get_closest_marker(name) is not None]
+    if "perf_trace" in getattr(item, "fixturenames", ()) and "perf_trace" not in conflicts:
+        conflicts.append("perf_trace fixture")
+    return conflicts
+
+
+@pytest.hookimpl(tryfirst=True)
 def pytest_collection_modifyitems(config, items):
+    buffered = log_buffer.current() is not None
     for item in items:
+        if buffered and "caplog" in item.fixturenames:
+            raise pytest.UsageError(
+                f"{item.nodeid}: caplog needs pytest's logging plugin, which buffered logging "
+                "(--buffer-logs / LOG_BUFFER=true) replaces; add --sync-logging"
+            )
+        conflicts = readonly_page_conflicts(item)
+        if conflicts:
+            raise pytest.UsageError(
+                f"{item.nodeid}: readonly_page cannot be combined with {', '.join(conflicts)}; "
+                "drop one of them"
+            )
 
         if "smoke" in item.nodeid.lower():
             item.add_marker(pytest.mark.smoke)
@@ -39,6 +633,151 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(pytest.mark.regression)
 
 
+    reordered = False
+    durations = {} if config.getoption("no_longest_first") else load_durations(config)
+    if durations:
+        items[:] = order_longest_first(items, durations)
+        reordered = True
+
+    # Every xdist worker computes the same order from the same cache and
+    # checkout, so their collections still agree
+    if not config.getoption("no_risk_first"):
+        outcomes = load_outcomes(config)
+        changed = changed_files(config.rootpath)
+        if outcomes or changed:
+            scores = risk_scores(items, outcomes, changed)
+            if any(scores.values()):
+                items[:] = order_by_risk(items, scores, scope_group)
+                reordered = True
+
+    if not reordered:
+        # Shared read-only pages and seeded accounts are worth keeping on one
+        # worker even in collection order
+        for item in items:
+            shared = item.get_closest_marker("readonly_page") is not None or "seeded_account" in item.fixturenames
+            if shared and item.get_closest_marker("xdist_group") is None:
+                item.add_marker(pytest.mark.xdist_group(name=scope_group(item)))
+        return
+
+    # Runs before xdist appends "@<group>" to nodeids, so --dist loadgroup
+    # keeps tests that share a class/module-scoped fixture on one worker.
+    for key, members in group_items(items).items():
+        if len(members) > 1:
+            for item in members:
+                if item.get_closest_marker("xdist_group") is None:
+                    item.add_marker(pytest.mark.xdist_group(name=key))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getvalue("dist") != "loadgroup":
+        return None
+    global memory_throttle
+    if autoscaling(config):
+        memory_throttle = autoscale.MemoryThrottle(AUTOSCALE_MEMORY_THRESHOLD)
+        if not memory_throttle.supported:
+            memory_throttle = None
+    if memory_throttle is None:
+        if config.getoption("no_longest_first") and config.getoption("no_risk_first"):
+            return None
+        if not load_durations(config) and not load_outcomes(config):
+            return None
+
+    from utils.xdist_scheduler import LongestFirstScheduling
+    return LongestFirstScheduling(config, log, throttle=memory_throttle)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["loadgroup"] = node.config.getvalue("dist") == "loadgroup"
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    tracker = adaptive_timeouts.current_tracker()
+    observed = getattr(node, "workeroutput", {}).get("action_latency")
+    if tracker is not None and observed:
+        tracker.merge_observed(observed)
+    stabilize = stabilization.current()
+    waits = getattr(node, "workeroutput", {}).get("stabilization_waits")
+    if stabilize is not None and waits:
+        stabilize.comparison.merge_observed(waits)
+    timings = form_fill.current_timings()
+    form_timings = getattr(node, "workeroutput", {}).get("form_fill")
+    if timings is not None and form_timings:
+        timings.merge_observed(form_timings)
+    footprint = getattr(node, "workeroutput", {}).get("footprint")
+    if footprint:
+        observed_footprints.append(footprint)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    event_stream.emit("session_finish", exitstatus=int(exitstatus))
+    event_stream.stop_stream()
+    if config.option.collectonly:
+        return
+
+    collector = route_latency.current_collector()
+    if collector is not None and collector.routes:
+        worker = config.workerinput["workerid"] if is_xdist_worker(config) else "main"
+        collector.dump(Path(ROUTE_LATENCY_DIR) / f"{event_stream.current_run_id()}-{worker}.json")
+
+    tracker = adaptive_timeouts.current_tracker()
+    stabilize = stabilization.current()
+    timings = form_fill.current_timings()
+    if is_xdist_worker(config):
+        if tracker is not None:
+            config.workeroutput["action_latency"] = tracker.observed_dict()
+        if stabilize is not None:
+            config.workeroutput["stabilization_waits"] = stabilize.comparison.observed_dict()
+        if timings is not None:
+            config.workeroutput["form_fill"] = timings.observed_dict()
+        if footprint_sampler is not None:
+            config.workeroutput["footprint"] = footprint_sampler.footprint()
+        return
+
+    if tracker is not None and tracker.observed:
+        adaptive_timeouts.save_history(config, tracker.observed)
+    if stabilize is not None and any(stabilize.comparison.observed.values()):
+        stabilization.save_history(config, stabilize.comparison)
+    if timings is not None and any(timings.observed.values()):
+        form_fill.save_history(config, timings)
+    if observed_footprints and getattr(config, "cache", None) is not None:
+        autoscale.save_history(config.cache, observed_footprints, HEADLESS)
+
+    if config.getoption("route_latency") or ROUTE_LATENCY:
+        merged = route_latency.merge_dumps(ROUTE_LATENCY_DIR, BASE_URL, event_stream.current_run_id())
+        if merged.routes:
+            merged.write_report(ROUTE_LATENCY_REPORT, event_stream.current_run_id())
+            route_latency_lines.extend(merged.table_lines())
+
+    if harness_profiler.is_enabled():
+        summary = harness_profiler.aggregate(Path(PROFILE_DIR) / event_stream.current_run_id())
+        if summary["tests"]:
+            harness_profiler.write_report(summary, PROFILE_REPORT, event_stream.current_run_id())
+            profile_lines.extend(harness_profiler.summary_lines(summary))
+
+    if config.getoption("static_cache") or STATIC_CACHE:
+        static_cache_stats.update(static_cache_summary(STATIC_CACHE_DIR, event_stream.current_run_id()))
+
+    if observed_durations:
+        save_durations(config, observed_durations)
+    if observed_failures:
+        save_outcomes(config, observed_failures)
+
+    store = ArtifactStore(ARTIFACT_DIR)
+    store.prune(max_age_days=ARTIFACT_MAX_AGE_DAYS, max_bytes=int(ARTIFACT_MAX_SIZE_MB * 1024 * 1024))
+    store.close()
+    if not config.getoption("no_event_stream"):
+        build_report(event_stream.iter_events(config.getoption("events_dir")), STREAM_REPORT)
+
+
+def pytest_unconfigure(config):
+    # Drains the writer thread's queue before pytest exits
+    log_buffer.shutdown()
+
+
 def pytest_terminal_summary(terminalreporter, exitstatus, config):
     terminalreporter.write_sep("=", "Test Automation Summary", bold=True)
 
@@ -48,4 +787,99 @@ def pytest_terminal_summary(terminalreporter, exitstatus, config):
     else:
         terminalreporter.write("\n❌ Some tests failed!\n", red=True, bold=True)
 
-    terminalreporter.write_sep("=", "HTML Report: reports/report.html")
\ No newline at end of file
+
+    if circuit_breaker is not None and circuit_breaker.is_open():
+        terminalreporter.write_sep("-", "Site health", red=True)
+        for line in site_health.summary_lines(circuit_breaker.state(), site_health_skipped):
+            terminalreporter.write_line(line, red=True)
+
+    dsession = config.pluginmanager.getplugin("dsession")
+    sched = getattr(dsession, "sched", None)
+    if hasattr(sched, "summary_lines"):
+        terminalreporter.write_sep("-", "xdist worker utilisation")
+        for line in sched.summary_lines():
+            terminalreporter.write_line(line)
+
+    if autoscale_plan:
+        terminalreporter.write_sep("-", "Worker autoscaling (--workers=auto-perf)")
+        footprint = autoscale_plan["footprint"]
+        if footprint:
+            terminalreporter.write_line(
+                f"Per-worker footprint from {footprint['source']}: {footprint['rss_mb']:.0f} MB RSS, "
+                f"{footprint['cpu_cores']:.2f} cores"
+            )
+        terminalreporter.write_line(f"{autoscale_plan['workers']} workers: " + "; ".join(autoscale_plan["reasons"]))
+        if memory_throttle is not None:
+            summary = memory_throttle.summary()
+            terminalreporter.write_line(
+                f"Memory peaked at {summary['peak_percent']:.0f}% (throttle at {summary['threshold_percent']:.0f}%): "
+                f"{summary['deferrals']} deferred hand-outs, {summary['throttled_seconds']:.0f}s throttled"
+            )
+        if observed_footprints:
+            terminalreporter.write_line(
+                "Observed per worker: " + ", ".join(
+                    f"{entry['rss_mb']:.0f} MB / {entry['cpu_cores']:.2f} cores" for entry in observed_footprints
+                )
+            )
+
+    if route_latency_lines:
+        terminalreporter.write_sep("-", "Backend latency per route (ms)")
+        for line in route_latency_lines:
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Machine-readable: {ROUTE_LATENCY_REPORT}")
+
+    if config.getoption("browser_pool") or BROWSER_POOL:
+        lines = browser_pool.utilization_lines(BROWSER_SERVER_DIR, event_stream.current_run_id())
+        if lines:
+            terminalreporter.write_sep("-", "Browser pool utilisation")
+            for line in lines:
+                terminalreporter.write_line(line)
+
+    if static_cache_stats:
+        terminalreporter.write_line(
+            f"Static cache: {static_cache_stats['hit_rate']:.0%} hit rate "
+            f"({static_cache_stats['hits']} hits, {static_cache_stats['revalidated']} revalidated, "
+            f"{static_cache_stats['misses']} misses), "
+            f"{static_cache_stats['bytes_saved'] / 1024 / 1024:.1f} MB saved"
+        )
+
+    tracker = adaptive_timeouts.current_tracker()
+    if tracker is not None and tracker.enabled:
+        learned = sum(1 for histogram in tracker.history.values() if histogram.total >= tracker.min_samples)
+        terminalreporter.write_line(
+            f"Adaptive timeouts: {learned} of {len(tracker.history)} page-object actions had enough history "
+            f"({tracker.multiple:g} x p99, clamped to [{tracker.floor}, {tracker.ceiling}] ms)"
+        )
+
+    stabilize = stabilization.current()
+    if stabilize is not None and stabilize.enabled:
+        lines = stabilize.comparison.summary_lines()
+        terminalreporter.write_sep("-", "Stabilization pack: page-object action time")
+        for line in lines or ["Not enough baseline history yet; run once without --stabilize to compare"]:
+            terminalreporter.write_line(line)
+
+    if perf_trace_summaries:
+        terminalreporter.write_sep("-", "Performance traces (ms)")
+        for nodeid, summary in perf_trace_summaries:
+            for line in perf_trace.summary_lines(nodeid, summary):
+                terminalreporter.write_line(line)
+
+    if profile_lines:
+        terminalreporter.write_sep("-", "Python profile: Playwright IPC vs harness vs test code")
+        for line in profile_lines:
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(
+            f"Per-test pstats/speedscope: {Path(PROFILE_DIR) / event_stream.current_run_id()}, "
+            f"hotspots: {PROFILE_REPORT}"
+        )
+
+    timings = form_fill.current_timings()
+    lines = timings.summary_lines() if timings is not None else []
+    if lines:
+        terminalreporter.write_sep("-", "Form fill time (--sequential-forms for the per-field baseline)")
+        for line in lines:
+            terminalreporter.write_line(line)
+
+    terminalreporter.write_sep("=", "HTML Report: reports/report.html")
+    if not config.getoption("no_event_stream") and not config.option.collectonly:
+        terminalreporter.write_line(f"Stream report: {STREAM_REPORT} (live: python -m utils.dashboard)")
\ No newline at end of file
@@ -1,6 +1,7 @@
 import pytest
 from playwright.sync_api import Page, expect
 from config import BASE_URL
+from utils.checkout_session import saved_address_ids
 from pages import (
     HomePage, ProductListPage, ProductPage, CartPage, CheckoutPage,
     LoginPage, AccountPage, OrderHistoryPage
@@ -259,37 +260,20 @@ class TestProductSearchAndFiltering:
 
 class TestCheckoutProcess:
 
-    def test_checkout_with_address_selection(self, page: Page, login_credentials):
+    @pytest.mark.checkout_stage("address")
+    def test_checkout_with_address_selection(self, page: Page, checkout_page: CheckoutPage):
         """Test checkout process with address selection"""
 
-        page.goto("https://ecommerce-playground.lambdatest.io/index.php?route=account/login")
-        login_page = LoginPage(page)
-        login_page.login(login_credentials["valid_email"], login_credentials["valid_password"])
-        page.wait_for_load_state("networkidle")
-
-
-        home_page = HomePage(page)
-        home_page.navigate_to_shop()
-        page.wait_for_load_state("networkidle")
-
-        product_list = ProductListPage(page)
-        product_list.click_product(0)
-        page.wait_for_load_state("networkidle")
-
-        product_page = ProductPage(page)
-        product_page.add_to_cart()
-        page.wait_for_load_state("networkidle")
-
-
-        home_page.navigate_to_cart()
-        page.wait_for_load_state("networkidle")
-
-        cart_page = CartPage(page)
-        cart_page.proceed_to_checkout()
-        page.wait_for_load_state("networkidle")
+        expect(page).to_have_url("**/checkout")
+        book = page.context.request.get(f"{BASE_URL}/index.php?route=checkout/payment_address").text()
+        saved = saved_address_ids(book)
+        assert saved, "The fast-forward should have left an address in the book"
 
+        assert checkout_page.is_existing_address_chosen(), "Checkout should offer the saved address"
+        assert checkout_page.get_selected_address_id() == saved[0], "The saved address should be selected"
 
-        expect(page).to_have_url("**/checkout")
+        checkout_page.continue_to_shipping_method()
+        expect(checkout_page.shipping_methods.first).to_be_visible()
 
 
 class TestCartOperations:
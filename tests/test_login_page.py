@@ -1,6 +1,7 @@
 import re
 from playwright.sync_api import Page, expect
 from pages.lamdatest_login_page import LoginPage
+from utils import soft_assertions
 
 BASE_URL = "https://ecommerce-playground.lambdatest.io/index.php"
 LOGIN_URL = f"{BASE_URL}?route=account/login"
@@ -15,10 +16,11 @@ def test_login_page_ui(page: Page):
     login_page = LoginPage(page)
     page.goto(LOGIN_URL)
 
-    expect(page).to_have_title("Account Login")
-    expect(login_page.username_input).to_be_visible()
-    expect(login_page.password_input).to_be_visible()
-    expect(login_page.login_button).to_be_visible()
+    with soft_assertions(page) as soft:
+        soft.to_have_title("Account Login")
+        soft.to_be_visible(login_page.username_input)
+        soft.to_be_visible(login_page.password_input)
+        soft.to_be_visible(login_page.login_button)
 
 
 def test_valid_login(page: Page):
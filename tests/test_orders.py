@@ -3,13 +3,30 @@ from playwright.sync_api import Page, expect
 from config import BASE_URL
 from pages import (
     AccountPage, OrderHistoryPage, WishListPage, AddressBookPage,
-    HomePage, ProductListPage, ProductPage, CartPage
+    HomePage, ProductListPage, ProductPage, CartPage, LoginPage
 )
 
 LOGIN_PATH = f"{BASE_URL}/index.php?route=account/login"
 CATEGORY_PATH = f"{BASE_URL}/index.php?route=product/category&path=20"
+ORDER_HISTORY_PATH = f"{BASE_URL}/index.php?route=account/order"
 
+# OpenCart's default account/order page size
+ORDER_PAGE_SIZE = 10
 
+
+def log_in_for_history(page: Page, seeded_account, login_credentials):
+    # The seeded customer when seeding is on, else the shared account whose
+    # history is whatever earlier runs left behind
+    if seeded_account is None:
+        email, password = login_credentials["valid_email"], login_credentials["valid_password"]
+    else:
+        email, password = seeded_account["email"], seeded_account["password"]
+    page.goto(LOGIN_PATH)
+    LoginPage(page).login(email, password)
+    page.wait_for_load_state("networkidle")
+
+
+@pytest.mark.seed(orders=3)
 class TestOrderManagement:
 
     def test_view_order_history(self, page: Page, login_credentials):
@@ -29,15 +46,8 @@ class TestOrderManagement:
         page.wait_for_load_state("networkidle")
         expect(page).to_have_url("**/order")
 
-    def test_get_order_count(self, page: Page, login_credentials):
-        page.goto("https://ecommerce-playground.lambdatest.io/index.php?route=account/login")
-
-
-        page.get_by_role("textbox", name="E-Mail").fill(login_credentials["valid_email"])
-        page.get_by_role("textbox", name="Password").fill(login_credentials["valid_password"])
-        page.get_by_role("button", name="Login").click()
-
-        page.wait_for_load_state("networkidle")
+    def test_get_order_count(self, page: Page, seeded_account, login_credentials):
+        log_in_for_history(page, seeded_account, login_credentials)
 
         account_page = AccountPage(page)
         account_page.view_order_history()
@@ -46,7 +56,10 @@ class TestOrderManagement:
 
         order_history = OrderHistoryPage(page)
         orders_count = order_history.get_orders_count()
-        assert orders_count >= 0, "Orders count should be non-negative"
+        if seeded_account is None:
+            assert orders_count >= 0, "Orders count should be non-negative"
+        else:
+            assert orders_count == seeded_account["orders"], "Order history should list every seeded order"
 
     def test_view_order_details(self, page: Page, login_credentials):
         page.goto("https://ecommerce-playground.lambdatest.io/index.php?route=account/login")
@@ -119,6 +132,7 @@ class TestOrderManagement:
             assert total and len(total) > 0, "Order total not available"
 
 
+@pytest.mark.seed(wishlist=3)
 class TestWishList:
 
     def test_view_wish_list(self, page: Page, login_credentials):
@@ -137,15 +151,8 @@ class TestWishList:
         page.wait_for_load_state("networkidle")
         expect(page).to_have_url("**/wishlist")
 
-    def test_get_wishlist_items_count(self, page: Page, login_credentials):
-        page.goto("https://ecommerce-playground.lambdatest.io/index.php?route=account/login")
-
-
-        page.get_by_role("textbox", name="E-Mail").fill(login_credentials["valid_email"])
-        page.get_by_role("textbox", name="Password").fill(login_credentials["valid_password"])
-        page.get_by_role("button", name="Login").click()
-
-        page.wait_for_load_state("networkidle")
+    def test_get_wishlist_items_count(self, page: Page, seeded_account, login_credentials):
+        log_in_for_history(page, seeded_account, login_credentials)
 
         account_page = AccountPage(page)
         account_page.view_wish_list()
@@ -154,7 +161,10 @@ class TestWishList:
 
         wishlist = WishListPage(page)
         items_count = wishlist.get_wishlist_items_count()
-        assert items_count >= 0, "Wish list items count should be non-negative"
+        if seeded_account is None:
+            assert items_count >= 0, "Wish list items count should be non-negative"
+        else:
+            assert items_count == seeded_account["wishlist"], "Wish list should hold every seeded product"
 
     def test_add_wish_list_item_to_cart(self, page: Page, login_credentials):
 
@@ -192,6 +202,7 @@ class TestWishList:
             expect(page.locator(".alert-success")).to_be_visible()
 
 
+@pytest.mark.seed(addresses=2)
 class TestAddressBook:
 
     def test_view_address_book(self, page: Page, login_credentials):
@@ -210,15 +221,8 @@ class TestAddressBook:
         page.wait_for_load_state("networkidle")
         expect(page).to_have_url("**/address")
 
-    def test_get_saved_addresses_count(self, page: Page, login_credentials):
-        page.goto("https://ecommerce-playground.lambdatest.io/index.php?route=account/login")
-
-
-        page.get_by_role("textbox", name="E-Mail").fill(login_credentials["valid_email"])
-        page.get_by_role("textbox", name="Password").fill(login_credentials["valid_password"])
-        page.get_by_role("button", name="Login").click()
-
-        page.wait_for_load_state("networkidle")
+    def test_get_saved_addresses_count(self, page: Page, seeded_account, login_credentials):
+        log_in_for_history(page, seeded_account, login_credentials)
 
         account_page = AccountPage(page)
         account_page.view_address_book()
@@ -227,7 +231,10 @@ class TestAddressBook:
 
         address_book = AddressBookPage(page)
         addresses_count = address_book.get_addresses_count()
-        assert addresses_count >= 0, "Addresses count should be non-negative"
+        if seeded_account is None:
+            assert addresses_count >= 0, "Addresses count should be non-negative"
+        else:
+            assert addresses_count == seeded_account["addresses"], "Address book should hold every seeded address"
 
     def test_add_new_address(self, page: Page, login_credentials):
         page.goto("https://ecommerce-playground.lambdatest.io/index.php?route=account/login")
@@ -261,6 +268,25 @@ class TestAddressBook:
         assert final_count >= initial_count, "Address should be added"
 
 
+@pytest.mark.seed(orders=ORDER_PAGE_SIZE + 1)
+class TestOrderHistoryPagination:
+
+    def test_order_history_paginates(self, page: Page, seeded_account):
+        if seeded_account is None:
+            pytest.skip("account seeding is off (--seed-accounts or SEED_ACCOUNTS=true)")
+        page.goto(LOGIN_PATH)
+        LoginPage(page).login(seeded_account["email"], seeded_account["password"])
+        page.wait_for_load_state("networkidle")
+
+        page.goto(ORDER_HISTORY_PATH)
+        order_history = OrderHistoryPage(page)
+        assert order_history.get_orders_count() == ORDER_PAGE_SIZE, "First page should be full"
+        expect(page.locator(".pagination")).to_be_visible()
+
+        page.goto(f"{ORDER_HISTORY_PATH}&page=2")
+        assert order_history.get_orders_count() == seeded_account["orders"] - ORDER_PAGE_SIZE, "Second page should show the rest"
+
+
 class TestAccountManagement:
 
     def test_view_account_page(self, page: Page, login_credentials):
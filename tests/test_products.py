@@ -6,6 +6,10 @@ from pages import HomePage, ProductPage, ProductListPage
 CATEGORY_PATH = f"{BASE_URL}/index.php?route=product/category&path=20"
 
 
+def open_first_product(page: Page):
+    ProductListPage(page).click_product(0)
+
+
 class TestProductBrowsing:
 
     def test_navigate_to_shop(self, page: Page):
@@ -23,39 +27,34 @@ class TestProductBrowsing:
         products_count = home_page.get_featured_products_count()
         assert products_count > 0, "No featured products found"
 
-    def test_product_list_displays_correctly(self, page: Page):
-        page.goto(CATEGORY_PATH)
+    @pytest.mark.page_weight_budget(max_bytes=10_000_000, max_requests=300)
+    def test_home_page_weight_within_budget(self, page: Page):
+        home_page = HomePage(page)
+        home_page.navigate_to_home()
 
+        page.wait_for_load_state("networkidle")
+        expect(home_page.search_input).to_be_visible()
+
+    @pytest.mark.readonly_page(CATEGORY_PATH)
+    def test_product_list_displays_correctly(self, page: Page):
         product_list = ProductListPage(page)
         products_count = product_list.get_products_count()
         assert products_count > 0, "No products found in list"
 
+    @pytest.mark.readonly_page(CATEGORY_PATH, prepare=open_first_product)
     def test_click_product_opens_details(self, page: Page):
-        page.goto(CATEGORY_PATH)
-
-        product_list = ProductListPage(page)
-        product_list.click_product(0)
-
         product_page = ProductPage(page)
         product_name = product_page.get_product_name()
         assert product_name, "Product name not found"
 
+    @pytest.mark.readonly_page(CATEGORY_PATH, prepare=open_first_product)
     def test_product_shows_price(self, page: Page):
-        page.goto(CATEGORY_PATH)
-
-        product_list = ProductListPage(page)
-        product_list.click_product(0)
-
         product_page = ProductPage(page)
         price = product_page.get_product_price()
         assert price and len(price) > 0, "Price not displayed"
 
+    @pytest.mark.readonly_page(CATEGORY_PATH, prepare=open_first_product)
     def test_product_shows_stock_status(self, page: Page):
-        page.goto(CATEGORY_PATH)
-
-        product_list = ProductListPage(page)
-        product_list.click_product(0)
-
         product_page = ProductPage(page)
         in_stock = product_page.is_product_in_stock()
         assert isinstance(in_stock, bool), "Stock status not determined"
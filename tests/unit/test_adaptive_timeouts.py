@@ -0,0 +1,100 @@
+import pytest
+from types import SimpleNamespace
+from playwright.sync_api import TimeoutError
+from utils.adaptive_timeouts import AdaptiveTimeouts, HISTORY_KEY, save_history
+from utils.route_latency import LatencyHistogram
+
+
+class FakeCache:
+
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+
+    def get(self, key, default):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+class FakePage:
+
+    def __init__(self):
+        self.timeouts = []
+
+    def set_default_timeout(self, timeout):
+        self.timeouts.append(timeout)
+
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+
+def histogram(*values):
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    return histogram
+
+
+def tracker(history=None, enabled=True):
+    return AdaptiveTimeouts(
+        history or {}, enabled=enabled, multiple=3.0, floor=1000, ceiling=20000,
+        min_samples=5, default_timeout=30000, navigation_timeout=60000,
+    )
+
+
+class TestTimeoutFor:
+
+    def test_multiple_of_p99_clamped(self):
+        timeouts = tracker({
+            "fast": histogram(*[10.0] * 10).to_dict(),
+            "normal": histogram(*[1000.0] * 10).to_dict(),
+            "slow": histogram(*[30000.0] * 10).to_dict(),
+        })
+        assert timeouts.timeout_for("fast")[0] == 1000
+        assert timeouts.timeout_for("normal")[0] == pytest.approx(3000, rel=0.02)
+        assert timeouts.timeout_for("slow")[0] == 20000
+
+    def test_defaults_without_enough_history_or_when_disabled(self):
+        history = {"few": histogram(100.0).to_dict(), "many": histogram(*[100.0] * 10).to_dict()}
+        assert tracker(history).timeout_for("few") == (None, "default")
+        assert tracker(history).timeout_for("unknown") == (None, "default")
+        assert tracker(history, enabled=False).timeout_for("many") == (None, "default")
+
+
+class TestRun:
+
+    def test_nested_actions_restore_the_outer_timeout(self):
+        timeouts = tracker({
+            "outer": histogram(*[1000.0] * 10).to_dict(),
+            "inner": histogram(*[2000.0] * 10).to_dict(),
+        })
+        page = FakePage()
+        timeouts.run(page, "outer", lambda: timeouts.run(page, "inner", lambda: None))
+
+        outer, inner = timeouts.applied["outer"], timeouts.applied["inner"]
+        assert page.timeouts == [outer, inner, outer, 30000]
+        assert set(timeouts.observed) == {"outer", "inner"}
+
+    def test_timeouts_are_annotated_and_not_learned(self):
+        timeouts = tracker({"click": histogram(*[1000.0] * 10).to_dict()})
+
+        def fail():
+            raise TimeoutError("Timeout 3000ms exceeded.")
+
+        with pytest.raises(TimeoutError, match=r"\[adaptive timeout\] click ran with"):
+            timeouts.run(FakePage(), "click", fail)
+        assert timeouts.observed == {}
+
+
+class TestSaveHistory:
+
+    def test_decays_old_runs_and_merges_observed(self):
+        faded = {"precision": 0.01, "counts": {"5": 0.01}}
+        cache = FakeCache({HISTORY_KEY: {"old": histogram(100.0).to_dict(), "faded": faded}})
+        save_history(SimpleNamespace(cache=cache), {"new": histogram(50.0)})
+
+        stored = {action: LatencyHistogram.from_dict(data) for action, data in cache.data[HISTORY_KEY].items()}
+        assert set(stored) == {"old", "new"}, "Counts that decay below 0.01 should be dropped"
+        assert stored["old"].total == pytest.approx(0.8)
+        assert stored["new"].total == 1
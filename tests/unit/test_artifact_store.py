@@ -0,0 +1,66 @@
+import os
+import pytest
+from utils.artifact_store import ArtifactStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts")
+    yield store
+    store.close()
+
+
+def age_refs(store, run: str, seconds: float):
+    store.db.execute("UPDATE refs SET created = created - ? WHERE run = ?", (seconds, run))
+    store.db.commit()
+
+
+class TestArtifactStore:
+
+    def test_compressible_data_is_gzipped_and_round_trips(self, store):
+        data = b"<html>" + b"log line\n" * 2000 + b"</html>"
+        digest = store.put(data, "t::a", "dom", "page.html", run="run1")
+
+        path = store.blob_path(digest)
+        assert path.name.endswith(".html.gz")
+        assert path.stat().st_size < len(data) / 10
+        assert store.get(digest) == data
+
+    def test_incompressible_data_is_stored_as_is(self, store):
+        data = os.urandom(4096)
+        digest = store.put(data, "t::a", "screenshot", "shot.png", run="run1")
+
+        assert store.blob_path(digest).name == f"{digest}.png"
+        assert store.get(digest) == data
+
+    def test_identical_content_is_stored_once(self, store):
+        data = b"same screenshot" * 100
+        first = store.put(data, "t::a", "screenshot", "a.png", run="run1")
+        second = store.put(data, "t::b", "screenshot", "b.png", run="run1")
+
+        assert first == second
+        assert store.stats()["blobs"] == 1
+        assert store.stats()["refs"] == 2
+        assert [ref["name"] for ref in store.artifacts_for("t::b")] == ["b.png"]
+
+    def test_prune_by_age_keeps_blobs_still_referenced(self, store):
+        shared = store.put(b"shared" * 100, "t::old", "log", "a.txt", run="old")
+        store.put(b"shared" * 100, "t::new", "log", "a.txt", run="new")
+        only_old = store.put(b"old only" * 100, "t::old", "log", "b.txt", run="old")
+        age_refs(store, "old", 10 * 86400)
+
+        assert store.prune(max_age_days=5) == 1
+        assert store.get(shared)
+        assert not (store.blob_dir / only_old[:2] / f"{only_old}.txt.gz").exists()
+        with pytest.raises(KeyError):
+            store.get(only_old)
+
+    def test_prune_by_size_drops_oldest_runs_first(self, store):
+        for index, run in enumerate(["run1", "run2", "run3"]):
+            store.put(os.urandom(1000), f"t::{run}", "screenshot", "shot.png", run=run)
+            age_refs(store, run, (3 - index) * 60)
+
+        removed = store.prune(max_bytes=2000)
+        assert removed == 1
+        assert store.artifacts_for("t::run1") == []
+        assert store.stats()["stored_bytes"] == 2000
@@ -0,0 +1,46 @@
+from utils import autoscale
+from utils.autoscale import MemoryThrottle, choose_workers
+
+GB = 1024 ** 3
+
+
+class TestChooseWorkers:
+
+    def test_memory_bound(self):
+        count, reasons = choose_workers({"cpu_cores": 0.5, "rss_mb": 1024}, 8, (16 * GB, 4 * GB), margin=0.25)
+
+        assert count == 3
+        assert reasons == [
+            "8 cores / 0.50 per worker = 16",
+            "3072 MB available after a 25% margin / 1024 MB per worker = 3",
+        ]
+
+    def test_cpu_bound_with_a_floor_per_worker(self):
+        count, _ = choose_workers({"cpu_cores": 0.1, "rss_mb": 100}, 4, (16 * GB, 12 * GB), margin=0.2)
+        assert count == 8, "A worker never counts for less than MIN_CPU_PER_WORKER"
+
+    def test_unknown_memory_cap_and_minimum(self):
+        count, reasons = choose_workers({"cpu_cores": 2.0, "rss_mb": 500}, 8, None, margin=0.2, max_workers=3)
+        assert count == 3
+        assert reasons[1] == "memory unknown (install psutil), sized by CPU only"
+        assert reasons[2] == "capped at AUTOSCALE_MAX_WORKERS=3"
+
+        assert choose_workers({"cpu_cores": 4.0, "rss_mb": 4096}, 2, (8 * GB, 1 * GB), margin=0.5)[0] == 1
+
+
+class TestMemoryThrottle:
+
+    def test_high_follows_the_threshold_and_records_the_peak(self, monkeypatch):
+        throttle = MemoryThrottle(90, interval=0)
+        throttle.supported = True
+        readings = iter([(100, 5), (100, 40), (100, 5)])
+        monkeypatch.setattr(autoscale, "system_memory", lambda: next(readings))
+
+        assert throttle.high()
+        assert not throttle.high()
+        assert throttle.high()
+        assert throttle.summary()["peak_percent"] == 95.0
+
+    def test_unsupported_platform_never_throttles(self, monkeypatch):
+        monkeypatch.setattr(autoscale, "system_memory", lambda: None)
+        assert not MemoryThrottle(10).high()
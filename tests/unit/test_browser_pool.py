@@ -0,0 +1,79 @@
+import os
+import pytest
+from utils import browser_pool
+from utils.browser_pool import BrowserPool, utilization
+
+ENDPOINTS = ["ws://a", "ws://b", "ws://c"]
+DEAD_PID = 999999
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(browser_pool, "pid_alive", lambda pid: pid != DEAD_PID)
+    pool = BrowserPool(None, ENDPOINTS, tmp_path, "run-1", "gw0")
+    yield pool
+    pool.db.close()
+
+
+def assign(pool, worker, endpoint, pid=None, run="run-1"):
+    pool.db.execute(
+        "INSERT INTO assignments VALUES (?, ?, ?, ?)", (run, worker, endpoint, pid or os.getpid())
+    )
+
+
+def assignments(pool) -> dict:
+    return dict(pool.db.execute("SELECT worker, endpoint FROM assignments").fetchall())
+
+
+class TestClaim:
+
+    def test_least_loaded_endpoint_is_claimed(self, pool):
+        assign(pool, "gw1", "ws://a")
+        assign(pool, "gw2", "ws://b")
+        assign(pool, "gw3", "ws://a")
+
+        assert pool._claim(set(), ()) == "ws://c"
+        assert assignments(pool)["gw0"] == "ws://c"
+
+    def test_ties_go_to_the_first_listed_endpoint(self, pool):
+        assert pool._claim(set(), ()) == "ws://a"
+        assert pool._claim({"ws://a"}, ()) == "ws://b", "A retry replaces this worker's own assignment"
+        assert assignments(pool) == {"gw0": "ws://b"}
+
+    def test_avoided_endpoint_comes_last_even_when_idle(self, pool):
+        assign(pool, "gw1", "ws://b")
+        assign(pool, "gw2", "ws://c")
+
+        assert pool._claim(set(), ("ws://a",)) == "ws://b"
+        assert pool._claim({"ws://b", "ws://c"}, ("ws://a",)) == "ws://a"
+        assert pool._claim(set(ENDPOINTS), ("ws://a",)) is None
+
+    def test_dead_workers_assignments_are_pruned(self, pool):
+        assign(pool, "gw1", "ws://a", pid=DEAD_PID)
+        assign(pool, "gw2", "ws://a", pid=DEAD_PID, run="run-0")
+        assign(pool, "gw3", "ws://b")
+
+        assert pool._claim(set(), ()) == "ws://a", "Crashed workers should not count as load"
+        assert assignments(pool) == {"gw3": "ws://b", "gw0": "ws://a"}
+
+
+class TestUtilization:
+
+    def test_sums_per_endpoint_for_the_run(self, pool, tmp_path):
+        rows = [
+            ("run-1", "gw0", "ws://a", 4, 6.0, 10.0, 0, 0),
+            ("run-1", "gw1", "ws://a", 2, 3.0, 10.0, 1, 0),
+            ("run-1", "gw1", "ws://b", 0, 0, 0, 0, 1),
+            ("run-0", "gw0", "ws://a", 9, 9.0, 9.0, 0, 0),
+        ]
+        pool.db.executemany("INSERT INTO usage VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+        stats = utilization(tmp_path, "run-1")
+
+        assert stats["ws://a"] == {
+            "workers": 2, "contexts": 6, "busy_seconds": 9.0, "connected_seconds": 20.0,
+            "utilization": 0.45, "reconnects": 1, "health_failures": 0,
+        }
+        assert stats["ws://b"]["workers"] == 0, "A failed health check is not a connected worker"
+        assert stats["ws://b"]["health_failures"] == 1
+        assert stats["ws://b"]["utilization"] == 0.0
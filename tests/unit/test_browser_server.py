@@ -0,0 +1,56 @@
+import sys
+import time
+import threading
+import json
+import subprocess
+from playwright._impl._driver import compute_driver_executable
+from utils.browser_server import BrowserServer, pid_alive, process_command
+
+
+def spawn(command):
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # The command line reads empty until the child has exec'd
+    deadline = time.monotonic() + 5
+    while not process_command(process.pid) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return process
+
+
+def write_state(server, pid):
+    server.directory.mkdir(parents=True, exist_ok=True)
+    server.state_path.write_text(json.dumps({"pid": pid, "wsEndpoint": "ws://127.0.0.1:1/x"}))
+
+
+class TestTerminate:
+
+    def test_unrelated_process_named_by_stale_state_is_left_alone(self, tmp_path):
+        server = BrowserServer(tmp_path, {"headless": True})
+        process = spawn([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            write_state(server, process.pid)
+            assert server.problem(server.state()) == f"process {process.pid} is not this browser server"
+            assert server.stop()
+
+            assert process.poll() is None, "A reused pid must not be signalled"
+            assert not server.state_path.exists()
+        finally:
+            process.kill()
+            process.wait()
+
+    def test_our_server_process_is_stopped(self, tmp_path):
+        server = BrowserServer(tmp_path, {"headless": True})
+        script = tmp_path / "server.js"
+        script.write_text("setInterval(() => {}, 1000);")
+        node, _ = compute_driver_executable()
+        process = spawn([node, str(script)])
+        try:
+            write_state(server, process.pid)
+            assert server.owns(process.pid)
+            # Reap the child as soon as it exits so pid_alive sees it gone
+            threading.Thread(target=process.wait, daemon=True).start()
+            assert server.stop()
+
+            assert not pid_alive(process.pid)
+            assert not server.state_path.exists()
+        finally:
+            process.kill()
@@ -0,0 +1,29 @@
+from utils.checkout_session import saved_address_ids
+
+ADDRESS_STEP = """
+<input type="radio" name="payment_address" value="existing" checked="checked" />
+<select name="address_id" class="form-control">
+  <option value="7" selected="selected">Test User, 1 Test Street, London</option>
+  <option value="9">Test User, 2 Other Street, Leeds</option>
+</select>
+<select name="country_id" id="input-payment-country" class="form-control">
+  <option value="222" selected="selected">United Kingdom</option>
+  <option value="223">United States</option>
+</select>
+"""
+
+NEW_ADDRESS_STEP = """
+<input type="radio" name="payment_address" value="new" checked="checked" />
+<select name="country_id" id="input-payment-country" class="form-control">
+  <option value="222">United Kingdom</option>
+</select>
+"""
+
+
+class TestSavedAddressIds:
+
+    def test_only_the_address_book_select_counts(self):
+        assert saved_address_ids(ADDRESS_STEP) == ["7", "9"]
+
+    def test_country_options_are_not_addresses(self):
+        assert saved_address_ids(NEW_ADDRESS_STEP) == []
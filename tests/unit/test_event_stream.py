@@ -0,0 +1,71 @@
+import json
+import threading
+from utils import event_stream
+from utils.event_stream import EventStream, EventTail, iter_events
+from utils.stream_report import RunState, build_report
+
+
+def phase(nodeid, when, outcome, duration=0.1, run="run1"):
+    return {"ts": 1.0, "run": run, "worker": "gw0", "type": "phase", "nodeid": nodeid,
+            "when": when, "outcome": outcome, "duration": duration}
+
+
+class TestEventStream:
+
+    def test_events_carry_the_current_test_per_thread(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(event_stream.RUN_ID_ENV, "run1")
+        stream = EventStream(tmp_path, "gw0")
+        stream.current_nodeid = "t::main"
+        other = threading.Thread(target=lambda: stream.emit("action", message="from thread"))
+        other.start()
+        other.join()
+        stream.emit("action", message="from main")
+        stream.emit("phase", nodeid="t::explicit")
+        stream.close()
+        stream.emit("action", message="after close is dropped")
+
+        events = list(iter_events(tmp_path))
+        assert [event.get("nodeid") for event in events] == [None, "t::main", "t::explicit"]
+        assert all(event["run"] == "run1" and event["worker"] == "gw0" for event in events)
+        assert stream.path.name == "run1-gw0.jsonl"
+
+    def test_tail_returns_only_complete_lines(self, tmp_path):
+        path = tmp_path / "run1-gw0.jsonl"
+        first = json.dumps({"ts": 2.0, "type": "a"})
+        second = json.dumps({"ts": 1.0, "type": "b"})
+        path.write_text(first + "\n" + second[:5], encoding="utf-8")
+        tail = EventTail(tmp_path)
+
+        assert [event["type"] for event in tail.poll()] == ["a"]
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(second[5:] + "\n")
+        assert [event["type"] for event in tail.poll()] == ["b"]
+        assert tail.poll() == []
+
+
+class TestRunState:
+
+    def test_outcomes_from_phases(self):
+        state = RunState()
+        state.feed({"ts": 0.0, "run": "run1", "type": "collection", "count": 3})
+        events = [
+            phase("t::ok", "setup", "passed"), phase("t::ok", "call", "passed"), phase("t::ok", "teardown", "passed"),
+            phase("t::bad", "setup", "passed"), phase("t::bad", "call", "failed"),
+            phase("t::bad", "teardown", "passed"),
+            phase("t::err", "setup", "failed"), phase("t::err", "teardown", "passed"),
+        ]
+        finished = [record for record in map(state.feed, events) if record is not None]
+
+        assert [(record.nodeid, record.outcome) for record in finished] == [
+            ("t::ok", "passed"), ("t::bad", "failed"), ("t::err", "error")
+        ]
+        assert state.total == 3
+        assert abs(finished[0].duration - 0.3) < 1e-9
+
+    def test_build_report_writes_a_row_per_finished_test(self, tmp_path):
+        events = [phase("t::<ok>", "call", "passed"), phase("t::<ok>", "teardown", "passed")]
+        build_report(events, tmp_path / "report.html")
+
+        text = (tmp_path / "report.html").read_text(encoding="utf-8")
+        assert "t::&lt;ok&gt;" in text, "Node ids must be escaped"
+        assert "1 passed, 0 failed" in text
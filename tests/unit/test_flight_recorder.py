@@ -0,0 +1,74 @@
+import json
+import base64
+import zipfile
+from utils import flight_recorder
+from utils.flight_recorder import FlightRecorder
+
+
+class FakeCdp:
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, method, params=None):
+        self.sent.append(method)
+
+
+def recorder(**options):
+    recording = FlightRecorder(page=None, **options)
+    recording.cdp = FakeCdp()
+    return recording
+
+
+def frame(timestamp, size=10):
+    # Screencast frames arrive base64-encoded with a metadata timestamp
+    data = bytes([int(timestamp) % 256]) * size
+    return {"sessionId": 1, "data": base64.b64encode(data).decode(), "metadata": {"timestamp": timestamp}}
+
+
+class TestRing:
+
+    def test_frames_older_than_the_window_are_evicted(self):
+        recording = recorder(seconds=2, fps=1)
+        for timestamp in range(6):
+            recording._on_frame(frame(timestamp))
+
+        assert [timestamp for timestamp, _ in recording.frames] == [3, 4, 5]
+        assert recording.buffered_bytes == 30
+        assert recording.cdp.sent.count("Page.screencastFrameAck") == 6
+
+    def test_max_bytes_evicts_the_oldest_frames(self):
+        recording = recorder(seconds=60, fps=1, max_bytes=25)
+        for timestamp in range(4):
+            recording._on_frame(frame(timestamp))
+
+        assert [timestamp for timestamp, _ in recording.frames] == [2, 3]
+        assert recording.buffered_bytes == 20
+        assert recording.peak_bytes == 20
+
+    def test_frames_faster_than_fps_are_dropped(self):
+        recording = recorder(seconds=60, fps=2)
+        for timestamp in (0, 0.1, 0.3, 0.5, 0.6):
+            recording._on_frame(frame(timestamp))
+
+        assert [timestamp for timestamp, _ in recording.frames] == [0, 0.5]
+        assert recording.stats["dropped"] == 3
+
+
+class TestEncode:
+
+    def test_falls_back_to_a_frame_zip_without_ffmpeg(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(flight_recorder.shutil, "which", lambda name: None)
+        recording = recorder(seconds=60, fps=1)
+        for timestamp in (1, 2):
+            recording._on_frame(frame(timestamp))
+
+        clip = recording.encode(tmp_path / "clips", "test_checkout")
+
+        assert clip == tmp_path / "clips" / "test_checkout.frames.zip"
+        with zipfile.ZipFile(clip) as archive:
+            assert json.loads(archive.read("frames.json")) == [
+                {"file": "frame-0000.jpg", "timestamp": 1},
+                {"file": "frame-0001.jpg", "timestamp": 2},
+            ]
+            assert archive.read("frame-0001.jpg") == bytes([2]) * 10
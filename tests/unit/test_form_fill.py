@@ -0,0 +1,117 @@
+import pytest
+from types import SimpleNamespace
+from playwright.sync_api import Error
+from utils import form_fill
+from utils.form_fill import HISTORY_KEY, FormFiller, FormTimings, save_history
+from utils.route_latency import LatencyHistogram
+
+
+@pytest.fixture(autouse=True)
+def no_session_timings(monkeypatch):
+    # Fake fills must not end up in the timings this run persists
+    monkeypatch.setattr(form_fill, "_timings", None)
+
+
+class FakeCache:
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+class FakeLocator:
+
+    def __init__(self, selector):
+        self._impl_obj = SimpleNamespace(_selector=selector)
+        self.waited = []
+        self.filled = None
+
+    @property
+    def first(self):
+        return self
+
+    def wait_for(self, state):
+        self.waited.append(state)
+
+    def evaluate(self, expression):
+        return "INPUT"
+
+    def fill(self, value):
+        self.filled = value
+
+
+class FakePage:
+    # evaluate() raises the given error or fills every field in the page
+
+    def __init__(self, error=None):
+        self.error = error
+        self.evaluated = []
+
+    def evaluate(self, expression, fields):
+        self.evaluated.append(fields)
+        if self.error is not None:
+            raise Error(self.error)
+        return [{"filled": True, "validation": ""} for _ in fields]
+
+
+def filler(page):
+    return FormFiller(page, "address_book", {
+        "firstname": FakeLocator("#input-firstname"),
+        "company": FakeLocator("button:has-text('Company')"),
+    })
+
+
+class TestFormFiller:
+
+    def test_batch_waits_for_the_first_field(self):
+        form = filler(FakePage())
+        result = form.fill({"firstname": "Ada", "company": "ACME"})
+
+        assert form.fields["firstname"].waited == ["attached"]
+        assert result.batched == ["firstname"]
+        assert result.fallbacks == {"company": "selector not supported in page"}
+        assert form.fields["company"].filled == "ACME"
+
+    def test_only_plain_css_locators_are_filled_in_the_page(self):
+        page = FakePage()
+        form = FormFiller(page, "login", {
+            "email": FakeLocator("#input-email"),
+            "password": FakeLocator('internal:label="Password"i'),
+        })
+        result = form.fill({"email": "ada@example.com", "password": "secret"})
+
+        assert [field["steps"] for field in page.evaluated[0]] == [[{"engine": "css", "selector": "#input-email"}]]
+        assert result.batched == ["email"]
+        assert form.fields["password"].filled == "secret"
+
+    def test_navigation_during_the_batch_fills_every_field_sequentially(self):
+        form = filler(FakePage("Execution context was destroyed, most likely because of a navigation"))
+        result = form.fill({"firstname": "Ada", "company": "ACME"})
+
+        assert result.batched == []
+        assert result.fallbacks["firstname"] == "navigation during fill"
+        assert form.fields["firstname"].filled == "Ada"
+        assert form.fields["company"].filled == "ACME"
+
+    def test_other_errors_are_raised(self):
+        with pytest.raises(Error, match="boom"):
+            filler(FakePage("boom")).fill({"firstname": "Ada"})
+
+
+class TestSaveHistory:
+
+    def test_decays_into_the_cache_without_touching_the_timings(self):
+        histogram = LatencyHistogram()
+        histogram.record(100.0)
+        timings = FormTimings({"sequential": {"register": histogram.to_dict()}})
+        timings.record("register", "sequential", 100.0)
+        before = timings.summary_lines()
+        cache = FakeCache()
+        save_history(SimpleNamespace(cache=cache), timings)
+
+        stored = LatencyHistogram.from_dict(cache.data[HISTORY_KEY]["sequential"]["register"])
+        assert stored.total == pytest.approx(1.8)
+        assert timings.history["sequential"]["register"].total == 1
+        assert timings.summary_lines() == before
@@ -0,0 +1,59 @@
+import pstats
+import pytest
+from types import SimpleNamespace
+from utils import harness_profiler
+from utils.harness_profiler import aggregate, safe_name, summary_lines
+
+TEST_FILE = "/repo/tests/test_cart.py"
+IPC = ("/site-packages/playwright/_impl/_sync_base.py", 80, "_sync")
+RUN = ("/repo/pytest_plugins.py", 1, "run")
+TEST = (TEST_FILE, 10, "test_add")
+PAGE_OBJECT = ("/repo/pages/cart_page.py", 5, "add_item")
+
+
+def profile(nodeid, wall, ipc, samples):
+    timer = SimpleNamespace(seconds=ipc)
+    # Imported through the module so pytest does not collect the class
+    result = harness_profiler.TestProfile(nodeid, TEST_FILE, timer, interval=0.005)
+    result.wall = wall
+    result.sampler.samples = samples
+    return result
+
+
+class TestBreakdown:
+
+    def test_ipc_is_exact_and_the_rest_split_by_samples(self):
+        result = profile("tests/test_cart.py::test_add", wall=10.0, ipc=6.0, samples=[
+            ([RUN, TEST, IPC], 5.0),
+            ([RUN, TEST], 1.0),
+            ([RUN, TEST, PAGE_OBJECT], 3.0),
+        ])
+        breakdown = result.breakdown()
+
+        assert breakdown["ipc"] == 6.0
+        assert breakdown["test"] == pytest.approx(1.0)
+        assert breakdown["harness"] == pytest.approx(3.0)
+        assert result.hotspots() == {"add_item (pages/cart_page.py:5)": 3.0, "test_add (tests/test_cart.py:10)": 1.0}
+
+
+class TestAggregate:
+
+    def test_written_profiles_add_up(self, tmp_path):
+        first = profile("tests/test_cart.py::test_add", 4.0, 2.0, [([RUN, TEST, PAGE_OBJECT], 2.0)])
+        second = profile("tests/test_cart.py::test_remove", 2.0, 1.0, [([RUN, TEST], 1.0)])
+        for result in (first, second):
+            stem = result.write(tmp_path)
+        stats = pstats.Stats(f"{stem}.pstats")
+
+        summary = aggregate(tmp_path)
+        assert summary["totals"] == {"wall": 6.0, "ipc": 3.0, "harness": 2.0, "test": 1.0}
+        assert summary["hotspots"]["add_item (pages/cart_page.py:5)"] == 2.0
+        assert stats.total_tt == pytest.approx(1.0)
+
+        lines = summary_lines(summary)
+        assert lines[0] == "2 tests, 6.0s: waiting on Playwright IPC 50%, harness code 33%, test code 17%"
+        assert lines[2].endswith("tests/test_cart.py::test_add")
+
+    def test_node_ids_of_one_module_get_separate_files(self):
+        assert safe_name("tests/test_cart.py::test_add[a/b]") == "tests_test_cart.py_test_add_a_b_"
+        assert summary_lines({"tests": [], "totals": {}, "hotspots": {}}) == []
@@ -0,0 +1,85 @@
+import pytest
+from playwright.sync_api import Error
+from utils.helpers import wait_for_element_visible, wait_for_element_hidden, wait_for_url_change
+
+
+class FakeLocator:
+
+    def __init__(self):
+        self.waits = []
+
+    def wait_for(self, state, timeout):
+        self.waits.append((state, timeout))
+
+
+class FakePage:
+    # evaluate() plays the in-page waiter: it raises the given error, or
+    # resolves with the waiter's result
+
+    def __init__(self, error=None):
+        self.error = error
+        self.evaluated = []
+        self.fallback = FakeLocator()
+        self.waits = []
+
+    def evaluate(self, expression, args=None):
+        self.evaluated.append(args)
+        if self.error is not None:
+            raise Error(self.error)
+        return {"met": [True], "resolvedAt": 0.0, "elapsed": 1.0}
+
+    def locator(self, selector):
+        return self.fallback
+
+    def wait_for_url(self, url, timeout):
+        self.waits.append(("url", url))
+
+    def wait_for_load_state(self, timeout):
+        self.waits.append(("load", timeout))
+
+
+class TestElementWaits:
+
+    def test_in_page_wait_is_strict(self):
+        page = FakePage()
+        wait_for_element_visible(page, "#ok", timeout=500)
+
+        (condition,) = page.evaluated[0]["conditions"]
+        assert condition == {"kind": "visible", "selector": "#ok", "strict": True}
+        assert page.fallback.waits == []
+
+    @pytest.mark.parametrize("message", [
+        "Execution context was destroyed, most likely because of a navigation",
+        "Failed to execute 'querySelector': 'text=Login' is not a valid selector.",
+    ])
+    def test_navigation_and_non_css_selectors_fall_back_to_the_locator(self, message):
+        page = FakePage(message)
+        wait_for_element_visible(page, "text=Login", timeout=500)
+        wait_for_element_hidden(page, "text=Login", timeout=500)
+
+        assert [state for state, _ in page.fallback.waits] == ["visible", "hidden"]
+        assert all(0 < timeout <= 500 for _, timeout in page.fallback.waits)
+
+    def test_strict_mode_violation_is_raised(self):
+        page = FakePage('strict mode violation: ".item" resolved to 3 elements')
+        with pytest.raises(Error, match="strict mode violation"):
+            wait_for_element_visible(page, ".item", timeout=500)
+        assert page.fallback.waits == []
+
+
+class TestUrlChange:
+
+    def test_waits_for_the_load_after_the_url_matches(self):
+        page = FakePage()
+        wait_for_url_change(page, "route=account/account", timeout=500)
+
+        (condition,) = page.evaluated[0]["conditions"]
+        assert condition["kind"] == "url"
+        assert [kind for kind, _ in page.waits] == ["load"]
+
+    def test_navigation_falls_back_to_wait_for_url(self):
+        page = FakePage("Execution context was destroyed, most likely because of a navigation")
+        wait_for_url_change(page, "route=account/account", timeout=500)
+
+        assert page.waits[0] == ("url", "**route=account/account**")
+        assert page.waits[1][0] == "load"
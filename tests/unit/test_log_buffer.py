@@ -0,0 +1,140 @@
+import io
+import os
+import sys
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from utils import log_buffer
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def record(message, level=logging.INFO):
+    return logging.LogRecord("demo", level, __file__, 1, message, None, None)
+
+
+def make_buffer(capacity=3):
+    writer = ListHandler()
+    # Imported through the module so pytest does not collect the class
+    buffer = log_buffer.TestLogBuffer(capacity, writer, console_level=logging.WARNING)
+    buffer.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    return buffer, writer
+
+
+class TestLogBuffer:
+
+    def test_outside_a_test_records_below_console_level_pass_through(self):
+        buffer, writer = make_buffer()
+        buffer.handle(record("setup"))
+        buffer.handle(record("already on the console", logging.ERROR))
+
+        assert writer.messages == ["setup"]
+
+    def test_passing_test_writes_nothing(self):
+        buffer, writer = make_buffer()
+        buffer.start("test_a")
+        buffer.handle(record("step"))
+        buffer.discard()
+
+        assert writer.messages == []
+        assert buffer.flush_records() == ""
+
+    def test_flush_reports_the_newest_records_and_counts_dropped_ones(self):
+        buffer, writer = make_buffer(capacity=2)
+        buffer.start("test_a")
+        for message in ("one", "two", "three"):
+            buffer.handle(record(message))
+        buffer.handle(record("boom", logging.ERROR))
+
+        assert buffer.flush_records().splitlines() == [
+            "... 2 earlier records dropped (LOG_BUFFER_CAPACITY=2)", "INFO three", "ERROR boom"
+        ]
+        assert writer.messages == ["three"], "Records at console level were written when logged"
+        assert buffer.flush_records() == ""
+
+    def test_threads_keep_their_own_buffer(self):
+        buffer, _ = make_buffer()
+        buffer.start("test_main")
+        buffer.handle(record("main"))
+        flushed = []
+
+        def other():
+            buffer.start("test_thread")
+            buffer.handle(record("thread"))
+            flushed.append(buffer.flush_records())
+
+        worker = threading.Thread(target=other)
+        worker.start()
+        worker.join()
+        assert flushed == ["INFO thread"]
+        assert buffer.nodeid == "test_main"
+        assert buffer.flush_records() == "INFO main"
+
+
+class TestLogPipeline:
+
+    def test_console_lines_are_held_until_taken(self):
+        output = io.StringIO()
+        pipeline = log_buffer.LogPipeline(logging.INFO, logging.WARNING, 10, output)
+        pipeline.buffer.start("test_a")
+        pipeline.buffer.handle(record("kept in the ring"))
+        pipeline.immediate.handle(record("slow page", logging.WARNING))
+        pipeline.listener.start()
+        pipeline.listener.stop()
+
+        assert output.getvalue() == "", "Nothing may be written while a test line is in progress"
+        (line,) = pipeline.console_lines()
+        assert line.endswith("WARNING - slow page")
+        assert pipeline.console_lines() == []
+
+    def test_uninstall_writes_what_was_never_taken(self):
+        output = io.StringIO()
+        pipeline = log_buffer.LogPipeline(logging.INFO, logging.WARNING, 10, output)
+        pipeline.install()
+        try:
+            logging.getLogger("demo").error("after the last test")
+        finally:
+            pipeline.uninstall()
+
+        assert output.getvalue().endswith("ERROR - after the last test\n")
+
+
+def run_buffered(directory, source, *args):
+    (directory / "test_logs.py").write_text(source)
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "pytest_plugins", "--no-site-health", "--no-event-stream",
+         "--buffer-logs", "test_logs.py", *args],
+        cwd=directory, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+    )
+
+
+class TestBufferedLoggingConflicts:
+
+    def test_caplog_is_refused(self, tmp_path):
+        result = run_buffered(tmp_path, "def test_logs(caplog):\n    pass\n")
+
+        assert result.returncode == 4
+        assert "caplog needs pytest's logging plugin" in result.stderr
+
+    def test_log_cli_level_is_refused(self, tmp_path):
+        result = run_buffered(tmp_path, "def test_logs():\n    pass\n", "--log-cli-level=INFO")
+
+        assert result.returncode == 4
+        assert "cannot be combined with --log-cli-level" in result.stderr
+
+    def test_sync_logging_keeps_caplog(self, tmp_path):
+        result = run_buffered(tmp_path, "def test_logs(caplog):\n    pass\n", "--sync-logging")
+
+        assert result.returncode == 0, result.stdout[-2000:]
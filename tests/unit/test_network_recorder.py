@@ -0,0 +1,70 @@
+from utils.network_recorder import NetworkRecorder
+
+MAIN_FRAME = "frame-main"
+
+
+def request(recorder, request_id, url, resource_type="Script", frame=MAIN_FRAME, timestamp=1.0):
+    recorder._on_request("page", {
+        "requestId": request_id,
+        "type": resource_type,
+        "frameId": frame,
+        "timestamp": timestamp,
+        "request": {"url": url},
+    })
+
+
+def finish(recorder, request_id, size, timestamp=1.5):
+    recorder._on_finished({"requestId": request_id, "encodedDataLength": size, "timestamp": timestamp})
+
+
+class TestNetworkRecorder:
+
+    def test_traffic_is_split_per_main_frame_page_load(self):
+        recorder = NetworkRecorder(context=None)
+        request(recorder, "1", "https://shop/home", "Document")
+        finish(recorder, "1", 30_000)
+        request(recorder, "2", "https://shop/app.js")
+        finish(recorder, "2", 70_000)
+        request(recorder, "3", "https://ads/frame", "Document", frame="frame-ad")
+        finish(recorder, "3", 5_000)
+        request(recorder, "4", "https://shop/cart", "Document")
+        finish(recorder, "4", 10_000)
+
+        summary = recorder.summary()
+        assert summary["requests"] == 4
+        assert summary["bytes"] == 115_000
+        assert summary["pages"] == [
+            {"url": "https://shop/home", "requests": 3, "bytes": 105_000},
+            {"url": "https://shop/cart", "requests": 1, "bytes": 10_000},
+        ]
+        assert summary["bytes_by_type"] == {"Script": 70_000, "Document": 45_000}
+
+    def test_cache_hits_and_failures(self):
+        recorder = NetworkRecorder(context=None)
+        request(recorder, "1", "https://shop/home", "Document")
+        recorder._on_response({"requestId": "1", "response": {"status": 304, "headers": {}}})
+        finish(recorder, "1", 300)
+        request(recorder, "2", "https://shop/logo.png", "Image")
+        recorder._on_served_from_cache({"requestId": "2"})
+        finish(recorder, "2", 0)
+        request(recorder, "3", "https://shop/broken.js")
+        recorder._on_failed({"requestId": "3"})
+
+        assert recorder.cache_hits == 2
+        assert recorder.failed == 1
+        assert recorder.page_loads[0].requests == 3
+
+    def test_budget_violations_per_page_load_and_url_filter(self):
+        recorder = NetworkRecorder(context=None)
+        request(recorder, "1", "https://shop/home", "Document")
+        finish(recorder, "1", 2_000)
+        request(recorder, "2", "https://shop/cart", "Document")
+        finish(recorder, "2", 500)
+
+        assert recorder.budget_violations(max_bytes=1_000) == [
+            "https://shop/home: 2000 bytes > budget 1000"
+        ]
+        assert recorder.budget_violations(max_bytes=1_000, url="cart") == []
+        assert recorder.budget_violations(max_requests=0, url="cart") == [
+            "https://shop/cart: 1 requests > budget 0"
+        ]
@@ -0,0 +1,73 @@
+from utils.perf_trace import longest_tasks, main_thread_breakdown, summary_lines, top_self_time
+
+PAGE, OTHER = 10, 20
+
+
+def thread(pid, tid=1, name="CrRendererMain"):
+    return {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": name}}
+
+
+def event(name, ts, dur, pid=PAGE, tid=1, **data):
+    return {"ph": "X", "name": name, "pid": pid, "tid": tid, "ts": ts, "dur": dur, "args": {"data": data}}
+
+
+EVENTS = [
+    {"ph": "I", "name": "TracingStartedInBrowser", "args": {"data": {"frames": [{"processId": PAGE}]}}},
+    thread(PAGE), thread(OTHER), thread(PAGE, tid=2, name="Compositor"),
+    event("RunTask", 0, 10000),
+    event("FunctionCall", 0, 6000, functionName="onClick", lineNumber=12),
+    event("Layout", 1000, 2000),
+    event("Layout", 7000, 3000),
+    event("RunTask", 20000, 2000),
+    event("ParseHTML", 20000, 1500, url="https://shop/index.php"),
+    event("RunTask", 0, 50000, pid=OTHER),
+    event("Layout", 0, 50000, pid=PAGE, tid=2),
+]
+
+
+class TestTraceAggregation:
+
+    def test_breakdown_counts_outermost_events_of_the_page_main_thread(self):
+        assert main_thread_breakdown(EVENTS) == {"tasks": 12.0, "script": 6.0, "layout": 3.0, "parse": 1.5}
+
+    def test_longest_tasks_name_their_heaviest_activity(self):
+        assert longest_tasks(EVENTS) == [
+            {"ms": 10.0, "main_activity": "FunctionCall onClick:12"},
+            {"ms": 2.0, "main_activity": "ParseHTML https://shop/index.php"},
+        ]
+
+    def test_without_frames_every_renderer_main_thread_counts(self):
+        events = [e for e in EVENTS if e["name"] != "TracingStartedInBrowser"]
+        assert main_thread_breakdown(events)["tasks"] == 62.0
+
+
+class TestProfileAggregation:
+
+    def test_self_time_by_function(self):
+        profile = {
+            "nodes": [
+                {"id": 1, "callFrame": {"functionName": "(root)"}},
+                {"id": 2, "callFrame": {"functionName": "render", "url": "https://shop/app.js", "lineNumber": 9}},
+                {"id": 3, "callFrame": {"functionName": "", "url": "https://shop/app.js", "lineNumber": 0}},
+                {"id": 4, "callFrame": {"functionName": "(idle)"}},
+            ],
+            "samples": [2, 2, 3, 4, 1],
+            "timeDeltas": [0, 1000, 3000, 500, 9000],
+        }
+        assert top_self_time(profile) == [
+            {"function": "render (app.js:10)", "ms": 4.0},
+            {"function": "(anonymous) (app.js:1)", "ms": 0.5},
+        ]
+        assert top_self_time({}) == []
+
+    def test_summary_lines(self):
+        summary = {
+            "label": "test",
+            "main_thread_ms": {"tasks": 12.0, "script": 6.0},
+            "longest_tasks": [{"ms": 10.0, "main_activity": "FunctionCall onClick:12"}],
+            "top_functions": [],
+        }
+        assert summary_lines("test_a.py::test_x", summary) == [
+            "test_a.py::test_x [test]: main thread 12ms in tasks (script 6)",
+            "  longest tasks: 10ms FunctionCall onClick:12",
+        ]
@@ -0,0 +1,66 @@
+import pytest
+from types import ModuleType, SimpleNamespace
+from utils.prioritization import (
+    OUTCOMES_KEY, HISTORY_LENGTH, flakiness, order_by_risk, recent_failure_score, risk_scores, save_outcomes
+)
+
+
+class FakeCache:
+
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+
+    def get(self, key, default):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+def item(nodeid, module=None):
+    return SimpleNamespace(nodeid=nodeid, module=module)
+
+
+class TestScores:
+
+    def test_recent_failures_weigh_more(self):
+        assert recent_failure_score("PPPPF") == 1.0
+        assert recent_failure_score("FPPPP") == 0.0625
+        assert recent_failure_score("") == 0.0
+
+    def test_flakiness_counts_flips(self):
+        assert flakiness("PFPF") == 1.0
+        assert flakiness("PPFF") == pytest.approx(1 / 3)
+        assert flakiness("F") == 0.0
+
+    def test_changed_page_objects_raise_the_score(self, tmp_path):
+        source = tmp_path / "login.py"
+        source.write_text("")
+        module = ModuleType("tests.test_login")
+        module.__file__ = str(source)
+        items = [item("test_login.py::test_a", module), item("test_cart.py::test_b")]
+
+        scores = risk_scores(items, {"test_cart.py::test_b": "PPPPF"}, {source.resolve()})
+        assert scores == {"test_login.py::test_a": 1.0, "test_cart.py::test_b": 2.25}
+
+    def test_save_outcomes_keeps_the_last_runs(self):
+        cache = FakeCache({OUTCOMES_KEY: {"a": "P" * HISTORY_LENGTH}})
+        save_outcomes(SimpleNamespace(cache=cache), {"a": True, "b": False})
+
+        assert cache.data[OUTCOMES_KEY] == {"a": "P" * (HISTORY_LENGTH - 1) + "F", "b": "P"}
+
+
+class TestOrderByRisk:
+
+    def test_risky_groups_first_and_groups_stay_together(self):
+        items = [item(nodeid) for nodeid in ("a::1", "a::2", "b::1", "c::1", "c::2")]
+        scores = {"c::2": 2.0, "b::1": 0.5}
+        ordered = order_by_risk(items, scores, lambda item: item.nodeid.split("::")[0])
+
+        assert [item.nodeid for item in ordered] == ["c::1", "c::2", "b::1", "a::1", "a::2"]
+
+    def test_no_history_keeps_the_current_order(self):
+        items = [item(nodeid) for nodeid in ("b::1", "a::1", "c::1")]
+        ordered = order_by_risk(items, {}, lambda item: item.nodeid)
+
+        assert ordered == items
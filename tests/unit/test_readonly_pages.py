@@ -0,0 +1,96 @@
+import pytest
+from utils.readonly_pages import ReadonlyPagePool
+from pytest_plugins import readonly_page_conflicts
+
+
+class FakeItem:
+
+    def __init__(self, *markers, fixturenames=("page",)):
+        self.markers = {marker.name: marker for marker in markers}
+        self.fixturenames = list(fixturenames)
+
+    def get_closest_marker(self, name):
+        return self.markers.get(name)
+
+
+class FakePage:
+
+    def __init__(self):
+        self.url = None
+        self.closed = False
+        self.guard = []
+
+    def on(self, event, handler):
+        self.on_request = handler
+
+    def goto(self, url):
+        self.url = url
+
+    def evaluate(self, expression, *args):
+        taken, self.guard = self.guard, []
+        return taken
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContext:
+
+    def __init__(self):
+        self.pages = []
+
+    def new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+
+class FakeBrowser:
+
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+
+class TestReadonlyPageConflicts:
+
+    def test_recording_markers_and_fixture_conflict(self):
+        readonly = pytest.mark.readonly_page("/category").mark
+        item = FakeItem(readonly, pytest.mark.page_weight_budget(max_bytes=1).mark,
+                        fixturenames=("page", "perf_trace"))
+
+        assert readonly_page_conflicts(item) == ["page_weight_budget", "perf_trace fixture"]
+        assert readonly_page_conflicts(FakeItem(readonly, pytest.mark.perf_trace.mark)) == ["perf_trace"]
+
+    def test_plain_and_regular_tests_are_fine(self):
+        assert readonly_page_conflicts(FakeItem(pytest.mark.readonly_page("/category").mark)) == []
+        assert readonly_page_conflicts(FakeItem(pytest.mark.perf_trace.mark)) == []
+
+
+class TestReadonlyPagePool:
+
+    def test_reused_until_mutated(self):
+        browser = FakeBrowser()
+        pool = ReadonlyPagePool(browser, {})
+        first = pool.checkout("key", "https://shop/category")
+        assert pool.checkin("key", "test_a", failed=False) == []
+        assert pool.checkout("key", "https://shop/category") is first
+
+        first.guard = ["#cart content changed"]
+        assert pool.checkin("key", "test_b", failed=False) == ["#cart content changed"]
+        assert first.closed
+        assert pool.checkout("key", "https://shop/category") is not first
+        assert pool.stats() == {"loads": 2, "reuses": 1, "discarded": 1}
+        assert len(browser.contexts) == 1, "All shared pages live in one context"
+
+    def test_failed_test_discards_the_page(self):
+        pool = ReadonlyPagePool(FakeBrowser(), {})
+        page = pool.checkout("key", "https://shop/category")
+        page.url = "https://shop/product"
+
+        assert pool.checkin("key", "test_a", failed=True) == ["URL changed to https://shop/product", "test failed"]
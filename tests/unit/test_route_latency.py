@@ -0,0 +1,97 @@
+import pytest
+import threading
+from utils.route_latency import (
+    LatencyHistogram, RouteLatencyCollector, normalize_route, parse_server_timing, merge_dumps
+)
+
+ORIGIN = "https://shop.example"
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles_within_precision(self):
+        histogram = LatencyHistogram(precision=0.01)
+        for value in range(1, 1001):
+            histogram.record(float(value))
+
+        assert histogram.total == 1000
+        for percent, expected in ((50, 500), (95, 950), (99, 990), (100, 1000)):
+            assert histogram.percentile(percent) == pytest.approx(expected, rel=0.02)
+
+    def test_empty_histogram_and_non_positive_values(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0.0
+        histogram.record(0.0)
+        assert histogram.percentile(50) < 0.01
+
+    def test_merge_equals_recording_everything_in_one(self):
+        first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in (5, 10, 20):
+            first.record(value)
+            combined.record(value)
+        for value in (40, 80):
+            second.record(value)
+            combined.record(value)
+        first.merge(second)
+
+        assert first.counts == combined.counts
+        assert first.percentile(90) == combined.percentile(90)
+
+    def test_round_trips_through_dict(self):
+        histogram = LatencyHistogram()
+        for value in (1.5, 30, 300):
+            histogram.record(value)
+        restored = LatencyHistogram.from_dict(histogram.to_dict())
+
+        assert restored.counts == histogram.counts
+        assert restored.percentile(50) == histogram.percentile(50)
+
+    def test_concurrent_records_are_all_counted(self):
+        histogram = LatencyHistogram()
+
+        def record():
+            for value in range(1, 5001):
+                histogram.record(float(value))
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert histogram.total == 8 * 5000
+
+
+class TestRoutes:
+
+    def test_normalize_route(self):
+        assert normalize_route(f"{ORIGIN}/index.php?route=Product/Product&product_id=1") == "product/product"
+        assert normalize_route(f"{ORIGIN}/index.php?route=checkout/cart|add") == "checkout/cart.add"
+        assert normalize_route(f"{ORIGIN}/") == "common/home"
+        assert normalize_route(f"{ORIGIN}/catalog/view/theme.css") is None
+
+    def test_parse_server_timing(self):
+        header = 'db;dur=12.5, app;desc="php";dur=30, cache, broken;dur=x'
+        assert parse_server_timing(header) == {"db": 12.5, "app": 30.0}
+
+    def test_collector_ignores_other_origins_and_assets(self):
+        collector = RouteLatencyCollector(ORIGIN)
+        collector.record(f"{ORIGIN}/index.php?route=common/home", 40.0, 90.0, "db;dur=5")
+        collector.record(f"{ORIGIN}/index.php?route=common/home", None, 110.0)
+        collector.record("https://cdn.example/index.php?route=common/home", 1.0, 1.0)
+        collector.record(f"{ORIGIN}/image/logo.png", 1.0, 1.0)
+
+        assert list(collector.routes) == ["common/home"]
+        table = collector.percentiles()["common/home"]
+        assert table["total"]["count"] == 2
+        assert table["ttfb"]["count"] == 1
+        assert table["server.db"]["count"] == 1
+
+    def test_merge_dumps_combines_workers_of_one_run(self, tmp_path):
+        for worker, total in (("gw0", 100.0), ("gw1", 200.0)):
+            collector = RouteLatencyCollector(ORIGIN)
+            collector.record(f"{ORIGIN}/index.php?route=common/home", 10.0, total)
+            collector.dump(tmp_path / f"run1-{worker}.json")
+        RouteLatencyCollector(ORIGIN).dump(tmp_path / "run0-gw0.json")
+
+        merged = merge_dumps(tmp_path, ORIGIN, "run1")
+        assert merged.routes["common/home"]["total"].total == 2
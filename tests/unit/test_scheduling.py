@@ -0,0 +1,184 @@
+import os
+import sys
+import subprocess
+from pathlib import Path
+from types import SimpleNamespace
+from utils.scheduling import base_nodeid, scope_group, order_longest_first, load_durations, save_durations
+from utils.xdist_scheduler import LongestFirstScheduling
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class FakeItem:
+
+    def __init__(self, nodeid, scopes=(), cls=None, markers=None):
+        self.nodeid = nodeid
+        self.cls = cls
+        self.markers = markers or {}
+        self._fixtureinfo = SimpleNamespace(name2fixturedefs={
+            f"fixture_{index}": [SimpleNamespace(scope=scope)] for index, scope in enumerate(scopes)
+        })
+
+    def get_closest_marker(self, name):
+        return self.markers.get(name)
+
+
+class FakeNode:
+
+    def __init__(self, name):
+        self.gateway = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+class FakeThrottle:
+
+    def __init__(self, high):
+        self.is_high = high
+        self.deferrals = 0
+
+    def high(self):
+        return self.is_high
+
+
+def make_scheduler(nodes, collection, throttle=None) -> LongestFirstScheduling:
+    config = SimpleNamespace(
+        getvalue=lambda name: [f"{len(nodes)}*popen"] if name == "tx" else None,
+        option=SimpleNamespace(loadscopereorder=False),
+    )
+    scheduler = LongestFirstScheduling(config, throttle=throttle)
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+    return scheduler
+
+
+class TestScopeGroups:
+
+    def test_base_nodeid_strips_xdist_group_suffix(self):
+        assert base_nodeid("tests/test_a.py::test_x@tests/test_a.py") == "tests/test_a.py::test_x"
+        assert base_nodeid("tests/test_a.py::test_x[a@b]") == "tests/test_a.py::test_x[a@b]"
+
+    def test_broadest_fixture_scope_decides_the_group(self):
+        cls = type("TestThing", (), {})
+        assert scope_group(FakeItem("tests/test_a.py::test_x")) == "tests/test_a.py::test_x"
+        assert scope_group(FakeItem("tests/test_a.py::TestThing::test_x", ["class"], cls)) == (
+            "tests/test_a.py::TestThing"
+        )
+        assert scope_group(FakeItem("tests/test_a.py::TestThing::test_x", ["class", "module"], cls)) == (
+            "tests/test_a.py"
+        )
+        assert scope_group(FakeItem("tests/sub/test_a.py::test_x", ["package"])) == "tests/sub"
+
+    def test_readonly_page_tests_share_a_group_per_url(self):
+        marker = SimpleNamespace(args=("https://shop/x",), kwargs={})
+        item = FakeItem("tests/test_a.py::test_x", markers={"readonly_page": marker})
+        assert scope_group(item) == "tests/test_a.py::readonly:https://shop/x"
+
+
+class TestOrderLongestFirst:
+
+    def test_groups_sorted_by_total_duration_and_kept_together(self):
+        cls = type("TestSlow", (), {})
+        items = [
+            FakeItem("tests/test_a.py::test_fast"),
+            FakeItem("tests/test_a.py::TestSlow::test_one", ["class"], cls),
+            FakeItem("tests/test_a.py::test_medium"),
+            FakeItem("tests/test_a.py::TestSlow::test_two", ["class"], cls),
+        ]
+        durations = {
+            "tests/test_a.py::test_fast": 1.0,
+            "tests/test_a.py::TestSlow::test_one": 3.0,
+            "tests/test_a.py::TestSlow::test_two": 3.0,
+            "tests/test_a.py::test_medium": 5.0,
+        }
+
+        ordered = [item.nodeid for item in order_longest_first(items, durations)]
+        assert ordered == [
+            "tests/test_a.py::TestSlow::test_one",
+            "tests/test_a.py::TestSlow::test_two",
+            "tests/test_a.py::test_medium",
+            "tests/test_a.py::test_fast",
+        ]
+
+    def test_unknown_tests_get_the_median_duration(self):
+        items = [FakeItem("t::new"), FakeItem("t::short"), FakeItem("t::mid"), FakeItem("t::long")]
+        durations = {"t::short": 1.0, "t::mid": 4.0, "t::long": 10.0}
+
+        ordered = [item.nodeid for item in order_longest_first(items, durations)]
+        assert ordered[0] == "t::long"
+        assert ordered[-1] == "t::short"
+        assert set(ordered[1:3]) == {"t::new", "t::mid"}
+
+
+class TestLongestFirstScheduling:
+
+    def test_units_handed_out_in_collection_order(self):
+        # pytest_plugins has already sorted the collection longest-first
+        collection = ["t::slow@g1", "t::slow2@g1", "t::mid", "t::fast"]
+        first, second = FakeNode("gw0"), FakeNode("gw1")
+        scheduler = make_scheduler([first, second], collection)
+
+        assert first.sent[:2] == [0, 1], "The longest group goes to the first worker, whole"
+        assert second.sent[0] == 2
+        assert sorted(first.sent + second.sent) == [0, 1, 2, 3]
+        assert not scheduler.workqueue
+
+    def test_busy_time_and_idle_tail(self):
+        collection = ["t::a", "t::b"]
+        first, second = FakeNode("gw0"), FakeNode("gw1")
+        scheduler = make_scheduler([first, second], collection)
+        scheduler.mark_test_complete(first, 0, duration=2.0)
+        scheduler.mark_test_complete(second, 1, duration=0.5)
+
+        assert scheduler.busy_time == {"gw0": 2.0, "gw1": 0.5}
+        idle = scheduler.idle_tail()
+        assert idle["gw1"] == 0.0 and idle["gw0"] >= 0.0
+        assert scheduler.summary_lines()[0].startswith("gw0: busy 2.0s")
+
+    def test_memory_throttle_pauses_idle_workers_until_memory_drops(self):
+        throttle = FakeThrottle(high=True)
+        first, second = FakeNode("gw0"), FakeNode("gw1")
+        scheduler = make_scheduler([first, second], ["t::1", "t::2", "t::3", "t::4"], throttle=throttle)
+
+        assert first.sent == [0, 1] and second.sent == [], "One worker keeps running while memory is high"
+        assert scheduler.deferred == [second]
+
+        scheduler.mark_test_complete(first, 0, duration=1.0)
+        assert second.sent == []
+
+        throttle.is_high = False
+        scheduler.mark_test_complete(first, 1, duration=1.0)
+        assert second.sent == [3], "The paused worker resumes before the finishing one takes more"
+        assert not second.shutting_down
+        assert throttle.deferrals == 2
+
+
+class TestWithoutCacheProvider:
+
+    def test_history_is_empty_and_not_saved(self):
+        config = SimpleNamespace()
+        save_durations(config, {"test_a": 1.0})
+        assert load_durations(config) == {}
+
+    def test_run_with_cacheprovider_disabled(self, tmp_path):
+        # Every history (durations, outcomes, action timeouts, stabilization,
+        # form fills) is read at configure/collection and written at the end
+        (tmp_path / "test_plain.py").write_text("def test_a():\n    pass\n")
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", "-p", "pytest_plugins", "-p", "no:cacheprovider",
+             "--no-site-health", "--no-event-stream", "test_plain.py"],
+            cwd=tmp_path, capture_output=True, text=True, timeout=120,
+            env={**os.environ, "PYTHONPATH": str(ROOT)},
+        )
+
+        assert result.returncode == 0, result.stdout[-2000:] + result.stderr[-2000:]
+        assert not (tmp_path / ".pytest_cache").exists()
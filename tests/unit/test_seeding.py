@@ -0,0 +1,61 @@
+import threading
+from utils.seeding import Seeder
+
+ACCOUNT = {"email": "seed@example.com", "password": "secret"}
+
+
+class FakeClient:
+    # Shared by every seeding thread; records what each call would send
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.addresses = []
+        self.wishlist = []
+        self.orders = []
+
+    def add_address(self, address: dict):
+        with self.lock:
+            self.addresses.append(address["address_1"])
+
+    def add_to_wishlist(self, product_id: int):
+        with self.lock:
+            self.wishlist.append(product_id)
+
+    def place_order(self, product_id: int):
+        # By now every address is on file, so checkout reuses one
+        assert self.addresses, "an order was placed before any address was saved"
+        self.orders.append(product_id)
+
+
+def seed(**options):
+    client = FakeClient()
+    seeder = Seeder("https://shop", workers=4)
+    seeder._client = lambda account: client
+    try:
+        return seeder.seed(ACCOUNT, **options), client
+    finally:
+        seeder.close()
+
+
+class TestSeed:
+
+    def test_orders_get_one_address_up_front(self):
+        seeded, client = seed(orders=2, order_product_id=28)
+
+        assert seeded == {"orders": 2, "wishlist": 0, "addresses": 1}
+        assert client.addresses == ["1 Seed Street"]
+        assert client.orders == [28, 28]
+
+    def test_no_orders_means_no_extra_address(self):
+        seeded, client = seed(wishlist=[28, 29])
+
+        assert seeded == {"orders": 0, "wishlist": 2, "addresses": 0}
+        assert client.addresses == []
+        assert sorted(client.wishlist) == [28, 29]
+
+    def test_requested_addresses_cover_the_one_orders_need(self):
+        seeded, client = seed(orders=1, addresses=3, order_product_id=28)
+
+        assert seeded["addresses"] == 3
+        assert sorted(client.addresses) == ["1 Seed Street", "2 Seed Street", "3 Seed Street"]
+        assert client.orders == [28]
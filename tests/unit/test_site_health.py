@@ -0,0 +1,68 @@
+from utils import site_health
+from utils.site_health import CircuitBreaker, ProbeResult
+
+BASE = "https://shop.example"
+ROUTES = ["common/home", "account/login"]
+
+
+def make_breaker(tmp_path, threshold=3) -> CircuitBreaker:
+    return CircuitBreaker(tmp_path, "run1", BASE, ROUTES, threshold, probe_timeout=1.0)
+
+
+def probes(status=None, error=None):
+    return lambda base_url, routes, timeout: [
+        ProbeResult(f"{base_url}/index.php?route={route}", status, 10.0, error) for route in routes
+    ]
+
+
+class TestProbeResult:
+
+    def test_client_errors_count_as_healthy(self):
+        assert ProbeResult("u", 404).healthy
+        assert not ProbeResult("u", 503).healthy
+        assert not ProbeResult("u", error="URLError: timed out").healthy
+
+
+class TestCircuitBreaker:
+
+    def test_trips_after_threshold_site_failures_when_probes_fail(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(site_health, "probe_all", probes(error="URLError: refused"))
+        breaker = make_breaker(tmp_path)
+        for index in range(3):
+            assert not breaker.is_open(), f"Opened after {index} failures"
+            breaker.observe(f"t{index}", passed=False, site_failure=True)
+
+        assert breaker.is_open()
+        state = breaker.state()
+        assert state["failed_tests"] == ["t0", "t1", "t2"]
+        assert len(state["probes"]) == len(ROUTES)
+
+    def test_stays_closed_when_site_answers(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(site_health, "probe_all", probes(status=200))
+        breaker = make_breaker(tmp_path)
+        for index in range(3):
+            breaker.observe(f"t{index}", passed=False, site_failure=True)
+
+        assert not breaker.is_open()
+        assert breaker.consecutive == 0, "Count should start over after a healthy probe"
+
+    def test_pass_resets_and_test_failures_do_not_count(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(site_health, "probe_all", probes(error="URLError: refused"))
+        breaker = make_breaker(tmp_path)
+        breaker.observe("t0", passed=False, site_failure=True)
+        breaker.observe("t1", passed=False, site_failure=True)
+        breaker.observe("t2", passed=True, site_failure=False)
+        breaker.observe("t3", passed=False, site_failure=False)
+        breaker.observe("t4", passed=False, site_failure=True)
+
+        assert breaker.consecutive == 1
+        assert not breaker.is_open()
+
+    def test_summary_lines_list_probes_and_skips(self, tmp_path):
+        breaker = make_breaker(tmp_path)
+        breaker.trip("preflight probes failed", probes(status=502)(BASE, ROUTES, 1.0))
+
+        lines = site_health.summary_lines(breaker.state(), skipped=4)
+        assert lines[0] == "Site unavailable: preflight probes failed"
+        assert any("HTTP 502" in line for line in lines)
+        assert lines[-1] == "  4 remaining tests were skipped"
@@ -0,0 +1,89 @@
+import pytest
+from types import SimpleNamespace
+from utils.locator_resolver import compile_selector, split_parts, UnsupportedSelector
+from utils.soft_assert import SoftAssertGroup
+
+
+def fake_locator(selector: str):
+    return SimpleNamespace(_impl_obj=SimpleNamespace(_selector=selector))
+
+
+class FakePage:
+    # evaluate() answers every probe with the same element state
+
+    def __init__(self, result, title="Account Login", url="https://shop/login"):
+        self.result = result
+        self.title = title
+        self.url = url
+        self.probed = []
+
+    def evaluate(self, expression, steps):
+        self.probed.append(steps)
+        return {"title": self.title, "results": [dict(self.result) for _ in steps]}
+
+
+class TestCompileSelector:
+
+    def test_split_parts_respects_quotes(self):
+        assert split_parts('div >> internal:text="a >> b"i >> nth=0') == [
+            "div", 'internal:text="a >> b"i', "nth=0"
+        ]
+
+    def test_css_and_nth_compile(self):
+        assert compile_selector("form.login >> input[name='email'] >> nth=-1") == [
+            {"engine": "css", "selector": "form.login"},
+            {"engine": "css", "selector": "input[name='email']"},
+            {"engine": "nth", "index": -1},
+        ]
+
+    def test_role_label_and_text_locators_are_left_to_playwright(self):
+        for selector in ('internal:role=button[name="Login"i]', 'internal:label="E-Mail"i',
+                         'form >> internal:text="Login"i', 'internal:testid=[data-testid="email"s]'):
+            with pytest.raises(UnsupportedSelector):
+                compile_selector(selector)
+
+    def test_playwright_css_extensions_are_not_resolved(self):
+        with pytest.raises(UnsupportedSelector):
+            compile_selector("button:has-text('Login')")
+
+
+class TestSoftAssertGroup:
+
+    def test_css_checks_are_batched_and_others_go_through_expect(self):
+        page = FakePage({"count": 1, "visible": True, "text": "Login", "value": None})
+        confirmed = []
+        group = SoftAssertGroup(page, timeout=1000)
+        group.to_have_title("Account Login")
+        group._add("visible", "css", lambda timeout: confirmed.append("css"), fake_locator("#input-email"))
+        group._add("visible", "role", lambda timeout: confirmed.append("role"),
+                   fake_locator('internal:role=button[name="Login"i]'))
+        group.verify()
+
+        assert page.probed == [[[{"engine": "css", "selector": "#input-email"}]]]
+        assert confirmed == ["role"], "Only the role locator should need expect()"
+
+    def test_failures_are_confirmed_by_expect_and_reported_together(self):
+        page = FakePage({"count": 0, "visible": False, "text": None, "value": None}, title="Other")
+        group = SoftAssertGroup(page, timeout=300)
+
+        def fail(timeout):
+            raise AssertionError(f"still failing after {timeout}ms")
+
+        group._add("title", "page to have title 'Account Login'", fail, title="Account Login")
+        group._add("visible", "#missing to be visible", fail, fake_locator("#missing"))
+        with pytest.raises(AssertionError) as failure:
+            group.verify()
+
+        message = str(failure.value)
+        assert message.startswith("2 of 2 soft assertions failed:")
+        assert "#missing to be visible: still failing after 1ms" in message
+        assert group.polls >= 2, "Failing checks should be re-polled until the deadline"
+
+    def test_several_matches_fail_like_strict_mode(self):
+        page = FakePage({"count": 2, "visible": True, "text": "x", "value": None})
+        group = SoftAssertGroup(page, timeout=200)
+        group._add("visible", ".item to be visible", lambda timeout: None, fake_locator(".item"))
+        group.verify()
+
+        (check,) = group.checks
+        assert check.actual == "strict mode violation: resolved to 2 elements"
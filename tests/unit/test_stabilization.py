@@ -0,0 +1,64 @@
+import re
+import pytest
+from types import SimpleNamespace
+from utils.route_latency import LatencyHistogram
+from utils.stabilization import HISTORY_KEY, MIN_SAMPLES, WaitComparison, save_history
+
+
+class FakeCache:
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+def page(stabilized):
+    return SimpleNamespace(context=SimpleNamespace(stabilized=stabilized))
+
+
+def history(values):
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    return histogram.to_dict()
+
+
+class TestWaitComparison:
+
+    def test_observations_are_split_by_mode(self):
+        comparison = WaitComparison({})
+        comparison.observe(page(True), "login", 100.0)
+        comparison.observe(page(False), "login", 300.0)
+        comparison.observe(object(), "login", 300.0)
+
+        assert comparison.observed["stabilized"]["login"].total == 1
+        assert comparison.observed["baseline"]["login"].total == 2
+
+    def test_summary_compares_actions_with_enough_samples(self):
+        comparison = WaitComparison({"baseline": {"login": history([300.0] * MIN_SAMPLES)}})
+        for _ in range(MIN_SAMPLES):
+            comparison.observe(page(True), "login", 100.0)
+            comparison.observe(page(True), "search", 100.0)
+
+        lines = comparison.summary_lines()
+        assert len(lines) == 3, "Only login has samples in both modes"
+        saved, actions = re.fullmatch(r"Mean time saved per action: (\d+)ms over (\d+) actions", lines[-1]).groups()
+        assert int(saved) == pytest.approx(200, rel=0.02)
+        assert actions == "1"
+
+
+class TestSaveHistory:
+
+    def test_decays_into_the_cache_without_touching_the_comparison(self):
+        comparison = WaitComparison({"baseline": {"login": history([300.0] * 10)}})
+        comparison.observe(page(False), "login", 300.0)
+        before = comparison.combined()["baseline"]["login"].total
+        cache = FakeCache()
+        save_history(SimpleNamespace(cache=cache), comparison)
+
+        stored = LatencyHistogram.from_dict(cache.data[HISTORY_KEY]["baseline"]["login"])
+        assert stored.total == pytest.approx(10 * 0.8 + 1)
+        assert comparison.history["baseline"]["login"].total == 10
+        assert comparison.combined()["baseline"]["login"].total == before, "The run summary must not count this run twice"
@@ -0,0 +1,116 @@
+import pytest
+from types import SimpleNamespace
+from utils.static_cache import StaticAssetCache, STATIC_ASSET_PATTERN, freshness_lifetime, run_summary
+
+URL = "https://shop.example/catalog/view/theme.css"
+
+
+class FakeResponse:
+
+    def __init__(self, status=200, body=b"", headers=None):
+        self.status = status
+        self._body = body
+        self.headers = headers or {}
+
+    def body(self):
+        return self._body
+
+
+class FakeRoute:
+
+    def __init__(self, url, origin, method="GET"):
+        self.request = SimpleNamespace(url=url, method=method, headers={"accept": "text/css"})
+        self.origin = origin
+        self.fetched_with = None
+        self.fulfilled = None
+        self.fell_back = False
+
+    def fetch(self, headers):
+        self.fetched_with = headers
+        return self.origin
+
+    def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    def fallback(self):
+        self.fell_back = True
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = StaticAssetCache(tmp_path / "cache", max_bytes=1000, default_ttl=60)
+    yield cache
+    cache.close()
+
+
+def expire(cache, url):
+    cache.db.execute("UPDATE entries SET fresh_until = 0 WHERE url = ?", (url,))
+    cache.db.commit()
+
+
+class TestFreshness:
+
+    def test_cache_control_directives(self):
+        assert freshness_lifetime({"cache-control": "public, max-age=120"}, 60) == 120.0
+        assert freshness_lifetime({"cache-control": "no-cache"}, 60) == 0.0
+        assert freshness_lifetime({"cache-control": "private, max-age=120"}, 60) is None
+        assert freshness_lifetime({"cache-control": "no-store"}, 60) is None
+        assert freshness_lifetime({"expires": "Thu, 01 Jan 1970 00:00:00 GMT"}, 60) == 0.0
+        assert freshness_lifetime({}, 60) == 60
+
+    def test_only_static_assets_are_routed(self):
+        assert STATIC_ASSET_PATTERN.search("https://shop/app.js?v=3")
+        assert STATIC_ASSET_PATTERN.search("https://shop/font.WOFF2")
+        assert not STATIC_ASSET_PATTERN.search("https://shop/index.php?route=common/home")
+
+
+class TestStaticAssetCache:
+
+    def test_miss_then_hit_without_a_request(self, cache):
+        origin = FakeResponse(200, b"body{}", {"content-encoding": "gzip", "content-type": "text/css"})
+        cache.handle(FakeRoute(URL, origin))
+        route = FakeRoute(URL, origin)
+        cache.handle(route)
+
+        assert route.fetched_with is None, "A fresh entry must be served without touching the origin"
+        assert route.fulfilled["body"] == b"body{}"
+        assert route.fulfilled["headers"] == {"content-type": "text/css"}
+        assert cache.stats() == {"hits": 1, "revalidated": 0, "misses": 1, "bytes_saved": 6}
+
+    def test_stale_entry_is_revalidated_with_validators(self, cache):
+        cache.handle(FakeRoute(URL, FakeResponse(200, b"body{}", {"etag": '"v1"'})))
+        expire(cache, URL)
+        route = FakeRoute(URL, FakeResponse(304, headers={"cache-control": "max-age=30"}))
+        cache.handle(route)
+
+        assert route.fetched_with["if-none-match"] == '"v1"'
+        assert route.fulfilled["body"] == b"body{}"
+        assert cache.revalidated == 1
+
+    def test_uncacheable_and_non_get_requests(self, cache):
+        cache.handle(FakeRoute(URL, FakeResponse(200, b"x", {"cache-control": "no-store"})))
+        post = FakeRoute(URL, None, method="POST")
+        cache.handle(post)
+
+        assert cache.total_bytes() == 0
+        assert post.fell_back
+
+    def test_evicts_least_recently_used_over_budget(self, cache):
+        for index in range(3):
+            cache.handle(FakeRoute(f"{URL}?v={index}", FakeResponse(200, bytes([index]) * 400)))
+
+        remaining = [url for (url,) in cache.db.execute("SELECT url FROM entries ORDER BY url")]
+        assert remaining == [f"{URL}?v=1", f"{URL}?v=2"]
+        assert cache.total_bytes() == 800
+
+    def test_run_summary_adds_up_workers(self, cache, tmp_path):
+        cache.hits, cache.misses, cache.bytes_saved = 3, 1, 300
+        cache.record_run("run1", "gw0")
+        cache.hits, cache.misses, cache.bytes_saved = 1, 3, 100
+        cache.record_run("run1", "gw1")
+
+        summary = run_summary(tmp_path / "cache", "run1")
+        assert summary["requests"] == 8
+        assert summary["hit_rate"] == 0.5
+        assert summary["bytes_saved"] == 400
+        assert run_summary(tmp_path / "cache", "other") == {}
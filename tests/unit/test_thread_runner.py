@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+from contextlib import contextmanager
+from utils.thread_runner import ThreadRunner
+
+
+class FakeSetupState:
+
+    def __init__(self):
+        self.torn_down = []
+
+    def teardown_exact(self, nextitem):
+        self.torn_down.append(nextitem)
+
+
+def drain(runner) -> list:
+    results = []
+    while not runner.results.empty():
+        results.append(runner.results.get_nowait())
+    return results
+
+
+class TestWorker:
+
+    def test_escaped_error_still_tears_down_the_thread_fixtures(self):
+        session = SimpleNamespace(_setupstate=FakeSetupState(), shouldstop=False, shouldfail=False)
+
+        @contextmanager
+        def broken_scope(item):
+            raise RuntimeError("scope failed")
+            yield
+
+        runner = ThreadRunner(session, threads=1, test_scope=broken_scope)
+        runner.work.put([SimpleNamespace(nodeid="t::a")])
+        runner._worker()
+
+        kinds = [kind for kind, _, _ in drain(runner)]
+        assert session._setupstate.torn_down == [None]
+        assert kinds == ["start", "error", "done"]
+
+    def test_teardown_error_is_reported(self):
+        class FailingSetupState(FakeSetupState):
+
+            def teardown_exact(self, nextitem):
+                raise RuntimeError("browser close failed")
+
+        session = SimpleNamespace(_setupstate=FailingSetupState(), shouldstop=False, shouldfail=False)
+        runner = ThreadRunner(session, threads=1, test_scope=None)
+        runner._worker()
+
+        results = drain(runner)
+        assert [kind for kind, _, _ in results] == ["error", "done"]
+        assert str(results[0][2]) == "browser close failed"
@@ -0,0 +1,63 @@
+import os
+import re
+import sys
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+MODULE = '''
+import pytest
+
+@pytest.fixture(scope="module")
+def shared():
+    return object()
+
+@pytest.mark.readonly_page("https://shop/category")
+@pytest.mark.parametrize("n", range(4))
+def test_readonly(n):
+    pass
+
+@pytest.mark.parametrize("n", range(6))
+def test_module_fixture(shared, n):
+    pass
+'''
+
+
+def run_xdist(directory, *args) -> dict:
+    # A real xdist run with this plugin; returns {nodeid: worker}
+    (directory / "test_groups.py").write_text(MODULE)
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "pytest_plugins", "-p", "no:randomly", "-n", "2", "-v",
+         "--no-site-health", "--no-event-stream", "test_groups.py", *args],
+        cwd=directory, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "PYTHONPATH": str(ROOT), "LOG_BUFFER": "false"},
+    )
+    assert result.returncode == 0, result.stdout[-2000:] + result.stderr[-2000:]
+    return dict(
+        (nodeid, worker) for worker, nodeid in re.findall(r"\[(gw\d+)\] \[\s*\d+%\] PASSED (\S+)", result.stdout)
+    )
+
+
+class TestXdistGroups:
+
+    def test_groups_reach_xdist_before_it_suffixes_nodeids(self, tmp_path):
+        # pytest_collection_modifyitems must run before xdist's own
+        # implementation, which appends "@<group>" from the markers
+        workers = run_xdist(tmp_path, "--dist", "loadgroup")
+
+        readonly = {nodeid: worker for nodeid, worker in workers.items() if "test_readonly" in nodeid}
+        assert len(readonly) == 4
+        assert all(nodeid.endswith("@test_groups.py::readonly:https://shop/category") for nodeid in readonly)
+        assert len(set(readonly.values())) == 1, "A shared read-only page group must stay on one worker"
+
+    def test_plain_n_keeps_fixture_scope_groups_whole(self, tmp_path):
+        # Scope groups come with the longest-first order, which needs one run
+        # of duration history first
+        run_xdist(tmp_path)
+        workers = run_xdist(tmp_path)
+
+        shared = {nodeid: worker for nodeid, worker in workers.items() if "test_module_fixture" in nodeid}
+        assert len(shared) == 6
+        assert all(nodeid.endswith("@test_groups.py") for nodeid in shared), "-n alone must still suffix nodeids"
+        assert len(set(shared.values())) == 1
@@ -6,6 +6,8 @@ from .helpers import (
     fill_form_field,
     click_button_by_name
 )
+from .dom_waiters import wait_for_all, wait_for_any
+from .soft_assert import soft_assertions
 
 __all__ = [
     'wait_for_element_visible',
@@ -14,4 +16,7 @@ __all__ = [
     'take_screenshot',
     'fill_form_field',
     'click_button_by_name',
+    'wait_for_all',
+    'wait_for_any',
+    'soft_assertions',
 ]
\ No newline at end of file
@@ -0,0 +1,162 @@
+import time
+import inspect
+import logging
+import functools
+from playwright.sync_api import TimeoutError
+from utils.route_latency import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+HISTORY_KEY = "playwright_demo/action_latency"
+
+# Older runs fade out so the learned p99 follows the shop's current speed
+HISTORY_DECAY = 0.8
+
+
+class AdaptiveTimeouts:
+    # Learns a latency distribution per page-object action and, when enabled,
+    # runs each action with the page default timeout set to a multiple of its
+    # historical p99, clamped to [floor, ceiling]. Actions without enough
+    # history keep the configured defaults.
+
+    def __init__(self, history: dict, enabled: bool, multiple: float, floor: int, ceiling: int,
+                 min_samples: int, default_timeout: int, navigation_timeout: int):
+        self.history = {action: LatencyHistogram.from_dict(data) for action, data in history.items()}
+        self.enabled = enabled
+        self.multiple = multiple
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.default_timeout = default_timeout
+        self.navigation_timeout = navigation_timeout
+        self.observed = {}
+        self.applied = {}
+        self.observers = []
+        self._stacks = {}
+
+    def timeout_for(self, action: str):
+        # Returns (timeout_ms, reason); timeout_ms is None for the defaults
+        histogram = self.history.get(action)
+        if not self.enabled or histogram is None or histogram.total < self.min_samples:
+            return None, "default"
+        p99 = histogram.percentile(99)
+        timeout = int(min(max(p99 * self.multiple, self.floor), self.ceiling))
+        return timeout, (
+            f"{self.multiple:g} x p99 {p99:.0f}ms over {histogram.total:.0f} samples, "
+            f"clamped to [{self.floor}, {self.ceiling}]"
+        )
+
+    def record(self, action: str, elapsed_ms: float):
+        self.observed.setdefault(action, LatencyHistogram()).record(elapsed_ms)
+
+    def _apply(self, page, timeout: int, navigation_timeout: int):
+        page.set_default_timeout(timeout)
+        page.set_default_navigation_timeout(navigation_timeout)
+
+    def run(self, page, action: str, method, *args, **kwargs):
+        timeout, reason = self.timeout_for(action)
+        stack = self._stacks.setdefault(id(page), [])
+        if timeout is not None:
+            self._apply(page, timeout, timeout)
+            self.applied[action] = timeout
+        stack.append(timeout)
+
+        started = time.monotonic()
+        try:
+            result = method(*args, **kwargs)
+        except TimeoutError as e:
+            if timeout is not None and not getattr(e, "adaptive_timeout", False):
+                annotated = TimeoutError(f"{e.message}\n[adaptive timeout] {action} ran with {timeout}ms ({reason})")
+                annotated.adaptive_timeout = True
+                raise annotated from e
+            raise
+        finally:
+            stack.pop()
+            if timeout is not None:
+                # Hand the page back to the enclosing action's timeout
+                outer = next((value for value in reversed(stack) if value is not None), None)
+                if outer is None:
+                    self._apply(page, self.default_timeout, self.navigation_timeout)
+                else:
+                    self._apply(page, outer, outer)
+            if not stack:
+                del self._stacks[id(page)]
+
+        # Only successful runs are learned; a timed-out action says nothing
+        # about how long it normally takes
+        elapsed_ms = (time.monotonic() - started) * 1000
+        self.record(action, elapsed_ms)
+        for observer in self.observers:
+            observer(page, action, elapsed_ms)
+        return result
+
+    def observed_dict(self) -> dict:
+        return {action: histogram.to_dict() for action, histogram in self.observed.items()}
+
+    def merge_observed(self, data: dict):
+        for action, histogram in data.items():
+            self.observed.setdefault(action, LatencyHistogram()).merge(LatencyHistogram.from_dict(histogram))
+
+
+_tracker = None
+
+
+def configure(config, **settings) -> AdaptiveTimeouts:
+    global _tracker
+    _tracker = AdaptiveTimeouts(load_history(config), **settings)
+    return _tracker
+
+
+def current_tracker():
+    return _tracker
+
+
+def load_history(config) -> dict:
+    # Without the cacheprovider plugin every run starts from no history
+    cache = getattr(config, "cache", None)
+    return cache.get(HISTORY_KEY, {}) if cache is not None else {}
+
+
+def save_history(config, observed: dict):
+    if getattr(config, "cache", None) is None:
+        return
+    history = {
+        action: LatencyHistogram.from_dict(data)
+        for action, data in load_history(config).items()
+    }
+    for histogram in history.values():
+        histogram.counts = {
+            index: round(count * HISTORY_DECAY, 3)
+            for index, count in histogram.counts.items()
+            if count * HISTORY_DECAY >= 0.01
+        }
+    for action, histogram in observed.items():
+        history.setdefault(action, LatencyHistogram()).merge(histogram)
+    config.cache.set(
+        HISTORY_KEY,
+        {action: histogram.to_dict() for action, histogram in history.items() if histogram.counts},
+    )
+    logger.info(f"Stored action latency history for {len(observed)} page-object actions")
+
+
+def adaptive_actions(cls):
+    # Class decorator for page objects: every public method becomes a timed
+    # action keyed "<module>.<Class>.<method>"
+    prefix = f"{cls.__module__.rsplit('.', 1)[-1]}.{cls.__qualname__}"
+    for name, member in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(member):
+            continue
+        setattr(cls, name, _timed(member, f"{prefix}.{name}"))
+    return cls
+
+
+def _timed(method, action: str):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        tracker = current_tracker()
+        page = getattr(self, "page", None)
+        if tracker is None or page is None:
+            return method(self, *args, **kwargs)
+        return tracker.run(page, action, method, self, *args, **kwargs)
+    return wrapper
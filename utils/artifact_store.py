@@ -0,0 +1,192 @@
+"""
+Content-addressed artifact store
+Blobs are keyed by SHA-256, written once and compressed when it pays off;
+a SQLite index maps tests to the blobs they produced.
+Usage: python -m utils.artifact_store stats|prune|cat <hash>
+"""
+
+import os
+import sys
+import gzip
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    encoding TEXT NOT NULL,
+    suffix TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    run TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    hash TEXT NOT NULL REFERENCES blobs(hash),
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS refs_nodeid ON refs(nodeid);
+CREATE INDEX IF NOT EXISTS refs_hash ON refs(hash);
+"""
+
+# PNG, WebM and trace zips are already compressed; gzip is kept only when it
+# saves at least this fraction of the original size.
+MIN_COMPRESSION_GAIN = 0.05
+
+
+class ArtifactStore:
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.root / "index.sqlite"), timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def blob_path(self, digest: str, encoding: str = None, suffix: str = None) -> Path:
+        if encoding is None or suffix is None:
+            encoding, suffix = self.db.execute(
+                "SELECT encoding, suffix FROM blobs WHERE hash = ?", (digest,)
+            ).fetchone()
+        name = f"{digest}{suffix}" + (".gz" if encoding == "gzip" else "")
+        return self.blob_dir / digest[:2] / name
+
+    def put(self, data: bytes, nodeid: str, kind: str, name: str, run: str = "") -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        suffix = Path(name).suffix
+        known = self.db.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone()
+
+        if known is None:
+            compressed = gzip.compress(data, compresslevel=6, mtime=0)
+            if len(compressed) <= len(data) * (1 - MIN_COMPRESSION_GAIN):
+                payload, encoding = compressed, "gzip"
+            else:
+                payload, encoding = data, "identity"
+
+            path = self.blob_path(digest, encoding, suffix)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if not path.exists():
+                # Write-then-rename so concurrent workers never see a partial blob
+                tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                tmp.write_bytes(payload)
+                os.replace(tmp, path)
+            self.db.execute(
+                "INSERT OR IGNORE INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+                (digest, len(data), len(payload), encoding, suffix, time.time()),
+            )
+            logger.info(f"Stored {kind} {name} as {digest[:12]} ({len(data)} -> {len(payload)} bytes)")
+        else:
+            logger.info(f"Deduplicated {kind} {name} -> {digest[:12]}")
+
+        self.db.execute(
+            "INSERT INTO refs VALUES (?, ?, ?, ?, ?, ?)",
+            (run, nodeid, kind, name, digest, time.time()),
+        )
+        self.db.commit()
+        return digest
+
+    def put_file(self, path, nodeid: str, kind: str, run: str = "", remove: bool = False) -> str:
+        path = Path(path)
+        digest = self.put(path.read_bytes(), nodeid, kind, path.name, run)
+        if remove:
+            path.unlink()
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        row = self.db.execute("SELECT encoding FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        data = self.blob_path(digest).read_bytes()
+        return gzip.decompress(data) if row[0] == "gzip" else data
+
+    def artifacts_for(self, nodeid: str) -> list:
+        rows = self.db.execute(
+            "SELECT run, kind, name, hash, created FROM refs WHERE nodeid = ? ORDER BY created",
+            (nodeid,),
+        ).fetchall()
+        return [dict(zip(("run", "kind", "name", "hash", "created"), row)) for row in rows]
+
+    def stats(self) -> dict:
+        blobs, size, stored = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs"
+        ).fetchone()
+        (refs,) = self.db.execute("SELECT COUNT(*) FROM refs").fetchone()
+        return {"blobs": blobs, "refs": refs, "bytes": size, "stored_bytes": stored}
+
+    def prune(self, max_age_days: float = None, max_bytes: int = None) -> int:
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            self.db.execute("DELETE FROM refs WHERE created < ?", (cutoff,))
+        removed = self._collect_garbage()
+
+        if max_bytes is not None:
+            # Drop whole runs, oldest first, until the store fits the budget
+            runs = self.db.execute(
+                "SELECT run FROM refs GROUP BY run ORDER BY MAX(created)"
+            ).fetchall()
+            for (run,) in runs:
+                if self.stats()["stored_bytes"] <= max_bytes:
+                    break
+                self.db.execute("DELETE FROM refs WHERE run = ?", (run,))
+                removed += self._collect_garbage()
+
+        self.db.commit()
+        if removed:
+            logger.info(f"Pruned {removed} artifact blobs")
+        return removed
+
+    def _collect_garbage(self) -> int:
+        orphans = self.db.execute(
+            "SELECT hash FROM blobs WHERE hash NOT IN (SELECT DISTINCT hash FROM refs)"
+        ).fetchall()
+        for (digest,) in orphans:
+            path = self.blob_path(digest)
+            if path.exists():
+                path.unlink()
+            self.db.execute("DELETE FROM blobs WHERE hash = ?", (digest,))
+        return len(orphans)
+
+    def close(self):
+        self.db.close()
+
+
+def main(argv=None) -> int:
+    from config import ARTIFACT_DIR
+
+    parser = argparse.ArgumentParser(description="Inspect or prune the artifact store")
+    parser.add_argument("--root", default=ARTIFACT_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats")
+    prune = commands.add_parser("prune")
+    prune.add_argument("--max-age-days", type=float, default=None)
+    prune.add_argument("--max-size-mb", type=float, default=None)
+    cat = commands.add_parser("cat")
+    cat.add_argument("hash")
+    args = parser.parse_args(argv)
+
+    store = ArtifactStore(args.root)
+    if args.command == "stats":
+        for key, value in store.stats().items():
+            print(f"{key}: {value}")
+    elif args.command == "prune":
+        max_bytes = int(args.max_size_mb * 1024 * 1024) if args.max_size_mb is not None else None
+        print(f"Removed {store.prune(args.max_age_days, max_bytes)} blobs")
+    elif args.command == "cat":
+        sys.stdout.buffer.write(store.get(args.hash))
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
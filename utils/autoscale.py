@@ -0,0 +1,260 @@
+import os
+import sys
+import time
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+HISTORY_KEY = "playwright_demo/worker_footprint"
+
+# A worker is never planned below this many cores: the measured average
+# hides the spikes of page loads and layout
+MIN_CPU_PER_WORKER = 0.5
+
+CALIBRATION_PAGE = "<main>" + "".join(f"<section><h2>Item {i}</h2><p>{'text ' * 40}</p></section>" for i in range(200)) + "</main>"
+
+
+def _psutil():
+    try:
+        import psutil
+        return psutil
+    except ImportError:
+        return None
+
+
+def system_memory():
+    """(total, available) bytes, or None where neither psutil nor /proc is available"""
+    psutil = _psutil()
+    if psutil is not None:
+        memory = psutil.virtual_memory()
+        return memory.total, memory.available
+    try:
+        fields = {}
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            name, value = line.split(":", 1)
+            fields[name] = int(value.split()[0]) * 1024
+        return fields["MemTotal"], fields["MemAvailable"]
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _proc_table() -> dict:
+    # pid -> (ppid, rss bytes, cpu seconds) from /proc/<pid>/stat
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    ticks = os.sysconf("SC_CLK_TCK")
+    table = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses
+        fields = stat[stat.rindex(")") + 2:].split()
+        table[int(entry.name)] = (
+            int(fields[1]), int(fields[21]) * page_size, (int(fields[11]) + int(fields[12])) / ticks
+        )
+    return table
+
+
+def tree_usage(pid: int = None):
+    """(rss bytes, cpu seconds) of a process and all its descendants, or None if unsupported"""
+    pid = pid or os.getpid()
+    psutil = _psutil()
+    if psutil is not None:
+        root = psutil.Process(pid)
+        rss = cpu = 0.0
+        for process in [root] + root.children(recursive=True):
+            try:
+                rss += process.memory_info().rss
+                times = process.cpu_times()
+                cpu += times.user + times.system
+            except psutil.Error:
+                continue
+        return rss, cpu
+    if not sys.platform.startswith("linux"):
+        return None
+    table = _proc_table()
+    children = {}
+    for child, (parent, _, _) in table.items():
+        children.setdefault(parent, []).append(child)
+    rss = cpu = 0.0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        if current in table:
+            rss += table[current][1]
+            cpu += table[current][2]
+        stack.extend(children.get(current, []))
+    return rss, cpu
+
+
+class FootprintSampler:
+    # Peak RSS and average CPU of one worker's process tree (Python, the
+    # Playwright driver and its browser), sampled between tests
+
+    def __init__(self):
+        self.peak_rss = 0.0
+        self.started = time.monotonic()
+        usage = tree_usage()
+        self.cpu_start = usage[1] if usage else 0.0
+        self.supported = usage is not None
+        self.last = usage
+
+    def sample(self):
+        if not self.supported:
+            return
+        self.last = tree_usage()
+        self.peak_rss = max(self.peak_rss, self.last[0])
+
+    def footprint(self) -> dict:
+        if not self.supported or not self.peak_rss:
+            return {}
+        wall = time.monotonic() - self.started
+        return {
+            "rss_mb": round(self.peak_rss / 1024 / 1024, 1),
+            "cpu_cores": round((self.last[1] - self.cpu_start) / wall, 3) if wall else 0.0,
+        }
+
+
+def calibrate(headless: bool, url: str, timeout_ms: float = 15000) -> dict:
+    """Launch one browser the way a worker does, load a page and measure the process tree"""
+    from playwright.sync_api import sync_playwright, Error
+
+    if tree_usage() is None:
+        return {}
+    started = time.monotonic()
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        context = browser.new_context()
+        page = context.new_page()
+        cpu_start, wall_start = tree_usage()[1], time.monotonic()
+        try:
+            page.goto(url, wait_until="load", timeout=timeout_ms)
+        except Error as e:
+            logger.info(f"Calibration could not load {url} ({str(e).splitlines()[0]}); using a local page")
+            page.set_content(CALIBRATION_PAGE)
+        page.mouse.wheel(0, 5000)
+        page.wait_for_timeout(1000)
+        rss, cpu = tree_usage()
+        wall = time.monotonic() - wall_start
+        context.close()
+        browser.close()
+    footprint = {
+        "rss_mb": round(rss / 1024 / 1024, 1),
+        "cpu_cores": round((cpu - cpu_start) / wall, 3),
+        "source": "calibration",
+        "headless": headless,
+        "timestamp": time.time(),
+    }
+    logger.info(f"Calibrated worker footprint in {time.monotonic() - started:.1f}s: {footprint}")
+    return footprint
+
+
+def choose_workers(footprint: dict, cores: int, memory, margin: float, max_workers: int = 0) -> tuple:
+    """Worker count and the reasoning behind it"""
+    cpu_per_worker = max(footprint.get("cpu_cores", 0.0), MIN_CPU_PER_WORKER)
+    by_cpu = max(1, int(cores / cpu_per_worker))
+    reasons = [f"{cores} cores / {cpu_per_worker:.2f} per worker = {by_cpu}"]
+    count = by_cpu
+    if memory is not None and footprint.get("rss_mb"):
+        _, available = memory
+        budget_mb = available / 1024 / 1024 * (1 - margin)
+        by_memory = max(1, int(budget_mb / footprint["rss_mb"]))
+        reasons.append(
+            f"{budget_mb:.0f} MB available after a {margin:.0%} margin / {footprint['rss_mb']:.0f} MB "
+            f"per worker = {by_memory}"
+        )
+        count = min(count, by_memory)
+    else:
+        reasons.append("memory unknown (install psutil), sized by CPU only")
+    if max_workers:
+        count = min(count, max_workers)
+        reasons.append(f"capped at AUTOSCALE_MAX_WORKERS={max_workers}")
+    return count, reasons
+
+
+class MemoryThrottle:
+    # Used by the scheduler: while system memory use is above the threshold,
+    # idle workers are not given new tests (one always keeps running)
+
+    def __init__(self, threshold_percent: float, interval: float = 1.0):
+        self.threshold_percent = threshold_percent
+        self.interval = interval
+        self.supported = system_memory() is not None
+        self.deferrals = 0
+        self.peak_percent = 0.0
+        self.throttled_seconds = 0.0
+        self._checked = 0.0
+        self._high = False
+        self._high_since = None
+
+    def used_percent(self) -> float:
+        memory = system_memory()
+        if memory is None:
+            return 0.0
+        total, available = memory
+        return (total - available) / total * 100
+
+    def high(self) -> bool:
+        if not self.supported:
+            return False
+        now = time.monotonic()
+        if now - self._checked >= self.interval:
+            self._checked = now
+            percent = self.used_percent()
+            self.peak_percent = max(self.peak_percent, percent)
+            high = percent >= self.threshold_percent
+            if high and not self._high:
+                logger.warning(f"Memory at {percent:.0f}% (threshold {self.threshold_percent:.0f}%): pausing idle workers")
+                self._high_since = now
+            elif self._high and not high:
+                logger.info(f"Memory back to {percent:.0f}%: resuming idle workers")
+                self.throttled_seconds += now - self._high_since
+            self._high = high
+        return self._high
+
+    def summary(self) -> dict:
+        throttled = self.throttled_seconds
+        if self._high and self._high_since is not None:
+            throttled += time.monotonic() - self._high_since
+        return {
+            "threshold_percent": self.threshold_percent,
+            "peak_percent": round(self.peak_percent, 1),
+            "deferrals": self.deferrals,
+            "throttled_seconds": round(throttled, 1),
+        }
+
+
+def load_history(cache, headless: bool, max_age_hours: float) -> dict:
+    footprint = cache.get(HISTORY_KEY, {}) or {}
+    if footprint.get("headless") != headless:
+        return {}
+    if time.time() - footprint.get("timestamp", 0) > max_age_hours * 3600:
+        return {}
+    return footprint
+
+
+def save_history(cache, observed: list, headless: bool):
+    # The heaviest worker of the run is what the next run has to fit
+    if not observed:
+        return
+    footprint = {
+        "rss_mb": max(entry["rss_mb"] for entry in observed),
+        "cpu_cores": max(entry["cpu_cores"] for entry in observed),
+        "source": f"previous run ({len(observed)} workers)",
+        "headless": headless,
+        "timestamp": time.time(),
+    }
+    cache.set(HISTORY_KEY, footprint)
+    logger.info(f"Stored worker footprint: {footprint}")
@@ -0,0 +1,268 @@
+"""
+Browser server pool
+Spreads xdist workers over several browser-server endpoints, least loaded
+first, and reports per-endpoint utilisation at the end of the run
+Usage: python -m utils.browser_pool serve [--count 3]
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import logging
+import argparse
+from pathlib import Path
+from playwright.sync_api import Error
+from utils.browser_server import BrowserServer, endpoint_reachable, pid_alive
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assignments (
+    run TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    PRIMARY KEY (run, worker)
+);
+CREATE TABLE IF NOT EXISTS usage (
+    run TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    contexts INTEGER NOT NULL,
+    busy_seconds REAL NOT NULL,
+    connected_seconds REAL NOT NULL,
+    reconnects INTEGER NOT NULL,
+    health_failures INTEGER NOT NULL
+);
+"""
+
+
+def open_db(directory) -> sqlite3.Connection:
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(Path(directory) / "pool.sqlite"), timeout=30, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript(SCHEMA)
+    return db
+
+
+class EndpointUsage:
+
+    def __init__(self, endpoint: str, reconnects: int):
+        self.endpoint = endpoint
+        self.connected_at = time.monotonic()
+        self.contexts = 0
+        self.busy_seconds = 0.0
+        self.reconnects = reconnects
+
+
+class BrowserPool:
+    # One pool per test process. Assignments live in a shared SQLite file so
+    # every xdist worker sees how many live workers each endpoint already has.
+
+    def __init__(self, playwright, endpoints: list, directory, run_id: str, worker: str, slow_mo: float = 0):
+        self.playwright = playwright
+        self.endpoints = endpoints
+        self.run_id = run_id
+        self.worker = worker
+        self.slow_mo = slow_mo
+        self.db = open_db(directory)
+        self.usage = None
+
+    def _live_load(self) -> dict:
+        load = {endpoint: 0 for endpoint in self.endpoints}
+        rows = self.db.execute("SELECT run, worker, endpoint, pid FROM assignments").fetchall()
+        for run, worker, endpoint, pid in rows:
+            if (run, worker) == (self.run_id, self.worker) or endpoint not in load:
+                continue
+            if pid_alive(pid):
+                load[endpoint] += 1
+            else:
+                # Left behind by a worker that crashed
+                self.db.execute("DELETE FROM assignments WHERE run = ? AND worker = ?", (run, worker))
+        return load
+
+    def _claim(self, tried: set, avoid: tuple):
+        # Pick and assign in one write transaction so two workers starting
+        # together cannot both take the same least-loaded endpoint
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            load = self._live_load()
+            remaining = [endpoint for endpoint in self.endpoints if endpoint not in tried]
+            if not remaining:
+                return None
+            endpoint = min(
+                remaining,
+                key=lambda endpoint: (endpoint in avoid, load[endpoint], self.endpoints.index(endpoint)),
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO assignments VALUES (?, ?, ?, ?)",
+                (self.run_id, self.worker, endpoint, os.getpid()),
+            )
+            return endpoint
+        finally:
+            self.db.execute("COMMIT")
+
+    def connect(self, avoid=()):
+        reconnects = 0 if self.usage is None else self.usage.reconnects + 1
+        tried = set()
+        while True:
+            endpoint = self._claim(tried, avoid)
+            if endpoint is None:
+                break
+            tried.add(endpoint)
+            if not endpoint_reachable(endpoint):
+                self._record_health_failure(endpoint)
+                logger.warning(f"Browser pool endpoint {endpoint} failed its health check")
+                continue
+            try:
+                browser = self.playwright.chromium.connect(endpoint, slow_mo=self.slow_mo)
+            except Error as e:
+                self._record_health_failure(endpoint)
+                logger.warning(f"Could not connect to {endpoint}: {e}")
+                continue
+            self.usage = EndpointUsage(endpoint, reconnects)
+            logger.info(f"Worker {self.worker} connected to browser pool endpoint {endpoint}")
+            return browser
+        self.db.execute("DELETE FROM assignments WHERE run = ? AND worker = ?", (self.run_id, self.worker))
+        raise RuntimeError(f"No healthy browser server in pool: {', '.join(self.endpoints)}")
+
+    def _record_health_failure(self, endpoint: str):
+        self.db.execute(
+            "INSERT INTO usage VALUES (?, ?, ?, 0, 0, 0, 0, 1)", (self.run_id, self.worker, endpoint)
+        )
+
+    def _record_usage(self):
+        if self.usage is None:
+            return
+        usage = self.usage
+        self.db.execute(
+            "INSERT INTO usage VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+            (self.run_id, self.worker, usage.endpoint, usage.contexts, usage.busy_seconds,
+             time.monotonic() - usage.connected_at, usage.reconnects),
+        )
+
+    def reconnect(self, dead_endpoint: str):
+        self._record_usage()
+        # The dead endpoint is only retried after every other one
+        return self.connect(avoid=(dead_endpoint,))
+
+    def context_opened(self, context):
+        usage = self.usage
+        usage.contexts += 1
+        opened = time.monotonic()
+
+        def closed(_):
+            usage.busy_seconds += time.monotonic() - opened
+        context.on("close", closed)
+
+    def close(self):
+        self._record_usage()
+        self.db.execute("DELETE FROM assignments WHERE run = ? AND worker = ?", (self.run_id, self.worker))
+        self.db.close()
+
+
+class PooledBrowser:
+    # Stands in for the session Browser: new_context() transparently moves
+    # to another endpoint when the current server has died.
+
+    def __init__(self, pool: BrowserPool):
+        self.pool = pool
+        self.browser = pool.connect()
+
+    def new_context(self, **kwargs):
+        if not self.browser.is_connected():
+            logger.warning(f"Browser server {self.pool.usage.endpoint} went away, reconnecting")
+            self.browser = self.pool.reconnect(self.pool.usage.endpoint)
+        try:
+            context = self.browser.new_context(**kwargs)
+        except Error as e:
+            if self.browser.is_connected():
+                raise
+            logger.warning(f"Browser server {self.pool.usage.endpoint} died during new_context: {e}")
+            self.browser = self.pool.reconnect(self.pool.usage.endpoint)
+            context = self.browser.new_context(**kwargs)
+        self.pool.context_opened(context)
+        return context
+
+    def close(self):
+        if self.browser.is_connected():
+            self.browser.close()
+        self.pool.close()
+
+    def __getattr__(self, name):
+        return getattr(self.browser, name)
+
+
+def utilization(directory, run_id: str) -> dict:
+    db = open_db(directory)
+    try:
+        rows = db.execute(
+            "SELECT endpoint, COUNT(DISTINCT CASE WHEN connected_seconds > 0 THEN worker END), "
+            "SUM(contexts), SUM(busy_seconds), SUM(connected_seconds), SUM(reconnects), SUM(health_failures) "
+            "FROM usage WHERE run = ? GROUP BY endpoint ORDER BY endpoint",
+            (run_id,),
+        ).fetchall()
+    finally:
+        db.close()
+    return {
+        endpoint: {
+            "workers": workers,
+            "contexts": contexts,
+            "busy_seconds": busy,
+            "connected_seconds": connected,
+            "utilization": busy / connected if connected else 0.0,
+            "reconnects": reconnects,
+            "health_failures": failures,
+        }
+        for endpoint, workers, contexts, busy, connected, reconnects, failures in rows
+    }
+
+
+def utilization_lines(directory, run_id: str) -> list:
+    stats = utilization(directory, run_id)
+    if not stats:
+        return []
+    lines = [f"{'endpoint':40} {'workers':>7} {'contexts':>8} {'busy s':>8} {'util':>6} {'reconn':>6} {'unhealthy':>9}"]
+    for endpoint, row in stats.items():
+        lines.append(
+            f"{endpoint[-40:]:40} {row['workers']:>7} {row['contexts']:>8} {row['busy_seconds']:>8.1f} "
+            f"{row['utilization']:>6.0%} {row['reconnects']:>6} {row['health_failures']:>9}"
+        )
+    return lines
+
+
+def serve(count: int, directory, launch_options: dict) -> tuple:
+    servers = [BrowserServer(Path(directory) / f"pool-{index}", launch_options) for index in range(count)]
+    endpoints = []
+    for server in servers:
+        server.acquire()
+        endpoints.append(server.ensure())
+    return servers, endpoints
+
+
+def main(argv=None) -> int:
+    from config import BROWSER_SERVER_DIR, HEADLESS
+
+    parser = argparse.ArgumentParser(description="Run local browser servers for --browser-pool")
+    parser.add_argument("command", choices=["serve"])
+    parser.add_argument("--count", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    servers, endpoints = serve(args.count, BROWSER_SERVER_DIR, {"headless": HEADLESS})
+    print(f"--browser-pool={','.join(endpoints)}", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.release()
+            server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
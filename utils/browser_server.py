@@ -0,0 +1,286 @@
+"""
+Warm browser server
+Keeps one Chromium alive between pytest invocations and lets the browser
+fixture connect to it over a local websocket (--reuse-browser)
+Usage: python -m utils.browser_server [status|start|stop]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import signal
+import hashlib
+import logging
+import argparse
+import subprocess
+from pathlib import Path
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from playwright._impl._driver import compute_driver_executable, get_driver_env
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, first worker may race
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+# Python Playwright has no launch_server(); the driver bundled with it is
+# playwright-core, whose chromium.launchServer() this script runs under the
+# driver's own node binary. The server exits after idle_seconds without a
+# live lease (a file named after each connected pytest process's pid).
+SERVER_SCRIPT = """
+const fs = require('fs');
+const path = require('path');
+const [packageDir, stateDir, optionsJson] = process.argv.slice(2);
+const { chromium } = require(packageDir);
+const options = JSON.parse(optionsJson);
+const statePath = path.join(stateDir, 'state.json');
+const leasesDir = path.join(stateDir, 'leases');
+
+const alive = (pid) => {
+  try { process.kill(pid, 0); return true; } catch (e) { return e.code === 'EPERM'; }
+};
+
+const dropState = () => {
+  try {
+    if (JSON.parse(fs.readFileSync(statePath, 'utf8')).pid === process.pid) fs.unlinkSync(statePath);
+  } catch (e) {}
+};
+
+(async () => {
+  const server = await chromium.launchServer({ ...options.launch, host: '127.0.0.1', port: 0 });
+  const state = {
+    pid: process.pid,
+    wsEndpoint: server.wsEndpoint(),
+    version: require(path.join(packageDir, 'package.json')).version,
+    fingerprint: options.fingerprint,
+    started: Date.now() / 1000,
+  };
+  const tmp = `${statePath}.${process.pid}.tmp`;
+  fs.writeFileSync(tmp, JSON.stringify(state));
+  fs.renameSync(tmp, statePath);
+  console.log(`browser server ${state.wsEndpoint} (playwright ${state.version})`);
+
+  let idleSince = Date.now();
+  const shutdown = async (why) => {
+    console.log(`shutting down: ${why}`);
+    clearInterval(timer);
+    dropState();
+    await server.close();
+    process.exit(0);
+  };
+  const timer = setInterval(() => {
+    let live = 0;
+    for (const name of fs.existsSync(leasesDir) ? fs.readdirSync(leasesDir) : []) {
+      if (alive(Number(name))) live++;
+      else fs.rmSync(path.join(leasesDir, name), { force: true });
+    }
+    if (live) idleSince = Date.now();
+    else if (Date.now() - idleSince > options.idleSeconds * 1000) shutdown('idle');
+  }, 5000);
+
+  server.on('close', () => { dropState(); process.exit(0); });
+  process.on('SIGTERM', () => shutdown('SIGTERM'));
+  process.on('SIGINT', () => shutdown('SIGINT'));
+})().catch((e) => { console.error(e); process.exit(1); });
+"""
+
+
+def driver_version() -> str:
+    _, cli_path = compute_driver_executable()
+    package = Path(cli_path).parent / "package.json"
+    return json.loads(package.read_text(encoding="utf-8"))["version"]
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def process_command(pid: int) -> str:
+    # The command line of a running process, or "" if it cannot be read
+    try:
+        return Path(f"/proc/{pid}/cmdline").read_bytes().replace(b"\0", b" ").decode(errors="replace")
+    except OSError:
+        pass
+    try:
+        return subprocess.run(
+            ["ps", "-p", str(pid), "-o", "command="], capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def endpoint_reachable(ws_endpoint: str, timeout: float = 1.0) -> bool:
+    parsed = urlparse(ws_endpoint)
+    try:
+        with socket.create_connection((parsed.hostname, parsed.port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class BrowserServer:
+
+    def __init__(self, directory, launch_options: dict, idle_seconds: float = 900):
+        self.directory = Path(directory)
+        self.leases_dir = self.directory / "leases"
+        self.state_path = self.directory / "state.json"
+        self.launch_options = launch_options
+        self.idle_seconds = idle_seconds
+        self.version = driver_version()
+        # A server launched with other options or another Playwright is stale
+        self.fingerprint = hashlib.sha256(
+            json.dumps([self.version, launch_options], sort_keys=True).encode()
+        ).hexdigest()[:16]
+
+    @contextmanager
+    def _locked(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / "lock", "w") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def state(self) -> dict:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def owns(self, pid: int) -> bool:
+        # A stale state.json may name a pid the OS has since handed to an
+        # unrelated process; only node running our server.js is ours
+        command = process_command(pid)
+        return str(self.directory / "server.js") in command and "node" in command
+
+    def problem(self, state: dict):
+        # Why the running server cannot be reused, or None if it can
+        if not state:
+            return "not running"
+        if not pid_alive(state["pid"]):
+            return f"process {state['pid']} is gone"
+        if not self.owns(state["pid"]):
+            return f"process {state['pid']} is not this browser server"
+        if state.get("version") != self.version:
+            return f"server runs Playwright {state.get('version')}, client has {self.version}"
+        if state.get("fingerprint") != self.fingerprint:
+            return "launch options changed"
+        if not endpoint_reachable(state["wsEndpoint"]):
+            return f"{state['wsEndpoint']} does not accept connections"
+        return None
+
+    def ensure(self, timeout: float = 60) -> str:
+        with self._locked():
+            state = self.state()
+            problem = self.problem(state)
+            if problem is None:
+                logger.info(f"Reusing browser server {state['wsEndpoint']}")
+                return state["wsEndpoint"]
+            if state:
+                logger.info(f"Replacing browser server: {problem}")
+                self._terminate(state)
+            return self._start(timeout)
+
+    def _start(self, timeout: float) -> str:
+        node, cli_path = compute_driver_executable()
+        script = self.directory / "server.js"
+        script.write_text(SERVER_SCRIPT, encoding="utf-8")
+        options = {"launch": self.launch_options, "idleSeconds": self.idle_seconds, "fingerprint": self.fingerprint}
+
+        log = open(self.directory / "server.log", "a")
+        process = subprocess.Popen(
+            [node, str(script), str(Path(cli_path).parent), str(self.directory), json.dumps(options)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            env=get_driver_env(), start_new_session=os.name == "posix",
+        )
+        log.close()
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            state = self.state()
+            if state.get("pid") == process.pid:
+                logger.info(f"Started browser server {state['wsEndpoint']} (pid {process.pid})")
+                return state["wsEndpoint"]
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+        process.kill()
+        raise RuntimeError(f"Browser server did not start; see {self.directory / 'server.log'}")
+
+    def _terminate(self, state: dict):
+        # Anything else just loses its stale state file
+        if pid_alive(state["pid"]) and self.owns(state["pid"]):
+            os.kill(state["pid"], signal.SIGTERM)
+            deadline = time.monotonic() + 10
+            while pid_alive(state["pid"]) and time.monotonic() < deadline:
+                time.sleep(0.1)
+        self.state_path.unlink(missing_ok=True)
+
+    def acquire(self):
+        self.leases_dir.mkdir(parents=True, exist_ok=True)
+        (self.leases_dir / str(os.getpid())).touch()
+
+    def release(self):
+        (self.leases_dir / str(os.getpid())).unlink(missing_ok=True)
+
+    def stop(self) -> bool:
+        with self._locked():
+            state = self.state()
+            if not state:
+                return False
+            self._terminate(state)
+            return True
+
+
+def close_stale_contexts(browser) -> int:
+    # The server already drops contexts of clients that disconnected; this
+    # catches ones a test leaked without closing during this session.
+    stale = list(browser.contexts)
+    for context in stale:
+        try:
+            context.close()
+        except Exception as e:
+            logger.debug(f"Could not close stale context: {e}")
+    return len(stale)
+
+
+def main(argv=None) -> int:
+    from config import BROWSER_SERVER_DIR, BROWSER_SERVER_IDLE_SECONDS, HEADLESS
+
+    parser = argparse.ArgumentParser(description="Manage the warm browser server used by --reuse-browser")
+    parser.add_argument("command", choices=["status", "start", "stop"], nargs="?", default="status")
+    args = parser.parse_args(argv)
+
+    server = BrowserServer(BROWSER_SERVER_DIR, {"headless": HEADLESS}, BROWSER_SERVER_IDLE_SECONDS)
+    if args.command == "start":
+        print(server.ensure())
+    elif args.command == "stop":
+        print("stopped" if server.stop() else "not running")
+    else:
+        state = server.state()
+        problem = server.problem(state)
+        if state:
+            uptime = time.time() - state["started"]
+            print(f"{state['wsEndpoint']} pid {state['pid']} Playwright {state['version']} up {uptime:.0f}s")
+        print("reusable" if problem is None else f"not reusable: {problem}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Live run dashboard
+Tails the JSONL event stream and shows progress, slowest tests and failures
+Usage: python -m utils.dashboard [--events reports/events] [--html reports/live.html]
+"""
+
+import sys
+import time
+import argparse
+from utils.event_stream import EventTail
+from utils.stream_report import RunState, StreamHtmlReport
+
+
+def render(state: RunState) -> str:
+    done = len(state.finished)
+    total = state.total or done
+    lines = [
+        f"Progress: {done}/{total}  "
+        f"passed {state.count('passed')}  failed {state.count('failed')}  "
+        f"errors {state.count('error')}  skipped {state.count('skipped')}",
+        "",
+        "Running:",
+    ]
+    now = time.time()
+    for record in state.running():
+        lines.append(f"  [{record.worker}] {record.nodeid} ({now - record.started:.0f}s)")
+
+    lines += ["", "Slowest:"]
+    for record in state.slowest():
+        lines.append(f"  {record.duration:7.2f}s  {record.nodeid}")
+
+    lines += ["", "Failures:"]
+    for record in state.failures():
+        message = record.message.strip()
+        reason = message.splitlines()[-1] if message else ""
+        lines.append(f"  {record.nodeid}: {reason[:160]}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Live view of a running test session")
+    parser.add_argument("--events", default="reports/events", help="directory of *.jsonl event files")
+    parser.add_argument("--html", default=None, help="also append finished tests to this HTML file")
+    parser.add_argument("--interval", type=float, default=1.0, help="refresh interval in seconds")
+    parser.add_argument("--once", action="store_true", help="render the current state and exit")
+    args = parser.parse_args(argv)
+
+    tail = EventTail(args.events)
+    state = RunState()
+    report = StreamHtmlReport(args.html, "Live Test Run") if args.html else None
+
+    try:
+        while True:
+            for event in tail.poll():
+                record = state.feed(event)
+                if record is not None and report is not None:
+                    report.add(record)
+            if args.once:
+                print(render(state))
+                break
+            sys.stdout.write("\033[2J\033[H" + render(state) + "\n")
+            sys.stdout.flush()
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if report is not None:
+            report.close(state)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
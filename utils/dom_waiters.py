@@ -0,0 +1,197 @@
+import time
+import logging
+from playwright.sync_api import BrowserContext, Page, Error, TimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+# Playwright's own visibility rule (a non-empty box, not visibility:hidden
+# or collapsed, display:contents judged by its children), shared by every
+# script that checks visibility in-page so they agree with expect()
+IS_VISIBLE_SOURCE = """
+  const isVisible = (el) => {
+    if (!el || !el.isConnected) return false;
+    const style = getComputedStyle(el);
+    if (style.display === 'contents') {
+      for (let child = el.firstChild; child; child = child.nextSibling) {
+        if (child.nodeType === Node.ELEMENT_NODE && isVisible(child)) return true;
+        if (child.nodeType === Node.TEXT_NODE) {
+          const range = document.createRange();
+          range.selectNode(child);
+          const rect = range.getBoundingClientRect();
+          if (rect.width > 0 && rect.height > 0) return true;
+        }
+      }
+      return false;
+    }
+    if (el.checkVisibility && !el.checkVisibility()) return false;
+    if (style.visibility !== 'visible') return false;
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+  };
+"""
+
+# Installed once per context as an init script. A single MutationObserver
+# plus history/hash/load listeners re-check pending conditions only when the
+# DOM or URL actually changes; nothing polls on a timer.
+WAITER_SCRIPT = """(() => {
+  if (window.__domWaiters) return;
+  const pending = new Set();
+  const now = () => performance.timeOrigin + performance.now();
+""" + IS_VISIBLE_SOURCE + """
+
+  // Strict conditions behave like a Playwright locator: more than one match
+  // is an error rather than "any of them"
+  const matches = (c) => {
+    const elements = Array.from(document.querySelectorAll(c.selector));
+    if (c.strict && elements.length > 1)
+      throw new Error(`strict mode violation: "${c.selector}" resolved to ${elements.length} elements`);
+    return elements;
+  };
+
+  const check = (c) => {
+    switch (c.kind) {
+      case 'attached': return !!document.querySelector(c.selector);
+      case 'detached': return !document.querySelector(c.selector);
+      case 'visible': return matches(c).some(isVisible);
+      case 'hidden': return !matches(c).some(isVisible);
+      case 'text': {
+        const el = document.querySelector(c.selector);
+        return !!el && (el.innerText || el.textContent || '').includes(c.value);
+      }
+      case 'url': return location.href.includes(c.value);
+      default: throw new Error('unknown condition ' + c.kind);
+    }
+  };
+
+  const evaluate = (waiter) => {
+    let met;
+    try {
+      met = waiter.conditions.map(check);
+    } catch (error) {
+      pending.delete(waiter);
+      clearTimeout(waiter.timer);
+      waiter.reject(error);
+      return true;
+    }
+    const done = waiter.mode === 'any' ? met.some(Boolean) : met.every(Boolean);
+    if (!done) return false;
+    pending.delete(waiter);
+    clearTimeout(waiter.timer);
+    waiter.resolve({ met, resolvedAt: now(), elapsed: now() - waiter.started });
+    return true;
+  };
+
+  const recheck = () => { for (const waiter of Array.from(pending)) evaluate(waiter); };
+
+  const observer = new MutationObserver(recheck);
+  const observe = () => observer.observe(document.documentElement || document, {
+    subtree: true, childList: true, attributes: true, characterData: true,
+  });
+  if (document.documentElement) observe();
+  else document.addEventListener('readystatechange', observe, { once: true });
+
+  for (const event of ['popstate', 'hashchange', 'load', 'transitionend', 'animationend'])
+    window.addEventListener(event, recheck, true);
+  for (const method of ['pushState', 'replaceState']) {
+    const original = history[method];
+    history[method] = function (...args) { const result = original.apply(this, args); recheck(); return result; };
+  }
+
+  window.__domWaiters = {
+    waitFor(conditions, mode, timeout) {
+      for (const c of conditions)
+        if (c.selector) document.querySelector(c.selector);  // throws early on invalid CSS
+      return new Promise((resolve, reject) => {
+        const waiter = { conditions, mode, resolve, reject, started: now() };
+        if (evaluate(waiter)) return;
+        waiter.timer = setTimeout(() => {
+          pending.delete(waiter);
+          reject(new Error(`Timeout ${timeout}ms waiting for ${mode} of ${JSON.stringify(conditions)}`));
+        }, timeout);
+        pending.add(waiter);
+      });
+    },
+  };
+})();
+"""
+
+INSTALL_EXPRESSION = "() => {" + WAITER_SCRIPT + "}"
+
+WAIT_EXPRESSION = (
+    "args => window.__domWaiters"
+    " ? window.__domWaiters.waitFor(args.conditions, args.mode, args.timeout)"
+    " : null"
+)
+
+
+def visible(selector: str, strict: bool = False) -> dict:
+    # Any match visible; strict=True raises when more than one element matches
+    return {"kind": "visible", "selector": selector, "strict": strict}
+
+
+def hidden(selector: str, strict: bool = False) -> dict:
+    return {"kind": "hidden", "selector": selector, "strict": strict}
+
+
+def attached(selector: str) -> dict:
+    return {"kind": "attached", "selector": selector}
+
+
+def detached(selector: str) -> dict:
+    return {"kind": "detached", "selector": selector}
+
+
+def has_text(selector: str, value: str) -> dict:
+    return {"kind": "text", "selector": selector, "value": value}
+
+
+def url_contains(value: str) -> dict:
+    return {"kind": "url", "value": value}
+
+
+def install(context: BrowserContext):
+    context.add_init_script(WAITER_SCRIPT)
+
+
+def wait_for_conditions(page: Page, conditions: list, mode: str = "all", timeout: int = 30000) -> dict:
+    args = {"conditions": conditions, "mode": mode, "timeout": timeout}
+    try:
+        result = page.evaluate(WAIT_EXPRESSION, args)
+        if result is None:
+            # Page was created before install() or the context never had it
+            page.evaluate(INSTALL_EXPRESSION)
+            result = page.evaluate(WAIT_EXPRESSION, args)
+    except Error as e:
+        if f"Timeout {timeout}ms waiting" in str(e):
+            raise TimeoutError(str(e)) from e
+        raise
+
+    # Both clocks are epoch milliseconds on the same machine
+    result["resume_latency_ms"] = max(time.time() * 1000 - result["resolvedAt"], 0.0)
+    logger.debug(
+        f"Conditions met after {result['elapsed']:.0f}ms, "
+        f"resumed {result['resume_latency_ms']:.1f}ms later"
+    )
+    return result
+
+
+def wait_for_all(page: Page, *conditions, timeout: int = 30000) -> dict:
+    return wait_for_conditions(page, list(conditions), "all", timeout)
+
+
+def wait_for_any(page: Page, *conditions, timeout: int = 30000) -> dict:
+    return wait_for_conditions(page, list(conditions), "any", timeout)
+
+
+def is_invalid_selector(error: Error) -> bool:
+    # Playwright-only selectors (text=, :has-text(), >>) are not valid CSS
+    message = str(error)
+    return "is not a valid selector" in message or "SyntaxError" in message
+
+
+def is_navigation_error(error: Error) -> bool:
+    if isinstance(error, TimeoutError):
+        return False
+    message = str(error)
+    return "Execution context was destroyed" in message or "navigation" in message.lower()
@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+RUN_ID_ENV = "TEST_RUN_ID"
+
+# Page objects and helpers log every action at INFO; those records become
+# "action" events attributed to the running test.
+ACTION_LOGGERS = ("pages", "utils.helpers")
+
+
+def current_run_id() -> str:
+    run_id = os.environ.get(RUN_ID_ENV) or os.environ.get("PYTEST_XDIST_TESTRUNUID")
+    if not run_id:
+        run_id = uuid.uuid4().hex
+        os.environ[RUN_ID_ENV] = run_id
+    return run_id
+
+
+class EventStream:
+
+    def __init__(self, directory, worker: str = "main"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.worker = worker
+        self.run_id = current_run_id()
+        self.path = self.directory / f"{self.run_id}-{worker}.jsonl"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8", newline="\n", buffering=1)
+
+    # Per thread, so actions logged by tests running on --threads are
+    # attributed to the test on the same thread
+    @property
+    def current_nodeid(self):
+        return getattr(self._local, "nodeid", None)
+
+    @current_nodeid.setter
+    def current_nodeid(self, nodeid):
+        self._local.nodeid = nodeid
+
+    def emit(self, event_type: str, **fields):
+        if self._file.closed:
+            return
+        event = {
+            "ts": round(time.time(), 3),
+            "run": self.run_id,
+            "worker": self.worker,
+            "type": event_type,
+        }
+        if self.current_nodeid and "nodeid" not in fields:
+            event["nodeid"] = self.current_nodeid
+        event.update(fields)
+        # One write per line keeps each event intact when files are tailed
+        line = json.dumps(event, default=str) + "\n"
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class ActionLogHandler(logging.Handler):
+
+    def __init__(self, stream: EventStream):
+        super().__init__(level=logging.INFO)
+        self.stream = stream
+
+    def emit(self, record):
+        try:
+            self.stream.emit("action", logger=record.name, message=record.getMessage())
+        except Exception:
+            self.handleError(record)
+
+
+_active_stream = None
+_action_handler = None
+
+
+def start_stream(directory, worker: str = "main") -> EventStream:
+    global _active_stream, _action_handler
+    _active_stream = EventStream(directory, worker)
+    _action_handler = ActionLogHandler(_active_stream)
+    for name in ACTION_LOGGERS:
+        logging.getLogger(name).addHandler(_action_handler)
+    logger.info(f"Streaming events to {_active_stream.path}")
+    return _active_stream
+
+
+def stop_stream():
+    global _active_stream, _action_handler
+    if _active_stream is None:
+        return
+    for name in ACTION_LOGGERS:
+        logging.getLogger(name).removeHandler(_action_handler)
+    _active_stream.close()
+    _active_stream = None
+    _action_handler = None
+
+
+def get_stream():
+    return _active_stream
+
+
+def emit(event_type: str, **fields):
+    if _active_stream is not None:
+        _active_stream.emit(event_type, **fields)
+
+
+def clear_events(directory):
+    directory = Path(directory)
+    if not directory.exists():
+        return
+    for path in directory.glob("*.jsonl"):
+        path.unlink()
+
+
+def iter_events(directory):
+    for path in sorted(Path(directory).glob("*.jsonl")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class EventTail:
+    # Follows every *.jsonl file in a directory, returning only complete new
+    # lines, so a writer mid-line is never parsed.
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.offsets = {}
+        self.partial = {}
+
+    def poll(self) -> list:
+        events = []
+        for path in sorted(self.directory.glob("*.jsonl")):
+            with open(path, "rb") as f:
+                f.seek(self.offsets.get(path, 0))
+                chunk = f.read()
+                self.offsets[path] = f.tell()
+            lines = (self.partial.pop(path, b"") + chunk).split(b"\n")
+            if lines[-1]:
+                self.partial[path] = lines[-1]
+            for line in lines[:-1]:
+                if line.strip():
+                    events.append(json.loads(line))
+        events.sort(key=lambda event: event["ts"])
+        return events
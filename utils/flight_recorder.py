@@ -0,0 +1,124 @@
+import base64
+import io
+import json
+import time
+import shutil
+import logging
+import zipfile
+import subprocess
+from collections import deque
+from pathlib import Path
+from playwright.sync_api import Page
+
+logger = logging.getLogger(__name__)
+
+
+class FlightRecorder:
+    # Low-fps CDP screencast kept in a bounded ring: frames older than
+    # `seconds` or beyond `max_bytes` are dropped as new ones arrive.
+
+    def __init__(self, page: Page, seconds: float = 10, fps: float = 4,
+                 max_bytes: int = 32 * 1024 * 1024, quality: int = 50, max_width: int = 960):
+        self.page = page
+        self.seconds = seconds
+        self.fps = fps
+        self.max_bytes = max_bytes
+        self.quality = quality
+        self.max_width = max_width
+
+        self.frames = deque()
+        self.buffered_bytes = 0
+        self.peak_bytes = 0
+        self.received = 0
+        self.dropped = 0
+        self._last_kept = float("-inf")
+        self.cdp = None
+
+    def start(self):
+        self.cdp = self.page.context.new_cdp_session(self.page)
+        self.cdp.on("Page.screencastFrame", self._on_frame)
+        self.cdp.send("Page.startScreencast", {
+            "format": "jpeg",
+            "quality": self.quality,
+            "maxWidth": self.max_width,
+            "maxHeight": self.max_width,
+        })
+        logger.info(f"Flight recorder started ({self.fps} fps, last {self.seconds}s)")
+
+    def _on_frame(self, params):
+        # Chrome stops sending frames until each one is acknowledged
+        self.cdp.send("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+        self.received += 1
+
+        timestamp = params.get("metadata", {}).get("timestamp", time.time())
+        if timestamp - self._last_kept < 1 / self.fps:
+            self.dropped += 1
+            return
+        self._last_kept = timestamp
+
+        data = base64.b64decode(params["data"])
+        self.frames.append((timestamp, data))
+        self.buffered_bytes += len(data)
+
+        while self.frames and (
+            self.frames[0][0] < timestamp - self.seconds or self.buffered_bytes > self.max_bytes
+        ):
+            _, old = self.frames.popleft()
+            self.buffered_bytes -= len(old)
+        self.peak_bytes = max(self.peak_bytes, self.buffered_bytes)
+
+    def stop(self):
+        if self.cdp is None:
+            return
+        try:
+            self.cdp.send("Page.stopScreencast")
+            self.cdp.detach()
+        except Exception as e:
+            logger.warning(f"Failed to stop screencast: {e}")
+        self.cdp = None
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "frames": len(self.frames),
+            "received": self.received,
+            "dropped": self.dropped,
+            "buffered_bytes": self.buffered_bytes,
+            "peak_bytes": self.peak_bytes,
+        }
+
+    def encode(self, directory, name: str) -> Path:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg:
+            clip = directory / f"{name}.webm"
+            try:
+                self._encode_ffmpeg(ffmpeg, clip)
+                return clip
+            except (subprocess.SubprocessError, OSError) as e:
+                logger.warning(f"ffmpeg encoding failed, keeping raw frames: {e}")
+        clip = directory / f"{name}.frames.zip"
+        self._encode_zip(clip)
+        return clip
+
+    def _encode_ffmpeg(self, ffmpeg: str, clip: Path):
+        command = [
+            ffmpeg, "-y", "-loglevel", "error",
+            "-f", "image2pipe", "-framerate", str(self.fps), "-c:v", "mjpeg", "-i", "-",
+            "-c:v", "libvpx", "-b:v", "1M", "-pix_fmt", "yuv420p", str(clip),
+        ]
+        frames = b"".join(data for _, data in self.frames)
+        subprocess.run(command, input=frames, check=True, timeout=60, capture_output=True)
+
+    def _encode_zip(self, clip: Path):
+        # Frames are already JPEG; store them as-is with their timestamps
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+            index = []
+            for number, (timestamp, data) in enumerate(self.frames):
+                frame_name = f"frame-{number:04d}.jpg"
+                archive.writestr(frame_name, data)
+                index.append({"file": frame_name, "timestamp": timestamp})
+            archive.writestr("frames.json", json.dumps(index, indent=2))
+        clip.write_bytes(buffer.getvalue())
@@ -0,0 +1,242 @@
+import time
+import logging
+from playwright.sync_api import Page, Locator, Error
+from utils.locator_resolver import RESOLVER_SOURCE, compile_locator
+from utils.route_latency import LatencyHistogram
+from utils.adaptive_timeouts import HISTORY_DECAY
+from utils.dom_waiters import is_navigation_error
+
+logger = logging.getLogger(__name__)
+
+
+HISTORY_KEY = "playwright_demo/form_fill"
+
+MODES = ("sequential", "batched")
+
+# Only plain native controls are filled in the page. Anything else (hidden
+# inputs behind custom widgets, disabled or read-only fields, date pickers,
+# several matches) is left to Playwright, which waits for actionability and
+# reports strict-mode violations as usual.
+FILL_EXPRESSION = "(fields) => {" + RESOLVER_SOURCE + """
+  const TEXT_TYPES = ['', 'text', 'email', 'tel', 'url', 'password', 'search', 'number'];
+
+  const setNative = (el, value) => {
+    const proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype
+      : el.tagName === 'SELECT' ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+  };
+
+  const fire = (el, type) => el.dispatchEvent(new Event(type, { bubbles: true }));
+
+  const fill = (field) => {
+    const elements = resolve(field.steps);
+    if (elements.length !== 1) return { fallback: `${elements.length} matches` };
+    const el = elements[0];
+    if (!isVisible(el)) return { fallback: 'not visible' };
+    if (el.disabled || el.readOnly) return { fallback: 'not editable' };
+    if (el.getAttribute('aria-hidden') === 'true') return { fallback: 'custom widget' };
+
+    const tag = el.tagName;
+    const type = (el.getAttribute('type') || '').toLowerCase();
+    if (typeof field.value === 'boolean') {
+      if (tag !== 'INPUT' || !['checkbox', 'radio'].includes(type)) return { fallback: 'not a checkbox' };
+      // A real click runs the page's handlers and fires input/change itself
+      if (el.checked !== field.value) el.click();
+      if (el.checked !== field.value) return { fallback: 'click did not toggle' };
+    } else if (tag === 'SELECT') {
+      const option = Array.from(el.options).find((o) => o.value === field.value || normalize(o.label) === field.value);
+      if (!option) return { fallback: 'no such option' };
+      el.focus();
+      setNative(el, option.value);
+      fire(el, 'input');
+      fire(el, 'change');
+    } else if (tag === 'TEXTAREA' || (tag === 'INPUT' && TEXT_TYPES.includes(type))) {
+      el.focus();
+      setNative(el, field.value);
+      el.dispatchEvent(new InputEvent('input', { bubbles: true, inputType: 'insertText', data: field.value }));
+      fire(el, 'change');
+    } else {
+      return { fallback: 'custom widget' };
+    }
+    // Blur so validate-on-blur handlers run as they would for a user
+    el.blur();
+    return { filled: true, validation: el.validationMessage || '' };
+  };
+
+  if (hasOpenShadowRoots()) return fields.map(() => ({ fallback: 'open shadow roots' }));
+  return fields.map((field) => {
+    try {
+      return fill(field);
+    } catch (e) {
+      return { fallback: String(e) };
+    }
+  });
+}"""
+
+
+class FillResult:
+
+    def __init__(self, form: str, mode: str):
+        self.form = form
+        self.mode = mode
+        self.batched = []
+        self.fallbacks = {}
+        self.validation = {}
+        self.elapsed_ms = 0.0
+
+
+class FormTimings:
+    # Per-form fill time, split by mode so a batched run can be compared
+    # with the sequential per-field fills it replaces
+
+    def __init__(self, history: dict):
+        self.history = {
+            mode: {form: LatencyHistogram.from_dict(data) for form, data in history.get(mode, {}).items()}
+            for mode in MODES
+        }
+        self.observed = {mode: {} for mode in MODES}
+
+    def record(self, form: str, mode: str, elapsed_ms: float):
+        self.observed[mode].setdefault(form, LatencyHistogram()).record(elapsed_ms)
+
+    def observed_dict(self) -> dict:
+        return {
+            mode: {form: histogram.to_dict() for form, histogram in forms.items()}
+            for mode, forms in self.observed.items()
+        }
+
+    def merge_observed(self, data: dict):
+        for mode, forms in data.items():
+            for form, histogram in forms.items():
+                self.observed[mode].setdefault(form, LatencyHistogram()).merge(LatencyHistogram.from_dict(histogram))
+
+    def summary_lines(self) -> list:
+        forms = sorted({form for forms in self.observed.values() for form in forms})
+        if not forms:
+            return []
+        combined = {mode: {} for mode in MODES}
+        for source in (self.history, self.observed):
+            for mode, histograms in source.items():
+                for form, histogram in histograms.items():
+                    combined[mode].setdefault(form, LatencyHistogram()).merge(histogram)
+
+        def p50(mode, form):
+            histogram = combined[mode].get(form)
+            return f"{histogram.percentile(50):.0f}ms" if histogram is not None and histogram.total else "-"
+
+        lines = [f"{'form':30} {'sequential p50':>14} {'batched p50':>11}"]
+        for form in forms:
+            lines.append(f"{form:30} {p50('sequential', form):>14} {p50('batched', form):>11}")
+        return lines
+
+
+class FormFiller:
+    # Maps logical field names to a page object's locators. fill() sets
+    # every plain CSS field it can in one evaluation and hands the rest
+    # (role, label and text locators included) to Playwright.
+
+    def __init__(self, page: Page, form: str, fields: dict):
+        self.page = page
+        self.form = form
+        self.fields = fields
+        self.steps = {name: compile_locator(locator) for name, locator in fields.items()}
+
+    def _fill_one(self, locator: Locator, value):
+        if isinstance(value, bool):
+            locator.set_checked(value)
+        elif locator.evaluate("el => el.tagName") == "SELECT":
+            locator.select_option(value)
+        else:
+            locator.fill(value)
+
+    def _fill_batch(self, names: list, values: dict):
+        # A click just before fill() may still be navigating to the form.
+        # Playwright's own wait for the first field covers that; the
+        # evaluation itself has no auto-wait. None means it hit a navigation.
+        try:
+            self.fields[names[0]].first.wait_for(state="attached")
+            return self.page.evaluate(
+                FILL_EXPRESSION, [{"steps": self.steps[name], "value": values[name]} for name in names]
+            )
+        except Error as e:
+            if not is_navigation_error(e):
+                raise
+            logger.info(f"{self.form} form navigated during the batched fill, filling it field by field")
+            return None
+
+    def fill(self, values: dict) -> FillResult:
+        mode = "batched" if _batched else "sequential"
+        result = FillResult(self.form, mode)
+        started = time.monotonic()
+
+        pending = dict(values)
+        if _batched:
+            batchable = [name for name in values if self.steps[name] is not None]
+            outcomes = self._fill_batch(batchable, values) if batchable else []
+            if outcomes is None:
+                # The page navigated under the evaluation; fields it may have
+                # set are gone with the old document, so fill them all again
+                outcomes = [{"fallback": "navigation during fill"}] * len(batchable)
+            for name, outcome in zip(batchable, outcomes):
+                if outcome.get("filled"):
+                    result.batched.append(name)
+                    pending.pop(name)
+                    if outcome["validation"]:
+                        result.validation[name] = outcome["validation"]
+                else:
+                    result.fallbacks[name] = outcome["fallback"]
+            for name in pending:
+                result.fallbacks.setdefault(name, "selector not supported in page")
+
+        for name, value in pending.items():
+            self._fill_one(self.fields[name], value)
+
+        result.elapsed_ms = (time.monotonic() - started) * 1000
+        if _timings is not None:
+            _timings.record(self.form, mode, result.elapsed_ms)
+        logger.info(
+            f"Filled {self.form} form ({mode}): {len(values)} fields, {len(result.batched)} in one evaluation, "
+            f"{len(pending)} by Playwright in {result.elapsed_ms:.0f}ms"
+        )
+        if result.fallbacks and _batched:
+            logger.debug(f"{self.form} fallbacks: {result.fallbacks}")
+        if result.validation:
+            logger.info(f"{self.form} validation messages: {result.validation}")
+        return result
+
+
+_batched = True
+_timings = None
+
+
+def configure(config, batched: bool) -> FormTimings:
+    global _batched, _timings
+    _batched = batched
+    cache = getattr(config, "cache", None)
+    _timings = FormTimings(cache.get(HISTORY_KEY, {}) if cache is not None else {})
+    return _timings
+
+
+def current_timings():
+    return _timings
+
+
+def save_history(config, timings: FormTimings):
+    if getattr(config, "cache", None) is None:
+        return
+    history = {}
+    for mode in MODES:
+        # Decayed copies: summary_lines() still reads timings.history
+        forms = {
+            form: LatencyHistogram(histogram.precision, {
+                index: round(count * HISTORY_DECAY, 3)
+                for index, count in histogram.counts.items()
+                if count * HISTORY_DECAY >= 0.01
+            })
+            for form, histogram in timings.history[mode].items()
+        }
+        for form, histogram in timings.observed[mode].items():
+            forms.setdefault(form, LatencyHistogram()).merge(histogram)
+        history[mode] = {form: histogram.to_dict() for form, histogram in forms.items() if histogram.counts}
+    config.cache.set(HISTORY_KEY, history)
+    logger.info(f"Stored form fill timings for {sum(len(forms) for forms in timings.observed.values())} form/mode pairs")
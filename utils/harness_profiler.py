@@ -0,0 +1,295 @@
+import re
+import sys
+import json
+import time
+import marshal
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+from playwright._impl._sync_base import SyncBase
+
+logger = logging.getLogger(__name__)
+
+
+class IpcTimer:
+    # Wall time spent inside SyncBase._sync, the single point where every
+    # sync API call blocks until the driver answers; counted per thread
+
+    def __init__(self):
+        self._local = threading.local()
+        self._original = None
+
+    def _state(self):
+        state = self._local
+        if not hasattr(state, "seconds"):
+            state.seconds = 0.0
+            state.calls = 0
+            state.depth = 0
+        return state
+
+    @property
+    def seconds(self) -> float:
+        return self._state().seconds
+
+    def install(self):
+        if self._original is not None:
+            return
+        original = self._original = SyncBase._sync
+        timer = self
+
+        def _sync(self, coro):
+            __tracebackhide__ = True
+            state = timer._state()
+            if state.depth:
+                return original(self, coro)
+            state.depth += 1
+            started = time.perf_counter()
+            try:
+                return original(self, coro)
+            finally:
+                state.depth -= 1
+                state.seconds += time.perf_counter() - started
+                state.calls += 1
+
+        SyncBase._sync = _sync
+
+    def uninstall(self):
+        if self._original is not None:
+            SyncBase._sync = self._original
+            self._original = None
+
+
+def _is_ipc(stack: list) -> bool:
+    # Inside a sync API call, or on the dispatcher greenlet running the
+    # driver connection's event loop
+    return any(
+        (name == "_sync" and (filename.endswith("_sync_base.py") or filename == __file__))
+        or (filename.endswith("base_events.py") and "asyncio" in filename)
+        for filename, _, name in stack
+    )
+
+
+class StackSampler:
+    # Samples the test thread's Python stack from a background thread. One
+    # sampler serves both outputs: pstats (self/cumulative time per
+    # function) and a speedscope sampled profile (full stacks).
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self.samples.append((stack, now - last))
+            last = now
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="test-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class TestProfile:
+
+    def __init__(self, nodeid: str, test_file: str, ipc_timer: IpcTimer, interval: float):
+        self.nodeid = nodeid
+        self.test_file = test_file
+        self.ipc_timer = ipc_timer
+        self.sampler = StackSampler(interval)
+        self.wall = 0.0
+        self._started = None
+        self._ipc_before = 0.0
+
+    def start(self):
+        self._ipc_before = self.ipc_timer.seconds
+        self._started = time.perf_counter()
+        self.sampler.start()
+
+    def stop(self):
+        self.sampler.stop()
+        self.wall = time.perf_counter() - self._started
+
+    def breakdown(self) -> dict:
+        # IPC is timed exactly; the rest is split between the test module
+        # and everything else (fixtures, page objects, logging, pytest) by
+        # where the non-IPC samples were executing
+        ipc = min(self.ipc_timer.seconds - self._ipc_before, self.wall)
+        own = Counter()
+        for stack, weight in self.sampler.samples:
+            if not _is_ipc(stack):
+                own["test" if stack[-1][0] == self.test_file else "harness"] += weight
+        sampled = sum(own.values())
+        rest = self.wall - ipc
+        test = rest * own["test"] / sampled if sampled else 0.0
+        return {"wall": self.wall, "ipc": ipc, "harness": rest - test, "test": test}
+
+    def hotspots(self, limit: int = 50) -> dict:
+        self_time = Counter()
+        for stack, weight in self.sampler.samples:
+            if not _is_ipc(stack):
+                filename, line, name = stack[-1]
+                self_time[f"{name} ({_short(filename)}:{line})"] += weight
+        return dict(self_time.most_common(limit))
+
+    def pstats_dict(self) -> dict:
+        stats = {}
+        for stack, weight in self.sampler.samples:
+            seen = set()
+            for depth, func in enumerate(stack):
+                cc, nc, tt, ct, callers = stats.get(func, (0, 0, 0.0, 0.0, {}))
+                leaf = depth == len(stack) - 1
+                if func not in seen:
+                    cc, nc, ct = cc + 1, nc + 1, ct + weight
+                    seen.add(func)
+                if leaf:
+                    tt += weight
+                if depth:
+                    caller = stack[depth - 1]
+                    pnc, pcc, ptt, pct = callers.get(caller, (0, 0, 0.0, 0.0))
+                    callers[caller] = (pnc + 1, pcc + 1, ptt + (weight if leaf else 0.0), pct + weight)
+                stats[func] = (cc, nc, tt, ct, callers)
+        return stats
+
+    def speedscope(self) -> dict:
+        frames, index = [], {}
+        samples, weights = [], []
+        for stack, weight in self.sampler.samples:
+            ids = []
+            for filename, line, name in stack:
+                key = (filename, line, name)
+                if key not in index:
+                    index[key] = len(frames)
+                    frames.append({"name": name, "file": filename, "line": line})
+                ids.append(index[key])
+            samples.append(ids)
+            weights.append(round(weight * 1000, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.nodeid,
+            "exporter": "playwright-demo --profile-tests",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": self.nodeid,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+    def write(self, directory) -> Path:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        # Not with_suffix: node ids keep the ".py" of their module, which
+        # would make every test of a module share one set of files
+        stem = directory / safe_name(self.nodeid)
+        with open(f"{stem}.pstats", "wb") as f:
+            marshal.dump(self.pstats_dict(), f)
+        Path(f"{stem}.speedscope.json").write_text(json.dumps(self.speedscope()), encoding="utf-8")
+        Path(f"{stem}.json").write_text(json.dumps({
+            "nodeid": self.nodeid,
+            "breakdown": self.breakdown(),
+            "hotspots": self.hotspots(),
+            "samples": len(self.sampler.samples),
+        }), encoding="utf-8")
+        return stem
+
+
+_ipc_timer = None
+_interval = 0.005
+
+
+def configure(interval_ms: float) -> IpcTimer:
+    global _ipc_timer, _interval
+    _interval = interval_ms / 1000
+    if _ipc_timer is None:
+        _ipc_timer = IpcTimer()
+        _ipc_timer.install()
+    return _ipc_timer
+
+
+def is_enabled() -> bool:
+    return _ipc_timer is not None
+
+
+def profile_test(item) -> TestProfile:
+    return TestProfile(item.nodeid, str(item.path), _ipc_timer, _interval)
+
+
+def _short(filename: str) -> str:
+    parts = Path(filename).parts
+    return "/".join(parts[-2:])
+
+
+def safe_name(nodeid: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid)[-150:]
+
+
+def aggregate(directory) -> dict:
+    totals = Counter()
+    hotspots = Counter()
+    tests = []
+    for path in sorted(Path(directory).glob("*.json")):
+        if path.name.endswith(".speedscope.json"):
+            continue
+        data = json.loads(path.read_text(encoding="utf-8"))
+        tests.append(data)
+        totals.update(data["breakdown"])
+        hotspots.update(data["hotspots"])
+    return {"tests": tests, "totals": dict(totals), "hotspots": hotspots}
+
+
+def write_report(summary: dict, path, run_id: str, top: int = 50):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "run": run_id,
+        "timestamp": time.time(),
+        "totals": summary["totals"],
+        "tests": {data["nodeid"]: data["breakdown"] for data in summary["tests"]},
+        "hotspots": dict(summary["hotspots"].most_common(top)),
+    }
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    logger.info(f"Profile hotspot report written: {path}")
+
+
+def summary_lines(summary: dict, top: int = 15, slowest: int = 5) -> list:
+    totals = summary["totals"]
+    wall = totals.get("wall", 0.0)
+    if not wall:
+        return []
+    share = lambda key: totals.get(key, 0.0) / wall
+    lines = [
+        f"{len(summary['tests'])} tests, {wall:.1f}s: waiting on Playwright IPC {share('ipc'):.0%}, "
+        f"harness code {share('harness'):.0%}, test code {share('test'):.0%}"
+    ]
+    lines.append("Slowest tests (wall = ipc + harness + test, seconds):")
+    for data in sorted(summary["tests"], key=lambda data: -data["breakdown"]["wall"])[:slowest]:
+        b = data["breakdown"]
+        lines.append(
+            f"  {b['wall']:6.2f} = {b['ipc']:6.2f} + {b['harness']:6.2f} + {b['test']:6.2f}  {data['nodeid']}"
+        )
+    lines.append(f"Top {top} Python hotspots outside Playwright waits (self time, sampled):")
+    for function, seconds in summary["hotspots"].most_common(top):
+        lines.append(f"  {seconds * 1000:8.0f}ms  {function}")
+    return lines
@@ -1,24 +1,60 @@
+import time
 import logging
-from playwright.sync_api import Page, Locator
+from playwright.sync_api import Page, Locator, Error
+from utils.dom_waiters import (
+    wait_for_conditions, visible, hidden, url_contains, is_invalid_selector, is_navigation_error
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _remaining_timeout(timeout: int, started: float) -> float:
+    # What is left of the caller's timeout when a wait falls back to Playwright's
+    return max(timeout - (time.monotonic() - started) * 1000, 1)
+
+
 def wait_for_element_visible(page: Page, selector: str, timeout: int = 30000) -> Locator:
     locator = page.locator(selector)
-    locator.wait_for(state="visible", timeout=timeout)
-    logger.info(f"Element {selector} is visible")
+    started = time.monotonic()
+    try:
+        # Strict, like locator.wait_for: several matches raise instead of passing
+        result = wait_for_conditions(page, [visible(selector, strict=True)], timeout=timeout)
+    except Error as e:
+        if not (is_invalid_selector(e) or is_navigation_error(e)):
+            raise
+        locator.wait_for(state="visible", timeout=_remaining_timeout(timeout, started))
+        logger.info(f"Element {selector} is visible")
+        return locator
+    logger.info(f"Element {selector} is visible (resumed in {result['resume_latency_ms']:.1f}ms)")
     return locator
 
 
 def wait_for_element_hidden(page: Page, selector: str, timeout: int = 30000):
-    locator = page.locator(selector)
-    locator.wait_for(state="hidden", timeout=timeout)
-    logger.info(f"Element {selector} is hidden")
+    started = time.monotonic()
+    try:
+        result = wait_for_conditions(page, [hidden(selector, strict=True)], timeout=timeout)
+    except Error as e:
+        if not (is_invalid_selector(e) or is_navigation_error(e)):
+            raise
+        page.locator(selector).wait_for(state="hidden", timeout=_remaining_timeout(timeout, started))
+        logger.info(f"Element {selector} is hidden")
+        return
+    logger.info(f"Element {selector} is hidden (resumed in {result['resume_latency_ms']:.1f}ms)")
 
 
 def wait_for_url_change(page: Page, expected_url: str, timeout: int = 30000):
-    page.wait_for_url(f"**{expected_url}**", timeout=timeout)
+    started = time.monotonic()
+    try:
+        wait_for_conditions(page, [url_contains(expected_url)], timeout=timeout)
+    except Error as e:
+        if not is_navigation_error(e):
+            raise
+        # A full navigation destroys the in-page waiter; Playwright's own
+        # wait_for_url is driven by frame navigation events from here on.
+        page.wait_for_url(f"**{expected_url}**", timeout=_remaining_timeout(timeout, started))
+    # The URL can change before the new document loads; callers relied on
+    # page.wait_for_url's default wait for the load event
+    page.wait_for_load_state(timeout=_remaining_timeout(timeout, started))
     logger.info(f"URL changed to {expected_url}")
 
 
@@ -0,0 +1,107 @@
+import re
+from playwright.sync_api import Locator
+from utils.dom_waiters import IS_VISIBLE_SOURCE
+
+
+class UnsupportedSelector(ValueError):
+    pass
+
+
+# Playwright's own pseudo-classes; CSS using them, like frames and xpath,
+# stays with Playwright
+CSS_EXTENSIONS = re.compile(
+    r":(has-text|text|text-is|text-matches|visible|nth-match|left-of|right-of|above|below|near)\b"
+)
+
+# Resolves compiled steps to elements inside the page. Only css and nth
+# steps are compiled, since those are the ones querySelectorAll answers
+# exactly as Playwright would, and only while the page has no open shadow
+# roots, which Playwright's CSS engine pierces and querySelectorAll does not.
+# Role, label, text and attribute locators stay with Playwright.
+RESOLVER_SOURCE = """
+  const normalize = (s) => (s || '').replace(/\\s+/g, ' ').trim();
+
+  const hasOpenShadowRoots = () => Array.from(document.querySelectorAll('*')).some((el) => el.shadowRoot);
+
+  const resolve = (steps) => {
+    let current = [document];
+    for (const step of steps) {
+      if (step.engine === 'nth') {
+        const index = step.index < 0 ? current.length + step.index : step.index;
+        current = index >= 0 && index < current.length ? [current[index]] : [];
+      } else {
+        const found = new Set();
+        for (const root of current) for (const el of root.querySelectorAll(step.selector)) found.add(el);
+        current = Array.from(found).sort((a, b) =>
+          a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING ? -1 : 1);
+      }
+    }
+    return current;
+  };
+""" + IS_VISIBLE_SOURCE
+
+
+def selector_of(locator: Locator) -> str:
+    # The public API has no accessor for the selector string; if this
+    # private attribute changes, compile_locator returns None and callers
+    # fall back to Playwright
+    return locator._impl_obj._selector
+
+
+def split_parts(selector: str) -> list:
+    parts, current, quote, i = [], [], None, 0
+    while i < len(selector):
+        ch = selector[i]
+        if quote:
+            current.append(ch)
+            if ch == "\\" and i + 1 < len(selector):
+                current.append(selector[i + 1])
+                i += 2
+                continue
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+            current.append(ch)
+        elif selector.startswith(" >> ", i):
+            parts.append("".join(current).strip())
+            current = []
+            i += 4
+            continue
+        else:
+            current.append(ch)
+        i += 1
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def compile_selector(selector: str) -> list:
+    steps = []
+    for part in split_parts(selector):
+        engine = re.match(r"(internal:[\w-]+|css|nth|text|xpath|id|data-testid)=", part)
+        if engine is None:
+            if part.startswith("//") or part.startswith(".."):
+                raise UnsupportedSelector(f"xpath {part!r}")
+            engine_name, body = "css", part
+        else:
+            engine_name, body = engine.group(1), part[engine.end():]
+
+        if engine_name == "css":
+            if CSS_EXTENSIONS.search(body):
+                raise UnsupportedSelector(f"Playwright CSS extension in {body!r}")
+            steps.append({"engine": "css", "selector": body})
+        elif engine_name == "nth":
+            steps.append({"engine": "nth", "index": int(body)})
+        elif engine_name == "internal:describe":
+            continue
+        else:
+            raise UnsupportedSelector(f"engine {engine_name!r} is not resolved in-page")
+    return steps
+
+
+def compile_locator(locator: Locator):
+    # None means the caller must fall back to Playwright for this locator
+    try:
+        return compile_selector(selector_of(locator))
+    except (UnsupportedSelector, AttributeError, ValueError):
+        return None
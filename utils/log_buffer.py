@@ -0,0 +1,180 @@
+import sys
+import queue
+import logging
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+
+logger = logging.getLogger(__name__)
+
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class TestLogBuffer(logging.Handler):
+    # Keeps the current test's records, unformatted, in a bounded ring.
+    # Appending is all a passing test pays for; formatting happens only
+    # when a failing test's buffer is flushed. Records at or above
+    # console_level were already queued for the console when logged; outside a
+    # test, the rest go straight through to the writer as well. Each thread
+    # has its own ring, so tests running on --threads stay separate.
+
+    def __init__(self, capacity: int, writer: logging.Handler, console_level: int):
+        super().__init__(level=logging.NOTSET)
+        self.capacity = capacity
+        self.writer = writer
+        self.console_level = console_level
+        self.local = threading.local()
+
+    def _state(self):
+        state = self.local
+        if not hasattr(state, "records"):
+            state.nodeid = None
+            state.records = deque(maxlen=self.capacity)
+            state.dropped = 0
+        return state
+
+    @property
+    def nodeid(self):
+        return self._state().nodeid
+
+    @property
+    def records(self) -> deque:
+        return self._state().records
+
+    def emit(self, record):
+        state = self._state()
+        if state.nodeid is None:
+            if record.levelno < self.console_level:
+                self.writer.handle(record)
+            return
+        if len(state.records) == self.capacity:
+            state.dropped += 1
+        state.records.append(record)
+
+    def start(self, nodeid: str):
+        state = self._state()
+        state.nodeid = nodeid
+        state.records.clear()
+        state.dropped = 0
+
+    def flush_records(self) -> str:
+        # Sends the buffered records to the writer and returns them as text
+        # for the report; the buffer keeps collecting the rest of the test
+        state = self._state()
+        lines = []
+        if state.dropped:
+            lines.append(f"... {state.dropped} earlier records dropped (LOG_BUFFER_CAPACITY={self.capacity})")
+        while state.records:
+            record = state.records.popleft()
+            lines.append(self.format(record))
+            if record.levelno < self.console_level:
+                self.writer.handle(record)
+        state.dropped = 0
+        return "\n".join(lines)
+
+    def discard(self):
+        state = self._state()
+        state.nodeid = None
+        state.records.clear()
+        state.dropped = 0
+
+
+class HeldLines(logging.Handler):
+    # Console side of the listener thread: formats records and holds the
+    # lines until take() is called between tests, so they never land in
+    # the middle of pytest's progress line
+
+    def __init__(self):
+        super().__init__(level=logging.NOTSET)
+        self.lines = deque()
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+    def take(self) -> list:
+        taken = []
+        while self.lines:
+            taken.append(self.lines.popleft())
+        return taken
+
+
+class LogPipeline:
+    # root -> TestLogBuffer (per test, memory only)
+    #      -> QueueHandler (console_level and up) -> queue
+    # queue -> QueueListener thread -> HeldLines
+    # The thread that logs only resolves the message; console lines are
+    # formatted by the listener thread and written by console_lines()'s
+    # caller once the current test has been reported.
+
+    def __init__(self, level: int, console_level: int, capacity: int, stream=None):
+        self.level = level
+        self.console_level = console_level
+        self.queue = queue.SimpleQueue()
+        self.stream = stream or sys.stderr
+        self.console = HeldLines()
+        self.console.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.listener = QueueListener(self.queue, self.console, respect_handler_level=False)
+        self.writer = QueueHandler(self.queue)
+        self.buffer = TestLogBuffer(capacity, self.writer, console_level)
+        self.buffer.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.immediate = QueueHandler(self.queue)
+        self.immediate.setLevel(console_level)
+        self._previous = None
+
+    def console_lines(self) -> list:
+        return self.console.take()
+
+    def install(self):
+        root = logging.getLogger()
+        self._previous = (root.level, list(root.handlers))
+        for handler in self._previous[1]:
+            root.removeHandler(handler)
+        root.setLevel(self.level)
+        root.addHandler(self.buffer)
+        root.addHandler(self.immediate)
+        self.listener.start()
+
+    def uninstall(self):
+        root = logging.getLogger()
+        root.removeHandler(self.buffer)
+        root.removeHandler(self.immediate)
+        # stop() drains the queue before joining the writer thread
+        self.listener.stop()
+        for line in self.console.take():
+            self.stream.write(line + "\n")
+        self.stream.flush()
+        if self._previous is not None:
+            level, handlers = self._previous
+            root.setLevel(level)
+            for handler in handlers:
+                root.addHandler(handler)
+            self._previous = None
+
+
+_pipeline = None
+
+
+def configure_sync(level: int = logging.INFO):
+    # The previous behaviour: every record formatted and written to the
+    # console by the thread that logged it
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
+
+def configure(level: int, console_level: int, capacity: int, stream=None) -> LogPipeline:
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = LogPipeline(level, console_level, capacity, stream)
+        _pipeline.install()
+    return _pipeline
+
+
+def current():
+    return _pipeline
+
+
+def shutdown():
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.uninstall()
+        _pipeline = None
@@ -0,0 +1,114 @@
+"""
+Logging throughput benchmark
+Replays the log records of a registration + checkout flow (the page objects'
+own loggers and messages) through synchronous console logging and through
+the buffered pipeline, for passing and failing tests
+Usage: python -m utils.logging_benchmark [--tests 2000] [--output /dev/null]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from utils import log_buffer
+
+# One test's worth of page-object logging: registration, product, cart and
+# checkout steps with the arguments those methods pass
+FLOW = [
+    ("pages.lamdatest_home_page", "Navigating to registration page", ()),
+    ("pages.lamdatest_register_page", "Registering user: %s", ("test.user.1234@example.com",)),
+    ("utils.form_fill", "Filled %s form (%s): %s fields in %.0fms", ("register", "batched", 7, 41.7)),
+    ("pages.lamdatest_register_page", "Clicked continue button", ()),
+    ("pages.home_page", "Searching for product: %s", ("iPhone",)),
+    ("pages.product_page", "Products displayed: %s", (15,)),
+    ("pages.product_page", "Clicking product at index %s", (0,)),
+    ("pages.product_page", "Product name: %s", ("iPhone",)),
+    ("pages.product_page", "Product price: %s", ("$123.20",)),
+    ("pages.product_page", "Setting quantity to: %s", (2,)),
+    ("pages.product_page", "Adding product to cart", ()),
+    ("pages.home_page", "Navigating to cart", ()),
+    ("pages.checkout_page", "Cart items count: %s", (1,)),
+    ("pages.checkout_page", "Subtotal: %s", ("$202.00",)),
+    ("pages.checkout_page", "Total: %s", ("$246.40",)),
+    ("pages.checkout_page", "Proceeding to checkout", ()),
+    ("pages.checkout_page", "Filling billing address for %s %s", ("Test", "User")),
+    ("pages.checkout_page", "Selecting country: %s", ("United Kingdom",)),
+    ("pages.checkout_page", "Selecting shipping method at index %s", (0,)),
+    ("pages.checkout_page", "Selecting payment method at index %s", (0,)),
+    ("pages.checkout_page", "Continuing to next step", ()),
+    ("pages.checkout_page", "Confirming order", ()),
+]
+
+
+def run_flow(loggers: dict, pipeline, tests: int, fail_every: int) -> float:
+    started = time.perf_counter()
+    for index in range(tests):
+        if pipeline is not None:
+            pipeline.buffer.start(f"test_{index}")
+        for name, message, args in FLOW:
+            loggers[name].info(message, *args)
+        if pipeline is not None:
+            if fail_every and index % fail_every == 0:
+                pipeline.buffer.flush_records()
+            pipeline.buffer.discard()
+    return time.perf_counter() - started
+
+
+def measure(mode: str, tests: int, fail_every: int, output) -> tuple:
+    loggers = {name: logging.getLogger(name) for name, _, _ in FLOW}
+    root = logging.getLogger()
+    saved = (root.level, list(root.handlers))
+    for handler in saved[1]:
+        root.removeHandler(handler)
+
+    pipeline = None
+    if mode == "sync":
+        handler = logging.StreamHandler(output)
+        handler.setFormatter(logging.Formatter(log_buffer.LOG_FORMAT))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+    else:
+        pipeline = log_buffer.configure(logging.INFO, logging.WARNING, 500, output)
+
+    started = time.perf_counter()
+    elapsed = run_flow(loggers, pipeline, tests, fail_every)
+    if pipeline is not None:
+        # Includes the writer thread finishing whatever was queued
+        log_buffer.shutdown()
+    else:
+        root.removeHandler(handler)
+    drained = time.perf_counter() - started
+    for handler in saved[1]:
+        root.addHandler(handler)
+    root.setLevel(saved[0])
+    return elapsed, drained
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare synchronous and buffered logging throughput")
+    parser.add_argument("--tests", type=int, default=2000, help="simulated tests per mode")
+    parser.add_argument("--output", default=os.devnull, help="where console lines go (default: discarded)")
+    parser.add_argument("--fail-every", type=int, default=20, help="every Nth test fails and flushes its buffer")
+    args = parser.parse_args(argv)
+
+    records = args.tests * len(FLOW)
+    modes = {
+        "sync": 0,
+        "buffered (all pass)": 0,
+        f"buffered (1 in {args.fail_every} fail)": args.fail_every,
+    }
+    print(
+        f"{'mode':28} {'records/s':>12} {'us/record':>10} {'incl. drain':>12}  "
+        f"({args.tests} tests x {len(FLOW)} records; records/s as seen by the test thread)"
+    )
+    with open(args.output, "w") as output:
+        for label, fail_every in modes.items():
+            mode = "sync" if label == "sync" else "buffered"
+            elapsed, drained = measure(mode, args.tests, fail_every, output)
+            print(f"{label:28} {records / elapsed:12,.0f} {elapsed / records * 1e6:10.2f} {drained:11.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import logging
+from playwright.sync_api import BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+
+class PageLoad:
+
+    def __init__(self, url: str):
+        self.url = url
+        self.requests = 0
+        self.bytes = 0
+
+    def as_dict(self) -> dict:
+        return {"url": self.url, "requests": self.requests, "bytes": self.bytes}
+
+
+class NetworkRecorder:
+    # Aggregates traffic from CDP Network events pushed by Chromium, so no
+    # extra round trip is made per request. Each main-frame document starts a
+    # new PageLoad bucket that budgets are checked against.
+
+    def __init__(self, context: BrowserContext, route_latency=None):
+        self.context = context
+        self.route_latency = route_latency
+        self.sessions = {}
+        self.pending = {}
+        self.requests = 0
+        self.failed = 0
+        self.bytes = 0
+        self.bytes_by_type = {}
+        self.cache_hits = 0
+        self.timings = []
+        self.page_loads = []
+        self._main_frames = {}
+
+    def attach(self, page: Page):
+        if page in self.sessions:
+            return
+        cdp = self.context.new_cdp_session(page)
+        cdp.on("Network.requestWillBeSent", lambda params: self._on_request(page, params))
+        cdp.on("Network.responseReceived", self._on_response)
+        cdp.on("Network.requestServedFromCache", self._on_served_from_cache)
+        cdp.on("Network.loadingFinished", self._on_finished)
+        cdp.on("Network.loadingFailed", self._on_failed)
+        cdp.send("Network.enable", {"maxTotalBufferSize": 0, "maxResourceBufferSize": 0})
+        self.sessions[page] = cdp
+
+    def _on_request(self, page: Page, params):
+        request_id = params["requestId"]
+        resource_type = params.get("type", "Other")
+        if resource_type == "Document":
+            main_frame = self._main_frames.setdefault(page, params["frameId"])
+            if params["frameId"] == main_frame and params.get("redirectResponse") is None:
+                self.page_loads.append(PageLoad(params["request"]["url"]))
+
+        self.pending[request_id] = {
+            "url": params["request"]["url"],
+            "type": resource_type,
+            "start": params["timestamp"],
+            "page_load": self.page_loads[-1] if self.page_loads else None,
+            "cached": False,
+        }
+
+    def _on_response(self, params):
+        entry = self.pending.get(params["requestId"])
+        if entry is None:
+            return
+        response = params["response"]
+        if response.get("fromDiskCache") or response.get("fromPrefetchCache") \
+                or response.get("fromServiceWorker") or response.get("status") == 304:
+            entry["cached"] = True
+
+        timing = response.get("timing")
+        if timing:
+            entry["ttfb"] = timing["receiveHeadersEnd"] - timing["sendStart"]
+        headers = {name.lower(): value for name, value in response.get("headers", {}).items()}
+        entry["server_timing"] = headers.get("server-timing")
+
+    def _on_served_from_cache(self, params):
+        entry = self.pending.get(params["requestId"])
+        if entry is not None:
+            entry["cached"] = True
+
+    def _on_finished(self, params):
+        entry = self.pending.pop(params["requestId"], None)
+        if entry is None:
+            return
+        transferred = int(params.get("encodedDataLength", 0))
+        self.requests += 1
+        self.bytes += transferred
+        self.bytes_by_type[entry["type"]] = self.bytes_by_type.get(entry["type"], 0) + transferred
+        if entry["cached"]:
+            self.cache_hits += 1
+        total_ms = (params["timestamp"] - entry["start"]) * 1000
+        self.timings.append((total_ms, entry["type"], entry["url"]))
+        if self.route_latency is not None and not entry["cached"]:
+            self.route_latency.record(entry["url"], entry.get("ttfb"), total_ms, entry.get("server_timing"))
+
+        if entry["page_load"] is not None:
+            entry["page_load"].requests += 1
+            entry["page_load"].bytes += transferred
+
+    def _on_failed(self, params):
+        entry = self.pending.pop(params["requestId"], None)
+        if entry is not None:
+            self.failed += 1
+            if entry["page_load"] is not None:
+                entry["page_load"].requests += 1
+
+    def detach(self):
+        for cdp in self.sessions.values():
+            try:
+                cdp.detach()
+            except Exception:
+                pass
+        self.sessions.clear()
+
+    def slowest(self, limit: int = 5) -> list:
+        return [
+            {"ms": round(ms, 1), "type": resource_type, "url": url}
+            for ms, resource_type, url in sorted(self.timings, reverse=True)[:limit]
+        ]
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "failed": self.failed,
+            "bytes": self.bytes,
+            "bytes_by_type": dict(sorted(self.bytes_by_type.items(), key=lambda kv: -kv[1])),
+            "cache_hits": self.cache_hits,
+            "slowest": self.slowest(),
+            "pages": [page_load.as_dict() for page_load in self.page_loads],
+        }
+
+    def budget_violations(self, max_bytes: int = None, max_requests: int = None, url: str = None) -> list:
+        violations = []
+        for page_load in self.page_loads:
+            if url is not None and url not in page_load.url:
+                continue
+            if max_bytes is not None and page_load.bytes > max_bytes:
+                violations.append(f"{page_load.url}: {page_load.bytes} bytes > budget {max_bytes}")
+            if max_requests is not None and page_load.requests > max_requests:
+                violations.append(f"{page_load.url}: {page_load.requests} requests > budget {max_requests}")
+        return violations
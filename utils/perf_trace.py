@@ -0,0 +1,216 @@
+import json
+import time
+import logging
+from collections import Counter
+from playwright.sync_api import Page, Error
+
+logger = logging.getLogger(__name__)
+
+
+# What the DevTools Performance panel records, plus V8 sampling so script
+# time can be attributed to functions inside the trace as well
+TRACE_CATEGORIES = [
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "disabled-by-default-devtools.timeline.stack",
+    "disabled-by-default-v8.cpu_profiler",
+    "v8.execute",
+    "blink.user_timing",
+    "loading",
+    "latencyInfo",
+    "toplevel",
+]
+
+SAMPLING_INTERVAL_US = 200
+
+# Main-thread work grouped the way the DevTools summary pie groups it.
+# Only the outermost matching event counts, so nested calls are not
+# double-counted.
+ACTIVITY_GROUPS = {
+    "EvaluateScript": "script", "FunctionCall": "script", "TimerFire": "script", "EventDispatch": "script",
+    "v8.compile": "script", "v8.compileModule": "script", "V8.Execute": "script", "v8.run": "script",
+    "FireAnimationFrame": "script", "RunMicrotasks": "script",
+    "Layout": "layout",
+    "UpdateLayoutTree": "style", "RecalculateStyles": "style", "ParseAuthorStyleSheet": "style",
+    "ParseHTML": "parse",
+    "Paint": "paint", "PrePaint": "paint", "PaintImage": "paint", "Layerize": "paint",
+    "UpdateLayerTree": "paint", "CompositeLayers": "paint",
+}
+
+TASK_NAMES = ("RunTask", "ThreadControllerImpl::RunTask")
+
+SKIPPED_FUNCTIONS = ("(root)", "(idle)", "(program)")
+
+
+class PerfTrace:
+    # A Chrome trace (Perfetto/DevTools-loadable) and a V8 CPU profile of
+    # one page, recorded over the page's own CDP session
+
+    def __init__(self, page: Page, label: str, sampling_interval_us: int = SAMPLING_INTERVAL_US):
+        self.page = page
+        self.label = label
+        self.sampling_interval_us = sampling_interval_us
+        self.events = []
+        self.profile = None
+        self.complete = False
+        self.cdp = None
+        self.started = None
+
+    def start(self):
+        self.cdp = self.page.context.new_cdp_session(self.page)
+        self.cdp.on("Tracing.dataCollected", lambda params: self.events.extend(params["value"]))
+        self.cdp.on("Tracing.tracingComplete", self._on_complete)
+        self.cdp.send("Tracing.start", {
+            "transferMode": "ReportEvents",
+            "traceConfig": {"recordMode": "recordAsMuchAsPossible", "includedCategories": TRACE_CATEGORIES},
+        })
+        self.cdp.send("Profiler.enable")
+        self.cdp.send("Profiler.setSamplingInterval", {"interval": self.sampling_interval_us})
+        self.cdp.send("Profiler.start")
+        self.started = time.monotonic()
+        logger.info(f"Performance trace started: {self.label}")
+
+    def _on_complete(self, params):
+        self.complete = True
+
+    def stop(self, timeout: float = 30):
+        if self.cdp is None:
+            return
+        try:
+            self.profile = self.cdp.send("Profiler.stop")["profile"]
+            self.cdp.send("Tracing.end")
+            # Trace chunks keep arriving after Tracing.end; the sync API only
+            # dispatches them while it is waiting on something
+            deadline = time.monotonic() + timeout
+            while not self.complete and time.monotonic() < deadline:
+                self.page.wait_for_timeout(50)
+            if not self.complete:
+                logger.warning(f"Trace for {self.label} did not complete within {timeout}s; keeping what arrived")
+            self.cdp.detach()
+        except Error as e:
+            logger.warning(f"Failed to stop performance trace for {self.label}: {e}")
+        self.cdp = None
+        logger.info(
+            f"Performance trace stopped: {self.label}, {len(self.events)} events in "
+            f"{time.monotonic() - self.started:.1f}s"
+        )
+
+    def trace_json(self) -> bytes:
+        return json.dumps({"traceEvents": self.events, "metadata": {"label": self.label}}).encode()
+
+    def cpuprofile_json(self) -> bytes:
+        return json.dumps(self.profile or {}).encode()
+
+    def summary(self, limit: int = 10) -> dict:
+        return {
+            "label": self.label,
+            "main_thread_ms": main_thread_breakdown(self.events),
+            "longest_tasks": longest_tasks(self.events, limit),
+            "top_functions": top_self_time(self.profile or {}, limit),
+        }
+
+
+def _main_threads(events: list) -> set:
+    # The renderer main thread of the traced page's top frame; every
+    # renderer main thread if the trace does not say which one that is
+    page_pids = set()
+    for event in events:
+        if event.get("name") == "TracingStartedInBrowser":
+            for frame in event.get("args", {}).get("data", {}).get("frames", []):
+                if not frame.get("parent"):
+                    page_pids.add(frame.get("processId"))
+    threads = set()
+    for event in events:
+        if event.get("ph") == "M" and event.get("name") == "thread_name" \
+                and event.get("args", {}).get("name") == "CrRendererMain":
+            if not page_pids or event.get("pid") in page_pids:
+                threads.add((event["pid"], event["tid"]))
+    return threads
+
+
+def _complete_events(events: list) -> list:
+    threads = _main_threads(events)
+    return sorted(
+        (event for event in events
+         if event.get("ph") == "X" and (event.get("pid"), event.get("tid")) in threads and "dur" in event),
+        key=lambda event: (event["pid"], event["tid"], event["ts"], -event["dur"]),
+    )
+
+
+def _describe(event: dict) -> str:
+    data = event.get("args", {}).get("data", {}) or {}
+    where = data.get("url") or data.get("functionName") or data.get("type") or ""
+    if where and data.get("lineNumber") is not None:
+        where = f"{where}:{data['lineNumber']}"
+    return f"{event['name']} {where[-80:]}".strip()
+
+
+def main_thread_breakdown(events: list) -> dict:
+    totals = Counter()
+    open_until = {}
+    for event in _complete_events(events):
+        group = ACTIVITY_GROUPS.get(event["name"])
+        thread = (event["pid"], event["tid"])
+        if event["name"] in TASK_NAMES:
+            totals["tasks"] += event["dur"]
+        elif group is not None and event["ts"] >= open_until.get(thread, 0):
+            totals[group] += event["dur"]
+            open_until[thread] = event["ts"] + event["dur"]
+    return {group: round(us / 1000, 1) for group, us in totals.most_common()}
+
+
+def longest_tasks(events: list, limit: int = 10) -> list:
+    complete = _complete_events(events)
+    tasks = sorted(
+        (event for event in complete if event["name"] in TASK_NAMES), key=lambda event: -event["dur"]
+    )[:limit]
+    longest = []
+    for task in tasks:
+        end = task["ts"] + task["dur"]
+        children = [
+            event for event in complete
+            if event is not task and event["name"] in ACTIVITY_GROUPS
+            and (event["pid"], event["tid"]) == (task["pid"], task["tid"])
+            and task["ts"] <= event["ts"] and event["ts"] + event["dur"] <= end
+        ]
+        heaviest = max(children, key=lambda event: event["dur"], default=None)
+        longest.append({
+            "ms": round(task["dur"] / 1000, 1),
+            "main_activity": _describe(heaviest) if heaviest is not None else "(unattributed)",
+        })
+    return longest
+
+
+def top_self_time(profile: dict, limit: int = 10) -> list:
+    nodes = {node["id"]: node for node in profile.get("nodes", [])}
+    samples = profile.get("samples", [])
+    deltas = profile.get("timeDeltas", [])
+    # Each sample lasts until the next one is taken
+    self_us = Counter()
+    for index, node_id in enumerate(samples):
+        self_us[node_id] += deltas[index + 1] if index + 1 < len(deltas) else 0
+
+    by_function = Counter()
+    for node_id, us in self_us.items():
+        frame = nodes[node_id]["callFrame"]
+        name = frame.get("functionName") or "(anonymous)"
+        if name in SKIPPED_FUNCTIONS:
+            continue
+        url = frame.get("url", "").rsplit("/", 1)[-1]
+        where = f"{url}:{frame.get('lineNumber', -1) + 1}" if url else "native"
+        by_function[f"{name} ({where})"] += us
+    return [{"function": function, "ms": round(us / 1000, 1)} for function, us in by_function.most_common(limit)]
+
+
+def summary_lines(nodeid: str, summary: dict, limit: int = 5) -> list:
+    breakdown = summary["main_thread_ms"]
+    busy = ", ".join(f"{group} {ms:.0f}" for group, ms in breakdown.items() if group != "tasks")
+    lines = [f"{nodeid} [{summary['label']}]: main thread {breakdown.get('tasks', 0):.0f}ms in tasks ({busy or 'no activity'})"]
+    tasks = summary["longest_tasks"][:limit]
+    if tasks:
+        lines.append("  longest tasks: " + "; ".join(f"{task['ms']:.0f}ms {task['main_activity']}" for task in tasks))
+    functions = summary["top_functions"][:limit]
+    if functions:
+        lines.append("  top self time: " + "; ".join(f"{entry['ms']:.0f}ms {entry['function']}" for entry in functions))
+    return lines
@@ -0,0 +1,109 @@
+import sys
+import inspect
+import logging
+import subprocess
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+OUTCOMES_KEY = "playwright_demo/outcomes"
+
+# Outcomes kept per test, newest last: "F" failed, "P" passed
+HISTORY_LENGTH = 10
+
+# A failure counts half as much with every run since it happened
+RECENCY_HALF_LIFE = 1.0
+
+RECENT_FAILURE_WEIGHT = 2.0
+FLAKINESS_WEIGHT = 1.0
+CHANGED_CODE_WEIGHT = 1.0
+
+
+def load_outcomes(config) -> dict:
+    cache = getattr(config, "cache", None)
+    return cache.get(OUTCOMES_KEY, {}) if cache is not None else {}
+
+
+def save_outcomes(config, observed: dict):
+    if getattr(config, "cache", None) is None:
+        return
+    history = load_outcomes(config)
+    for nodeid, failed in observed.items():
+        history[nodeid] = (history.get(nodeid, "") + ("F" if failed else "P"))[-HISTORY_LENGTH:]
+    config.cache.set(OUTCOMES_KEY, history)
+    logger.info(f"Stored outcome history for {len(observed)} tests")
+
+
+def recent_failure_score(outcomes: str) -> float:
+    return sum(
+        0.5 ** (age / RECENCY_HALF_LIFE)
+        for age, outcome in enumerate(reversed(outcomes))
+        if outcome == "F"
+    )
+
+
+def flakiness(outcomes: str) -> float:
+    if len(outcomes) < 2:
+        return 0.0
+    flips = sum(1 for previous, current in zip(outcomes, outcomes[1:]) if previous != current)
+    return flips / (len(outcomes) - 1)
+
+
+def changed_files(root) -> set:
+    # Uncommitted edits plus anything committed in the last three days
+    commands = [
+        ["git", "diff", "--name-only", "HEAD"],
+        ["git", "log", "--since=3.days", "--name-only", "--pretty=format:"],
+    ]
+    changed = set()
+    for command in commands:
+        try:
+            output = subprocess.run(
+                command, cwd=root, capture_output=True, text=True, timeout=10, check=True
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return set()
+        changed.update(Path(root, line.strip()).resolve() for line in output.splitlines() if line.strip())
+    return changed
+
+
+def page_object_files(item) -> set:
+    # Page-object modules the test module imports, directly or via classes
+    module = getattr(item, "module", None)
+    if module is None:
+        return set()
+    files = {Path(module.__file__).resolve()} if getattr(module, "__file__", None) else set()
+    for value in vars(module).values():
+        name = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+        if isinstance(name, str) and name.split(".")[0] == "pages":
+            source = getattr(sys.modules.get(name), "__file__", None)
+            if source:
+                files.add(Path(source).resolve())
+    return files
+
+
+def risk_scores(items, outcomes: dict, changed: set) -> dict:
+    scores = {}
+    for item in items:
+        history = outcomes.get(item.nodeid, "")
+        score = RECENT_FAILURE_WEIGHT * recent_failure_score(history) + FLAKINESS_WEIGHT * flakiness(history)
+        if changed and page_object_files(item) & changed:
+            score += CHANGED_CODE_WEIGHT
+        scores[item.nodeid] = round(score, 3)
+    return scores
+
+
+def order_by_risk(items, scores: dict, group_of) -> list:
+    # Risky groups move to the front, riskiest first; the rest keep their
+    # current (longest-first or collection) order. Groups stay intact so
+    # --dist loadgroup still keeps shared fixtures on one worker.
+    groups = {}
+    for item in items:
+        groups.setdefault(group_of(item), []).append(item)
+    position = {key: index for index, key in enumerate(groups)}
+    group_score = {key: max(scores.get(item.nodeid, 0.0) for item in members) for key, members in groups.items()}
+    ordered = sorted(groups, key=lambda key: (-group_score[key], position[key]))
+    risky = sum(1 for score in group_score.values() if score > 0)
+    logger.info(f"Moved {risky} of {len(groups)} scheduling groups ahead by failure risk")
+    return [item for key in ordered for item in groups[key]]
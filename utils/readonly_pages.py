@@ -0,0 +1,127 @@
+import logging
+from playwright.sync_api import Browser, Page, Request
+
+logger = logging.getLogger(__name__)
+
+
+# Elements that reflect server-side cart/wishlist/account state, plus the
+# alerts and toasts OpenCart shows after a write. Content changes inside any
+# of them mean a "read-only" test mutated something.
+GUARD_SELECTORS = [
+    "#cart", "#cart-total", ".cart-icon", "#wishlist-total", ".wishlist-icon",
+    "#account", ".account-name", ".alert", ".toast", "#notification-box-top",
+]
+
+GUARD_SCRIPT = """(selectors) => {
+  if (window.__readonlyGuard) return;
+  const records = [];
+  const note = (text) => { if (records.length < 20) records.push(text); };
+  const watched = (node) => {
+    const el = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+    return el && selectors.find((selector) => el.closest(selector));
+  };
+  new MutationObserver((mutations) => {
+    for (const mutation of mutations) {
+      const selector = watched(mutation.target);
+      if (selector) note(`${selector} content changed`);
+    }
+  }).observe(document.documentElement, { subtree: true, childList: true, characterData: true });
+  for (const event of ['input', 'change'])
+    document.addEventListener(event, (e) => {
+      const target = e.target;
+      note(`${event} on ${target.name || target.id || target.tagName.toLowerCase()}`);
+    }, true);
+  window.__readonlyGuard = { take: () => records.splice(0) };
+}"""
+
+TAKE_EXPRESSION = "() => window.__readonlyGuard ? window.__readonlyGuard.take() : ['mutation guard lost']"
+
+
+class SharedPage:
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.url = page.url
+        self.writes = []
+        self.tests = 0
+        page.on("request", self._on_request)
+        page.evaluate(GUARD_SCRIPT, GUARD_SELECTORS)
+
+    def _on_request(self, request: Request):
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            self.writes.append(f"{request.method} {request.url}")
+
+    def mutations(self) -> list:
+        if self.page.is_closed():
+            return ["page closed"]
+        reasons = []
+        if self.page.url != self.url:
+            reasons.append(f"URL changed to {self.page.url}")
+        reasons.extend(self.writes)
+        self.writes = []
+        try:
+            reasons.extend(self.page.evaluate(TAKE_EXPRESSION))
+        except Exception as e:
+            reasons.append(f"guard check failed: {e}")
+        return reasons
+
+
+class ReadonlyPagePool:
+    # One loaded page per (module, url, prepare) on each worker, in a
+    # context of its own so cookies never leak into regular tests. After
+    # every test the guard is checked; a mutated or failed page is thrown
+    # away and the next test loads a fresh one.
+
+    def __init__(self, browser: Browser, context_options: dict, setup_context=None):
+        self.browser = browser
+        self.context_options = context_options
+        self.setup_context = setup_context
+        self.context = None
+        self.pages = {}
+        self.loads = 0
+        self.reuses = 0
+        self.discarded = 0
+
+    def _new_page(self, url: str, prepare) -> SharedPage:
+        if self.context is None:
+            self.context = self.browser.new_context(**self.context_options)
+            if self.setup_context is not None:
+                self.setup_context(self.context)
+        page = self.context.new_page()
+        page.goto(url)
+        if prepare is not None:
+            prepare(page)
+        self.loads += 1
+        return SharedPage(page)
+
+    def checkout(self, key, url: str, prepare=None) -> Page:
+        shared = self.pages.get(key)
+        if shared is None or shared.page.is_closed():
+            shared = self.pages[key] = self._new_page(url, prepare)
+        else:
+            self.reuses += 1
+        shared.tests += 1
+        return shared.page
+
+    def checkin(self, key, nodeid: str, failed: bool) -> list:
+        shared = self.pages.get(key)
+        if shared is None:
+            return []
+        reasons = shared.mutations()
+        if failed:
+            reasons.append("test failed")
+        if reasons:
+            logger.warning(f"Discarding shared page after {nodeid}: {'; '.join(reasons)}")
+            self.discarded += 1
+            del self.pages[key]
+            if not shared.page.is_closed():
+                shared.page.close()
+        return reasons
+
+    def stats(self) -> dict:
+        return {"loads": self.loads, "reuses": self.reuses, "discarded": self.discarded}
+
+    def close(self):
+        if self.context is not None:
+            self.context.close()
+        self.pages.clear()
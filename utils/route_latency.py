@@ -0,0 +1,187 @@
+import json
+import math
+import time
+import logging
+import threading
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    # Log-linear buckets with a fixed relative precision, in the spirit of
+    # HdrHistogram: constant memory, and two histograms merge by adding counts.
+    # Updates are locked: under --threads one histogram takes records from
+    # every test thread.
+
+    def __init__(self, precision: float = 0.01, counts: dict = None):
+        self.precision = precision
+        self.counts = counts or {}
+        self._log_base = math.log1p(precision)
+        self._lock = threading.Lock()
+
+    def record(self, value_ms: float):
+        index = int(math.log(max(value_ms, 0.001)) / self._log_base)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+
+    def merge(self, other: "LatencyHistogram"):
+        # Snapshot first; holding both locks at once could deadlock two
+        # histograms merging into each other
+        with other._lock:
+            counts = list(other.counts.items())
+        with self._lock:
+            for index, count in counts:
+                self.counts[index] = self.counts.get(index, 0) + count
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def percentile(self, percent: float) -> float:
+        total = self.total
+        if not total:
+            return 0.0
+        threshold = math.ceil(total * percent / 100)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= threshold:
+                return math.exp((index + 1) * self._log_base)
+        return math.exp((max(self.counts) + 1) * self._log_base)
+
+    def to_dict(self) -> dict:
+        return {"precision": self.precision, "counts": {str(k): v for k, v in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        return cls(data["precision"], {int(k): v for k, v in data["counts"].items()})
+
+
+def normalize_route(url: str) -> str:
+    parsed = urlparse(url)
+    route = parse_qs(parsed.query).get("route", [None])[0]
+    if route is None:
+        # The storefront root renders the home controller
+        return "common/home" if parsed.path in ("", "/", "/index.php") else None
+    # OpenCart 4 uses "|" as the method separator, older releases use "/"
+    return route.strip().lower().replace("|", ".")
+
+
+def parse_server_timing(header: str) -> dict:
+    metrics = {}
+    for entry in header.split(","):
+        parts = [part.strip() for part in entry.split(";")]
+        if not parts[0]:
+            continue
+        for part in parts[1:]:
+            if part.startswith("dur="):
+                try:
+                    metrics[parts[0]] = float(part[4:])
+                except ValueError:
+                    pass
+    return metrics
+
+
+class RouteLatencyCollector:
+
+    def __init__(self, origin: str):
+        self.origin = urlparse(origin).netloc
+        self.routes = {}
+
+    def _histogram(self, route: str, metric: str) -> LatencyHistogram:
+        return self.routes.setdefault(route, {}).setdefault(metric, LatencyHistogram())
+
+    def record(self, url: str, ttfb_ms: float, total_ms: float, server_timing: str = None):
+        if urlparse(url).netloc != self.origin:
+            return
+        route = normalize_route(url)
+        if route is None:
+            return
+        if ttfb_ms is not None and ttfb_ms >= 0:
+            self._histogram(route, "ttfb").record(ttfb_ms)
+        self._histogram(route, "total").record(total_ms)
+        if server_timing:
+            for name, duration in parse_server_timing(server_timing).items():
+                self._histogram(route, f"server.{name}").record(duration)
+
+    def merge(self, other: "RouteLatencyCollector"):
+        for route, metrics in other.routes.items():
+            for metric, histogram in metrics.items():
+                self._histogram(route, metric).merge(histogram)
+
+    def to_dict(self) -> dict:
+        return {
+            route: {metric: histogram.to_dict() for metric, histogram in metrics.items()}
+            for route, metrics in self.routes.items()
+        }
+
+    def load(self, data: dict):
+        for route, metrics in data.items():
+            for metric, histogram in metrics.items():
+                self._histogram(route, metric).merge(LatencyHistogram.from_dict(histogram))
+
+    def dump(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+
+    def percentiles(self) -> dict:
+        table = {}
+        for route, metrics in sorted(self.routes.items()):
+            table[route] = {
+                metric: {
+                    "count": histogram.total,
+                    "p50": round(histogram.percentile(50), 1),
+                    "p95": round(histogram.percentile(95), 1),
+                    "p99": round(histogram.percentile(99), 1),
+                }
+                for metric, histogram in sorted(metrics.items())
+            }
+        return table
+
+    def write_report(self, path, run_id: str):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "run": run_id,
+            "timestamp": time.time(),
+            "origin": self.origin,
+            "percentiles": self.percentiles(),
+            "histograms": self.to_dict(),
+        }
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info(f"Route latency report written: {path}")
+
+    def table_lines(self) -> list:
+        lines = [f"{'route':40} {'n':>5} {'ttfb p50':>9} {'p95':>8} {'p99':>8} {'total p50':>10} {'p95':>8} {'p99':>8}"]
+        for route, metrics in self.percentiles().items():
+            ttfb = metrics.get("ttfb", {"p50": 0, "p95": 0, "p99": 0})
+            total = metrics["total"]
+            lines.append(
+                f"{route[:40]:40} {total['count']:>5} {ttfb['p50']:>9} {ttfb['p95']:>8} {ttfb['p99']:>8} "
+                f"{total['p50']:>10} {total['p95']:>8} {total['p99']:>8}"
+            )
+        return lines
+
+
+_collector = None
+
+
+def get_collector(origin: str) -> RouteLatencyCollector:
+    global _collector
+    if _collector is None:
+        _collector = RouteLatencyCollector(origin)
+    return _collector
+
+
+def current_collector():
+    return _collector
+
+
+def merge_dumps(directory, origin: str, run_id: str) -> RouteLatencyCollector:
+    merged = RouteLatencyCollector(origin)
+    for path in sorted(Path(directory).glob(f"{run_id}-*.json")):
+        merged.load(json.loads(path.read_text(encoding="utf-8")))
+    return merged
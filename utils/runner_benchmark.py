@@ -0,0 +1,84 @@
+"""
+Runner benchmark: xdist workers vs threads
+Runs the suite serially, on N xdist worker processes and on N threads, and
+compares startup (launch to first test) and throughput, read back from the
+event stream of each run
+Usage: python -m utils.runner_benchmark [--workers 2 4] [--repeat 1] [-- pytest args]
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from statistics import median
+from utils import event_stream
+
+
+def run_suite(mode_args: list, pytest_args: list, events_dir: Path) -> dict:
+    command = [
+        sys.executable, "-m", "pytest", "-q",
+        "--events-dir", str(events_dir), *mode_args, *pytest_args,
+    ]
+    launched = time.time()
+    completed = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wall = time.time() - launched
+
+    starts, ends, tests = [], [], set()
+    for event in event_stream.iter_events(events_dir):
+        if event["type"] == "test_start":
+            starts.append(event["ts"])
+        elif event["type"] == "phase" and event["when"] == "teardown":
+            ends.append(event["ts"])
+            tests.add(event["nodeid"])
+    running = max(ends) - min(starts) if starts and ends else 0.0
+    return {
+        "exitstatus": completed.returncode,
+        "wall": wall,
+        "startup": min(starts) - launched if starts else wall,
+        "tests": len(tests),
+        "per_minute": len(tests) / running * 60 if running else 0.0,
+    }
+
+
+def measure(mode_args: list, pytest_args: list, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="runner-benchmark-") as directory:
+            runs.append(run_suite(mode_args, pytest_args, Path(directory)))
+    result = {key: median(run[key] for run in runs) for key in ("wall", "startup", "per_minute")}
+    result["tests"] = max(run["tests"] for run in runs)
+    result["exitstatus"] = max(run["exitstatus"] for run in runs)
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare xdist workers and --threads on the test suite")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4], help="worker/thread counts to compare")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per mode; the median is reported")
+    parser.add_argument("--no-serial", action="store_true", help="skip the single-process baseline")
+    parser.add_argument("pytest_args", nargs="*", help="passed to every pytest run (after --)")
+    args = parser.parse_args(argv)
+
+    modes = {} if args.no_serial else {"serial": []}
+    for count in args.workers:
+        modes[f"xdist -n {count}"] = ["-n", str(count)]
+        modes[f"--threads {count}"] = ["--threads", str(count)]
+
+    print(
+        f"{'mode':16} {'tests':>6} {'wall':>9} {'startup':>9} {'tests/min':>10}  "
+        f"(startup = launch to first test; tests/min between first start and last teardown)"
+    )
+    for label, mode_args in modes.items():
+        result = measure(mode_args, args.pytest_args, args.repeat)
+        note = "" if result["exitstatus"] in (0, 1) else f"  exit status {result['exitstatus']}"
+        print(
+            f"{label:16} {result['tests']:6} {result['wall']:8.1f}s {result['startup']:8.1f}s "
+            f"{result['per_minute']:10.1f}{note}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
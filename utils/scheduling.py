@@ -0,0 +1,84 @@
+import logging
+from statistics import median
+
+logger = logging.getLogger(__name__)
+
+
+DURATIONS_KEY = "playwright_demo/durations"
+
+# Broadest scope wins: tests sharing a module-scoped fixture must stay together
+# even if they also share a class-scoped one.
+GROUPING_SCOPES = ("class", "module", "package")
+
+
+def base_nodeid(nodeid: str) -> str:
+    # xdist --dist loadgroup appends "@<group>" to the nodeid
+    if nodeid.rfind("@") > nodeid.rfind("]"):
+        return nodeid.rsplit("@", 1)[0]
+    return nodeid
+
+
+def load_durations(config) -> dict:
+    # -p no:cacheprovider leaves no config.cache: no history, nothing saved
+    cache = getattr(config, "cache", None)
+    return cache.get(DURATIONS_KEY, {}) if cache is not None else {}
+
+
+def save_durations(config, observed: dict, smoothing: float = 0.5):
+    if getattr(config, "cache", None) is None:
+        return
+    durations = load_durations(config)
+    for nodeid, duration in observed.items():
+        previous = durations.get(nodeid)
+        if previous is None:
+            durations[nodeid] = round(duration, 3)
+        else:
+            durations[nodeid] = round(smoothing * duration + (1 - smoothing) * previous, 3)
+    config.cache.set(DURATIONS_KEY, durations)
+    logger.info(f"Stored duration history for {len(observed)} tests")
+
+
+def scope_group(item) -> str:
+    fixtureinfo = getattr(item, "_fixtureinfo", None)
+    broadest = None
+    if fixtureinfo is not None:
+        for fixturedefs in fixtureinfo.name2fixturedefs.values():
+            scope = fixturedefs[-1].scope
+            if scope in GROUPING_SCOPES:
+                if broadest is None or GROUPING_SCOPES.index(scope) > GROUPING_SCOPES.index(broadest):
+                    broadest = scope
+
+    module_id = item.nodeid.split("::")[0]
+    readonly = item.get_closest_marker("readonly_page")
+    if readonly is not None and broadest != "package":
+        # Tests sharing a read-only page load it once per worker
+        url = readonly.kwargs.get("url", readonly.args[0] if readonly.args else "")
+        return f"{module_id}::readonly:{url}"
+    if broadest == "package":
+        return module_id.rsplit("/", 1)[0] if "/" in module_id else module_id
+    if broadest == "module":
+        return module_id
+    if broadest == "class" and item.cls is not None:
+        return item.nodeid.rsplit("::", 1)[0]
+    return item.nodeid
+
+
+def group_items(items) -> dict:
+    groups = {}
+    for item in items:
+        groups.setdefault(scope_group(item), []).append(item)
+    return groups
+
+
+def order_longest_first(items, durations: dict) -> list:
+    known = [durations[item.nodeid] for item in items if item.nodeid in durations]
+    fallback = median(known) if known else 0.0
+
+    groups = group_items(items)
+    totals = {
+        key: sum(durations.get(item.nodeid, fallback) for item in members)
+        for key, members in groups.items()
+    }
+    ordered = sorted(groups, key=lambda key: totals[key], reverse=True)
+    logger.info(f"Ordered {len(groups)} scheduling groups longest-first")
+    return [item for key in ordered for item in groups[key]]
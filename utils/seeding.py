@@ -0,0 +1,194 @@
+"""
+Account seeding
+Creates a fresh customer and fills its order history, wish list and address
+book over plain HTTP, several sessions in parallel
+Usage: python -m utils.seeding [--orders 12] [--wishlist 3] [--addresses 2]
+"""
+
+import sys
+import time
+import uuid
+import logging
+import argparse
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from utils.checkout_session import CheckoutFastForward, CheckoutSetupError, DEFAULT_ADDRESS
+
+logger = logging.getLogger(__name__)
+
+
+SEED_PASSWORD = "Seed-123456"
+
+
+class SessionRequest:
+    # The slice of Playwright's APIRequestContext that CheckoutFastForward
+    # uses, over a requests.Session so each thread keeps its connection alive
+
+    def __init__(self, session: requests.Session, timeout: float):
+        self.session = session
+        self.timeout = timeout
+
+    def get(self, url: str):
+        return SessionResponse(self.session.get(url, timeout=self.timeout))
+
+    def post(self, url: str, form: dict):
+        return SessionResponse(self.session.post(url, data=form, timeout=self.timeout))
+
+
+class SessionResponse:
+
+    def __init__(self, response: requests.Response):
+        self.response = response
+        self.ok = response.ok
+        self.status = response.status_code
+        self.url = response.url
+
+    def json(self):
+        return self.response.json()
+
+    def text(self) -> str:
+        return self.response.text
+
+
+class SeedSession(CheckoutFastForward):
+
+    def register(self, account: dict):
+        response = self._check("account/register", self.request.post(self._url("account/register"), form={
+            "firstname": account["firstname"],
+            "lastname": account["lastname"],
+            "email": account["email"],
+            "telephone": account["telephone"],
+            "password": account["password"],
+            "confirm": account["password"],
+            "newsletter": "0",
+            "agree": "1",
+        }))
+        if "route=account/success" not in response.url:
+            raise CheckoutSetupError(f"Registering {account['email']} failed (ended on {response.url})")
+
+    def add_address(self, address: dict):
+        response = self._check(
+            "account/address/add",
+            self.request.post(self._url("account/address/add"), form={**address, "default": "0"}),
+        )
+        # A saved address redirects to the book; a rejected one re-renders the form
+        if "route=account/address/add" in response.url:
+            raise CheckoutSetupError(f"Address {address['address_1']} was rejected")
+
+    def add_to_wishlist(self, product_id: int):
+        self._post_json("account/wishlist/add", {"product_id": str(product_id)})
+
+    def place_order(self, product_id: int, shipping_method: str = "flat.flat", payment_method: str = "cod"):
+        self.add_to_cart(product_id)
+        self.set_addresses(DEFAULT_ADDRESS)
+        self.choose_shipping(shipping_method)
+        self.choose_payment(payment_method)
+        self.confirm_order(payment_method)
+
+
+class Seeder:
+    # Wish-list entries and addresses are plain inserts and go out over
+    # several logged-in sessions at once. Orders cannot: OpenCart moves a
+    # customer's cart to whichever of their sessions made the latest request,
+    # so concurrent checkouts for one account would steal each other's carts.
+    # They run back to back in one kept-alive session instead, after the
+    # parallel phase.
+
+    def __init__(self, base_url: str, workers: int = 8, timeout: float = 30):
+        self.base_url = base_url
+        self.workers = workers
+        self.timeout = timeout
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="seed")
+
+    def _new_session(self) -> SeedSession:
+        session = requests.Session()
+        session.headers["User-Agent"] = "playwright-demo-seeder"
+        with self._lock:
+            self._sessions.append(session)
+        return SeedSession(SessionRequest(session, self.timeout), self.base_url)
+
+    def _client(self, account: dict) -> SeedSession:
+        client = getattr(self._local, "client", None)
+        if client is None or self._local.email != account["email"]:
+            client = self._local.client = self._new_session()
+            self._local.email = account["email"]
+            client.login(account["email"], account["password"])
+        return client
+
+    def create_account(self, prefix: str = "seed") -> dict:
+        account = {
+            "firstname": "Seed",
+            "lastname": "Customer",
+            "email": f"{prefix}-{uuid.uuid4().hex[:12]}@example.com",
+            "telephone": "5550100",
+            "password": SEED_PASSWORD,
+        }
+        self._new_session().register(account)
+        logger.info(f"Registered seed account {account['email']}")
+        return account
+
+    def _run(self, tasks: list):
+        for future in [self._pool.submit(task) for task in tasks]:
+            future.result()
+
+    def seed(self, account: dict, orders: int = 0, wishlist: list = (), addresses: int = 0,
+             order_product_id: int = None) -> dict:
+        started = time.monotonic()
+        # Orders need an address on file; seeding it up front keeps the final
+        # address count exact because checkout then reuses it
+        addresses = max(addresses, 1 if orders else 0)
+        self._run(
+            [
+                lambda index=index: self._client(account).add_address(
+                    {**DEFAULT_ADDRESS, "address_1": f"{index + 1} Seed Street"}
+                )
+                for index in range(addresses)
+            ]
+            + [lambda product_id=product_id: self._client(account).add_to_wishlist(product_id) for product_id in wishlist]
+        )
+        client = self._client(account)
+        for _ in range(orders):
+            client.place_order(order_product_id)
+        seeded = {"orders": orders, "wishlist": len(wishlist), "addresses": addresses}
+        logger.info(
+            f"Seeded {seeded} for {account['email']} in {time.monotonic() - started:.1f}s "
+            f"over {len(self._sessions)} sessions"
+        )
+        return seeded
+
+    def close(self):
+        self._pool.shutdown()
+        for session in self._sessions:
+            session.close()
+        self._sessions.clear()
+
+
+def main(argv=None) -> int:
+    from config import BASE_URL, CHECKOUT_PRODUCT_ID, SEED_PRODUCT_IDS, SEED_WORKERS
+
+    parser = argparse.ArgumentParser(description="Create a customer with seeded history for manual or perf checks")
+    parser.add_argument("--orders", type=int, default=12)
+    parser.add_argument("--wishlist", type=int, default=3)
+    parser.add_argument("--addresses", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=SEED_WORKERS)
+    args = parser.parse_args(argv)
+
+    if args.wishlist > len(SEED_PRODUCT_IDS):
+        parser.error(f"--wishlist can be at most {len(SEED_PRODUCT_IDS)} (SEED_PRODUCT_IDS)")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    seeder = Seeder(BASE_URL, workers=args.workers)
+    try:
+        account = seeder.create_account()
+        seeder.seed(account, args.orders, SEED_PRODUCT_IDS[:args.wishlist], args.addresses, CHECKOUT_PRODUCT_ID)
+    finally:
+        seeder.close()
+    print(f"{account['email']} / {account['password']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
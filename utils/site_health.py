@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import logging
+import urllib.error
+import urllib.request
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from playwright.sync_api import Error, TimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+# Playwright errors that mean the shop did not answer, as opposed to a
+# locator or assertion problem in the test itself
+SITE_ERROR_MARKERS = ("net::ERR_", "NS_ERROR_", "NS_BINDING_ABORTED", "Navigation failed", "ERR_CONNECTION")
+
+
+class ProbeResult:
+
+    def __init__(self, url: str, status: int = None, elapsed_ms: float = 0.0, error: str = None):
+        self.url = url
+        self.status = status
+        self.elapsed_ms = elapsed_ms
+        self.error = error
+
+    @property
+    def healthy(self) -> bool:
+        # 4xx still proves the storefront is up and routing requests
+        return self.error is None and self.status is not None and self.status < 500
+
+    def describe(self) -> str:
+        outcome = f"HTTP {self.status}" if self.status is not None else self.error
+        return f"{self.url}: {outcome} in {self.elapsed_ms:.0f}ms"
+
+    def as_dict(self) -> dict:
+        return {"url": self.url, "status": self.status, "elapsed_ms": round(self.elapsed_ms, 1), "error": self.error}
+
+
+def probe(url: str, timeout: float) -> ProbeResult:
+    request = urllib.request.Request(url, headers={"User-Agent": "playwright-demo-health-check"})
+    started = time.monotonic()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read(1024)
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception as e:
+        return ProbeResult(url, elapsed_ms=(time.monotonic() - started) * 1000, error=f"{type(e).__name__}: {e}")
+    return ProbeResult(url, status, (time.monotonic() - started) * 1000)
+
+
+def probe_all(base_url: str, routes: list, timeout: float) -> list:
+    urls = [f"{base_url}/index.php?route={route}" for route in routes]
+    with ThreadPoolExecutor(max_workers=len(urls) or 1) as pool:
+        return list(pool.map(lambda url: probe(url, timeout), urls))
+
+
+def is_site_failure(excinfo) -> bool:
+    if excinfo is None:
+        return False
+    if excinfo.errisinstance(TimeoutError):
+        return True
+    return excinfo.errisinstance(Error) and any(marker in str(excinfo.value) for marker in SITE_ERROR_MARKERS)
+
+
+class CircuitBreaker:
+    # Counts consecutive navigation/timeout failures in this process. At the
+    # threshold the key routes are probed: if the shop is really unhealthy
+    # the breaker opens for every worker by writing a trip file, otherwise
+    # the failures are the tests' own and the count starts over.
+
+    def __init__(self, directory, run_id: str, base_url: str, routes: list,
+                 threshold: int, probe_timeout: float):
+        self.trip_file = Path(directory) / f"{run_id}.json"
+        self.base_url = base_url
+        self.routes = routes
+        self.threshold = threshold
+        self.probe_timeout = probe_timeout
+        self.consecutive = 0
+        self.recent = []
+
+    def observe(self, nodeid: str, passed: bool, site_failure: bool):
+        if passed:
+            self.consecutive = 0
+            return
+        if not site_failure:
+            return
+        self.consecutive += 1
+        self.recent = (self.recent + [nodeid])[-self.threshold:]
+        if self.consecutive >= self.threshold and not self.is_open():
+            self._confirm()
+
+    def _confirm(self):
+        results = probe_all(self.base_url, self.routes, self.probe_timeout)
+        if all(result.healthy for result in results):
+            logger.warning(
+                f"{self.consecutive} consecutive navigation/timeout failures but the site answers; "
+                f"not tripping the circuit breaker"
+            )
+            self.consecutive = 0
+            return
+        self.trip(f"{self.consecutive} consecutive navigation/timeout failures", results, self.recent)
+
+    def trip(self, reason: str, results: list, failed_tests: list = ()):
+        self.trip_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.trip_file.with_name(f"{self.trip_file.stem}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({
+            "reason": reason,
+            "timestamp": time.time(),
+            "probes": [result.as_dict() for result in results],
+            "failed_tests": list(failed_tests),
+        }, indent=2), encoding="utf-8")
+        tmp.replace(self.trip_file)
+        logger.error(f"Circuit breaker open, site unavailable: {reason}")
+
+    def is_open(self) -> bool:
+        return self.trip_file.exists()
+
+    def state(self) -> dict:
+        try:
+            return json.loads(self.trip_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+
+def summary_lines(state: dict, skipped: int) -> list:
+    lines = [f"Site unavailable: {state.get('reason', 'circuit breaker open')}"]
+    for result in state.get("probes", []):
+        outcome = f"HTTP {result['status']}" if result["status"] is not None else result["error"]
+        lines.append(f"  {result['url']}: {outcome} in {result['elapsed_ms']:.0f}ms")
+    if state.get("failed_tests"):
+        lines.append("  tripped by: " + ", ".join(state["failed_tests"]))
+    if skipped:
+        lines.append(f"  {skipped} remaining tests were skipped")
+    return lines
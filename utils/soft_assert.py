@@ -0,0 +1,222 @@
+import re
+import time
+import logging
+from contextlib import contextmanager
+from playwright.sync_api import Page, Locator, Error, expect
+from utils.locator_resolver import RESOLVER_SOURCE, compile_locator, selector_of
+
+logger = logging.getLogger(__name__)
+
+
+# Same back-off Playwright's own expect() uses between retries
+POLL_INTERVALS_MS = [100, 250, 500, 1000]
+
+PROBE_EXPRESSION = "(args) => {" + RESOLVER_SOURCE + """
+  const shadow = hasOpenShadowRoots();
+  const probe = (steps) => {
+    if (shadow) return { error: 'open shadow roots' };
+    try {
+      const elements = resolve(steps);
+      const first = elements[0];
+      return {
+        count: elements.length,
+        visible: isVisible(first),
+        text: first ? first.textContent : null,
+        value: first && 'value' in first ? String(first.value) : null,
+      };
+    } catch (e) {
+      return { error: String(e) };
+    }
+  };
+  return { title: document.title, results: args.map(probe) };
+}"""
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def _text_matches(expected, actual, contains: bool, ignore_case: bool) -> bool:
+    if actual is None:
+        return False
+    if isinstance(expected, re.Pattern):
+        return expected.search(actual) is not None
+    expected, actual = _normalize(expected), _normalize(actual)
+    if ignore_case:
+        expected, actual = expected.lower(), actual.lower()
+    return expected in actual if contains else expected == actual
+
+
+class SoftCheck:
+
+    def __init__(self, kind: str, description: str, verify, locator: Locator = None, **expected):
+        self.kind = kind
+        self.description = description
+        self.locator = locator
+        self.expected = expected
+        # Only plain CSS locators are batched; the rest go through expect()
+        self.steps = compile_locator(locator) if locator is not None else None
+        self.actual = None
+        # Playwright's own assertion, used for locators that are not plain
+        # CSS and to confirm anything still failing at the deadline
+        self.verify = verify
+
+    @property
+    def batched(self) -> bool:
+        return self.locator is None or self.steps is not None
+
+    def evaluate(self, page: Page, title: str, result: dict) -> bool:
+        if self.kind == "url":
+            self.actual = page.url
+            return _text_matches(self.expected["url"], page.url, False, False)
+        if self.kind == "title":
+            self.actual = title
+            return _text_matches(self.expected["title"], title, False, False)
+
+        count = result["count"]
+        if self.kind == "count":
+            self.actual = count
+            return count == self.expected["count"]
+        if count > 1:
+            self.actual = f"strict mode violation: resolved to {count} elements"
+            return False
+        if self.kind == "visible":
+            self.actual = "visible" if result["visible"] else ("hidden" if count else "not found")
+            return result["visible"]
+        if self.kind == "hidden":
+            self.actual = "visible" if result["visible"] else "hidden"
+            return not result["visible"]
+        if self.kind == "text":
+            self.actual = result["text"]
+            return _text_matches(self.expected["text"], result["text"], self.expected["contains"],
+                                 self.expected["ignore_case"])
+        if self.kind == "value":
+            self.actual = result["value"]
+            return _text_matches(self.expected["value"], result["value"], False, False)
+        raise ValueError(f"unknown soft check {self.kind}")
+
+
+class SoftAssertGroup:
+    # Collects expectations and checks them together: every poll is one
+    # page.evaluate that probes all still-failing checks, so N expectations
+    # cost one round trip per retry instead of N polling loops. All failures
+    # are reported in a single AssertionError.
+
+    def __init__(self, page: Page, timeout: int = 5000):
+        self.page = page
+        self.timeout = timeout
+        self.checks = []
+        self.polls = 0
+
+    def _add(self, kind: str, description: str, verify, locator: Locator = None, **expected):
+        self.checks.append(SoftCheck(kind, description, verify, locator, **expected))
+        return self
+
+    @staticmethod
+    def _describe(locator: Locator) -> str:
+        try:
+            return selector_of(locator)
+        except AttributeError:
+            return repr(locator)
+
+    def to_be_visible(self, locator: Locator):
+        return self._add("visible", f"{self._describe(locator)} to be visible",
+                         lambda timeout: expect(locator).to_be_visible(timeout=timeout), locator)
+
+    def to_be_hidden(self, locator: Locator):
+        return self._add("hidden", f"{self._describe(locator)} to be hidden",
+                         lambda timeout: expect(locator).to_be_hidden(timeout=timeout), locator)
+
+    def to_have_text(self, locator: Locator, text, ignore_case: bool = False):
+        return self._add(
+            "text", f"{self._describe(locator)} to have text {text!r}",
+            lambda timeout: expect(locator).to_have_text(text, ignore_case=ignore_case, timeout=timeout),
+            locator, text=text, contains=False, ignore_case=ignore_case,
+        )
+
+    def to_contain_text(self, locator: Locator, text, ignore_case: bool = False):
+        return self._add(
+            "text", f"{self._describe(locator)} to contain text {text!r}",
+            lambda timeout: expect(locator).to_contain_text(text, ignore_case=ignore_case, timeout=timeout),
+            locator, text=text, contains=True, ignore_case=ignore_case,
+        )
+
+    def to_have_value(self, locator: Locator, value):
+        return self._add("value", f"{self._describe(locator)} to have value {value!r}",
+                         lambda timeout: expect(locator).to_have_value(value, timeout=timeout),
+                         locator, value=value)
+
+    def to_have_count(self, locator: Locator, count: int):
+        return self._add("count", f"{self._describe(locator)} to have count {count}",
+                         lambda timeout: expect(locator).to_have_count(count, timeout=timeout),
+                         locator, count=count)
+
+    def to_have_url(self, url):
+        return self._add("url", f"page to have URL {url!r}",
+                         lambda timeout: expect(self.page).to_have_url(url, timeout=timeout), url=url)
+
+    def to_have_title(self, title):
+        return self._add("title", f"page to have title {title!r}",
+                         lambda timeout: expect(self.page).to_have_title(title, timeout=timeout), title=title)
+
+    def _poll(self, pending: list) -> list:
+        probed = [check for check in pending if check.locator is not None]
+        try:
+            snapshot = self.page.evaluate(PROBE_EXPRESSION, [check.steps for check in probed])
+        except Error as e:
+            # A navigation tore down the context mid-evaluate; retry next poll
+            logger.debug(f"Soft assertion poll interrupted: {e}")
+            return pending
+        self.polls += 1
+
+        results = dict(zip(map(id, probed), snapshot["results"]))
+        still_failing = []
+        for check in pending:
+            result = results.get(id(check))
+            if result is not None and "error" in result:
+                # A CSS selector the browser rejects, or shadow DOM that
+                # querySelectorAll cannot see; Playwright decides
+                check.steps = None
+                continue
+            if not check.evaluate(self.page, snapshot["title"], result):
+                still_failing.append(check)
+        return still_failing
+
+    def verify(self):
+        deadline = time.monotonic() + self.timeout / 1000
+        pending = [check for check in self.checks if check.batched]
+        attempt = 0
+        while pending:
+            pending = self._poll(pending)
+            if not pending or time.monotonic() >= deadline:
+                break
+            interval = POLL_INTERVALS_MS[min(attempt, len(POLL_INTERVALS_MS) - 1)] / 1000
+            time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+            attempt += 1
+
+        # Unbatched checks get whatever time is left; failing batched checks
+        # get a last authoritative look before they are reported
+        remaining_ms = lambda: max(int((deadline - time.monotonic()) * 1000), 1)
+        unbatched = [check for check in self.checks if not check.batched]
+        failures = []
+        for check in unbatched + pending:
+            try:
+                check.verify(remaining_ms() if check in unbatched else 1)
+            except AssertionError as e:
+                failures.append((check, str(e).strip().splitlines()[0]))
+
+        logger.debug(
+            f"Soft assertions: {len(self.checks)} checks, {self.polls} batched polls, "
+            f"{len(unbatched)} via expect(), {len(failures)} failed"
+        )
+        if failures:
+            lines = [f"{len(failures)} of {len(self.checks)} soft assertions failed:"]
+            lines += [f"  - expected {check.description}: {message}" for check, message in failures]
+            raise AssertionError("\n".join(lines))
+
+
+@contextmanager
+def soft_assertions(page: Page, timeout: int = 5000):
+    group = SoftAssertGroup(page, timeout)
+    yield group
+    group.verify()
@@ -0,0 +1,172 @@
+import json
+import logging
+from playwright.sync_api import BrowserContext
+from utils.route_latency import LatencyHistogram
+from utils.adaptive_timeouts import HISTORY_DECAY
+
+logger = logging.getLogger(__name__)
+
+
+HISTORY_KEY = "playwright_demo/stabilization_waits"
+
+MODES = ("baseline", "stabilized")
+
+# Actions need this many samples in both modes before they are compared
+MIN_SAMPLES = 5
+
+CONTEXT_OPTIONS = {"reduced_motion": "reduce"}
+
+# Animations are cut to zero length rather than removed, so elements that
+# fade in still end in their visible state. Carousels lose their autoplay,
+# jQuery effects (dropdowns, slide-in alerts) finish instantly, and known
+# overlays are hidden before they can intercept clicks.
+STABILIZATION_SCRIPT = """((overlays) => {
+  if (window.__stabilized) return;
+  window.__stabilized = true;
+
+  const css = `*, *::before, *::after {
+    transition: none !important;
+    animation-duration: 0s !important;
+    animation-delay: 0s !important;
+    animation-iteration-count: 1 !important;
+    scroll-behavior: auto !important;
+    caret-color: transparent !important;
+  }` + (overlays.length ? `\\n${overlays.join(', ')} { display: none !important; }` : '');
+  const addStyle = () => {
+    const style = document.createElement('style');
+    style.textContent = css;
+    (document.head || document.documentElement).appendChild(style);
+  };
+  if (document.documentElement) addStyle();
+  else document.addEventListener('readystatechange', addStyle, { once: true });
+
+  document.addEventListener('DOMContentLoaded', () => {
+    if (window.jQuery) window.jQuery.fx.off = true;
+    // Bootstrap starts data-ride carousels on window load
+    for (const el of document.querySelectorAll('[data-ride="carousel"]')) {
+      el.removeAttribute('data-ride');
+      el.setAttribute('data-interval', 'false');
+    }
+  });
+
+  const freeze = () => {
+    if (window.jQuery && window.jQuery.fn.carousel) window.jQuery('.carousel').carousel('pause');
+    for (const el of document.querySelectorAll('.swiper-container, .swiper')) {
+      if (el.swiper && el.swiper.autoplay) el.swiper.autoplay.stop();
+    }
+  };
+  window.addEventListener('load', () => { freeze(); setTimeout(freeze, 500); });
+})"""
+
+
+class WaitComparison:
+    # Times every page-object action by whether its page had the
+    # stabilization pack, so a run with the pack can be compared with the
+    # baseline learned from runs (or opted-out tests) without it.
+
+    def __init__(self, history: dict):
+        self.history = {
+            mode: {action: LatencyHistogram.from_dict(data) for action, data in history.get(mode, {}).items()}
+            for mode in MODES
+        }
+        self.observed = {mode: {} for mode in MODES}
+
+    def observe(self, page, action: str, elapsed_ms: float):
+        context = getattr(page, "context", None)
+        mode = "stabilized" if getattr(context, "stabilized", False) else "baseline"
+        self.observed[mode].setdefault(action, LatencyHistogram()).record(elapsed_ms)
+
+    def observed_dict(self) -> dict:
+        return {
+            mode: {action: histogram.to_dict() for action, histogram in actions.items()}
+            for mode, actions in self.observed.items()
+        }
+
+    def merge_observed(self, data: dict):
+        for mode, actions in data.items():
+            for action, histogram in actions.items():
+                self.observed[mode].setdefault(action, LatencyHistogram()).merge(LatencyHistogram.from_dict(histogram))
+
+    def combined(self) -> dict:
+        combined = {mode: {} for mode in MODES}
+        for source in (self.history, self.observed):
+            for mode, actions in source.items():
+                for action, histogram in actions.items():
+                    combined[mode].setdefault(action, LatencyHistogram()).merge(histogram)
+        return combined
+
+    def summary_lines(self) -> list:
+        combined = self.combined()
+        compared = sorted(
+            action for action, histogram in combined["stabilized"].items()
+            if histogram.total >= MIN_SAMPLES
+            and combined["baseline"].get(action, LatencyHistogram()).total >= MIN_SAMPLES
+        )
+        if not compared:
+            return []
+        lines = [f"{'action':50} {'baseline p50':>12} {'stable p50':>10} {'saved':>8}"]
+        total_saved = 0.0
+        for action in compared:
+            baseline = combined["baseline"][action].percentile(50)
+            stabilized = combined["stabilized"][action].percentile(50)
+            total_saved += baseline - stabilized
+            lines.append(
+                f"{action[-50:]:50} {baseline:>10.0f}ms {stabilized:>8.0f}ms {baseline - stabilized:>6.0f}ms"
+            )
+        lines.append(f"Mean time saved per action: {total_saved / len(compared):.0f}ms over {len(compared)} actions")
+        return lines
+
+
+class Stabilization:
+
+    def __init__(self, enabled: bool, overlays: list, history: dict):
+        self.enabled = enabled
+        self.overlays = overlays
+        self.comparison = WaitComparison(history)
+
+    def context_options(self, opted_out: bool = False) -> dict:
+        return CONTEXT_OPTIONS if self.enabled and not opted_out else {}
+
+    def install(self, context: BrowserContext, opted_out: bool = False):
+        context.stabilized = self.enabled and not opted_out
+        if context.stabilized:
+            context.add_init_script(f"{STABILIZATION_SCRIPT}({json.dumps(self.overlays)})")
+
+
+_stabilization = None
+
+
+def configure(config, enabled: bool, overlays: list) -> Stabilization:
+    global _stabilization
+    cache = getattr(config, "cache", None)
+    _stabilization = Stabilization(enabled, overlays, cache.get(HISTORY_KEY, {}) if cache is not None else {})
+    return _stabilization
+
+
+def current():
+    return _stabilization
+
+
+def save_history(config, comparison: WaitComparison):
+    if getattr(config, "cache", None) is None:
+        return
+    history = {}
+    for mode in MODES:
+        # Decayed copies: the comparison still reports this run's summary
+        # from its own history and observations afterwards
+        actions = {
+            action: LatencyHistogram(histogram.precision, {
+                index: round(count * HISTORY_DECAY, 3)
+                for index, count in histogram.counts.items()
+                if count * HISTORY_DECAY >= 0.01
+            })
+            for action, histogram in comparison.history[mode].items()
+        }
+        for action, histogram in comparison.observed[mode].items():
+            actions.setdefault(action, LatencyHistogram()).merge(histogram)
+        history[mode] = {action: histogram.to_dict() for action, histogram in actions.items() if histogram.counts}
+    config.cache.set(HISTORY_KEY, history)
+    logger.info(
+        f"Stored stabilization wait history for {sum(len(actions) for actions in comparison.observed.values())} "
+        f"action/mode pairs"
+    )
@@ -0,0 +1,250 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from email.utils import parsedate_to_datetime
+from playwright.sync_api import BrowserContext, Route
+
+logger = logging.getLogger(__name__)
+
+
+STATIC_ASSET_PATTERN = re.compile(
+    r"\.(css|js|mjs|woff2?|ttf|otf|eot|png|jpe?g|gif|svg|webp|avif|ico)(\?|#|$)", re.IGNORECASE
+)
+
+# Bodies from route.fetch() are already decoded, so length/encoding headers
+# from the origin no longer describe what we fulfil with.
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fresh_until REAL NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_hash ON entries(hash);
+CREATE INDEX IF NOT EXISTS entries_access ON entries(last_access);
+CREATE TABLE IF NOT EXISTS run_stats (
+    run TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    hits INTEGER NOT NULL,
+    revalidated INTEGER NOT NULL,
+    misses INTEGER NOT NULL,
+    bytes_saved INTEGER NOT NULL
+);
+"""
+
+
+def freshness_lifetime(headers: dict, default_ttl: float):
+    # Returns None when the response must not be stored at all
+    cache_control = headers.get("cache-control", "").lower()
+    directives = [directive.strip() for directive in cache_control.split(",") if directive.strip()]
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for directive in directives:
+        if directive.startswith("s-maxage=") or directive.startswith("max-age="):
+            try:
+                return float(directive.split("=", 1)[1])
+            except ValueError:
+                return 0.0
+    if "expires" in headers:
+        try:
+            return max(parsedate_to_datetime(headers["expires"]).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+    return default_ttl
+
+
+class StaticAssetCache:
+    # Serves static assets for every context from one content-addressed disk
+    # cache. The SQLite index (WAL) arbitrates between xdist workers; bodies
+    # are written once per hash via write-then-rename.
+
+    def __init__(self, directory, max_bytes: int, default_ttl: float = 3600):
+        self.directory = Path(directory)
+        self.blob_dir = self.directory / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.db = sqlite3.connect(str(self.directory / "index.sqlite"), timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def install(self, context: BrowserContext):
+        context.route(STATIC_ASSET_PATTERN, self.handle)
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def handle(self, route: Route):
+        request = route.request
+        if request.method != "GET":
+            route.fallback()
+            return
+
+        row = self.db.execute(
+            "SELECT hash, status, headers, etag, last_modified, fresh_until, size FROM entries WHERE url = ?",
+            (request.url,),
+        ).fetchone()
+        if row is not None and not self.blob_path(row[0]).exists():
+            row = None
+
+        if row is not None and row[5] > time.time():
+            self.hits += 1
+            self.bytes_saved += row[6]
+            self._touch(request.url)
+            self._fulfill(route, row)
+            return
+
+        headers = dict(request.headers)
+        if row is not None:
+            if row[3]:
+                headers["if-none-match"] = row[3]
+            if row[4]:
+                headers["if-modified-since"] = row[4]
+
+        try:
+            response = route.fetch(headers=headers)
+        except Exception as e:
+            logger.warning(f"Static cache fetch failed for {request.url}: {e}")
+            route.fallback()
+            return
+
+        if response.status == 304 and row is not None:
+            self.revalidated += 1
+            self.bytes_saved += row[6]
+            lifetime = freshness_lifetime(response.headers, self.default_ttl) or 0.0
+            self.db.execute(
+                "UPDATE entries SET fresh_until = ?, last_access = ? WHERE url = ?",
+                (time.time() + lifetime, time.time(), request.url),
+            )
+            self.db.commit()
+            self._fulfill(route, row)
+            return
+
+        self.misses += 1
+        body = response.body()
+        route.fulfill(response=response, body=body, headers=self._stored_headers(response.headers))
+        if response.status == 200:
+            self._store(request.url, response.headers, body)
+
+    def _stored_headers(self, headers: dict) -> dict:
+        return {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS}
+
+    def _fulfill(self, route: Route, row):
+        digest, status, headers = row[0], row[1], json.loads(row[2])
+        route.fulfill(status=status, headers=headers, body=self.blob_path(digest).read_bytes())
+
+    def _touch(self, url: str):
+        self.db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+        self.db.commit()
+
+    def _store(self, url: str, headers: dict, body: bytes):
+        lifetime = freshness_lifetime(headers, self.default_ttl)
+        if lifetime is None or len(body) > self.max_bytes:
+            return
+
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{digest}.{os.getpid()}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, path)
+
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, digest, 200, json.dumps(self._stored_headers(headers)), headers.get("etag"),
+             headers.get("last-modified"), now + lifetime, len(body), now),
+        )
+        self.db.commit()
+        self.evict()
+
+    def total_bytes(self) -> int:
+        # Identical bodies served from several URLs are stored once
+        (total,) = self.db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT hash, MAX(size) AS size FROM entries GROUP BY hash)"
+        ).fetchone()
+        return total
+
+    def evict(self):
+        if self.total_bytes() <= self.max_bytes:
+            return
+        removed = 0
+        for url, digest in self.db.execute(
+            "SELECT url, hash FROM entries ORDER BY last_access"
+        ).fetchall():
+            self.db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            still_used = self.db.execute("SELECT 1 FROM entries WHERE hash = ? LIMIT 1", (digest,)).fetchone()
+            if still_used is None:
+                self.blob_path(digest).unlink(missing_ok=True)
+            removed += 1
+            if self.total_bytes() <= self.max_bytes:
+                break
+        self.db.commit()
+        logger.info(f"Static cache evicted {removed} least recently used entries")
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def record_run(self, run: str, worker: str):
+        self.db.execute(
+            "INSERT INTO run_stats VALUES (?, ?, ?, ?, ?, ?)",
+            (run, worker, self.hits, self.revalidated, self.misses, self.bytes_saved),
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+def run_summary(directory, run: str) -> dict:
+    index = Path(directory) / "index.sqlite"
+    if not index.exists():
+        return {}
+    db = sqlite3.connect(str(index), timeout=30)
+    try:
+        row = db.execute(
+            "SELECT COALESCE(SUM(hits), 0), COALESCE(SUM(revalidated), 0), COALESCE(SUM(misses), 0), "
+            "COALESCE(SUM(bytes_saved), 0), COUNT(*) FROM run_stats WHERE run = ?",
+            (run,),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return {}
+    finally:
+        db.close()
+    hits, revalidated, misses, bytes_saved, workers = row
+    if not workers:
+        return {}
+    requests = hits + revalidated + misses
+    return {
+        "requests": requests,
+        "hits": hits,
+        "revalidated": revalidated,
+        "misses": misses,
+        "hit_rate": (hits + revalidated) / requests if requests else 0.0,
+        "bytes_saved": bytes_saved,
+    }
@@ -0,0 +1,157 @@
+import html
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class RunRecord:
+
+    def __init__(self, nodeid: str, worker: str):
+        self.nodeid = nodeid
+        self.worker = worker
+        self.outcome = "running"
+        self.duration = 0.0
+        self.started = None
+        self.message = ""
+        self.actions = 0
+        self.artifacts = []
+        self.network = None
+
+
+class RunState:
+    # Folds the event stream into per-test records. Events from any number
+    # of workers, shards or runs may be interleaved.
+
+    def __init__(self):
+        self.tests = {}
+        self.collected = {}
+        self.finished = []
+
+    def feed(self, event: dict):
+        event_type = event["type"]
+        if event_type == "collection":
+            run = event["run"]
+            self.collected[run] = max(self.collected.get(run, 0), event["count"])
+            return None
+
+        nodeid = event.get("nodeid")
+        if nodeid is None:
+            return None
+        key = (event["run"], nodeid)
+        record = self.tests.get(key)
+        if record is None:
+            record = self.tests[key] = RunRecord(nodeid, event["worker"])
+            record.started = event["ts"]
+
+        if event_type == "action":
+            record.actions += 1
+        elif event_type == "artifact":
+            record.artifacts.append(event)
+        elif event_type == "network":
+            record.network = event
+        elif event_type == "phase":
+            record.duration += event.get("duration", 0.0)
+            outcome = event["outcome"]
+            if outcome == "failed":
+                record.outcome = "failed" if event["when"] == "call" else "error"
+                record.message = event.get("message", "")
+            elif outcome == "skipped" and record.outcome == "running":
+                record.outcome = "skipped"
+                record.message = event.get("message", "")
+            elif event["when"] == "call" and record.outcome == "running":
+                record.outcome = "passed"
+            if event["when"] == "teardown":
+                if record.outcome == "running":
+                    record.outcome = "passed"
+                self.finished.append(record)
+                return record
+        return None
+
+    @property
+    def total(self) -> int:
+        return sum(self.collected.values())
+
+    def count(self, outcome: str) -> int:
+        return sum(1 for record in self.finished if record.outcome == outcome)
+
+    def running(self) -> list:
+        return [record for record in self.tests.values() if record.outcome == "running"]
+
+    def slowest(self, limit: int = 10) -> list:
+        return sorted(self.finished, key=lambda record: record.duration, reverse=True)[:limit]
+
+    def failures(self) -> list:
+        return [record for record in self.finished if record.outcome in ("failed", "error")]
+
+
+HEADER = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: sans-serif; font-size: 13px; }}
+table {{ border-collapse: collapse; width: 100%; }}
+td, th {{ border: 1px solid #ccc; padding: 4px; text-align: left; vertical-align: top; }}
+.passed {{ color: #2a7d2a; }} .failed, .error {{ color: #b00; }} .skipped {{ color: #888; }}
+pre {{ margin: 0; white-space: pre-wrap; }}
+</style></head><body>
+<h1>{title}</h1>
+<table><tr><th>Test</th><th>Outcome</th><th>Duration</th><th>Worker</th><th>Actions</th><th>Artifacts</th><th>Details</th></tr>
+"""
+
+
+class StreamHtmlReport:
+    # Rows are appended as tests finish, so the file is readable mid-run and
+    # never has to be rebuilt from scratch. Artifacts are linked, not embedded.
+
+    def __init__(self, path, title: str = "Test Run"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(HEADER.format(title=html.escape(title)))
+        self._file.flush()
+
+    def add(self, record: RunRecord):
+        details = record.message
+        if record.network is not None:
+            network = record.network
+            details = (
+                f"network: {network['requests']} requests, {network['bytes'] / 1024:.0f} KB, "
+                f"{network['cache_hits']} cache hits\n{details}"
+            )
+        links = " ".join(
+            f'<a href="{html.escape(self.relative(artifact["path"]))}">{html.escape(artifact.get("kind", "file"))}</a>'
+            for artifact in record.artifacts
+        )
+        self._file.write(
+            f'<tr class="{record.outcome}"><td>{html.escape(record.nodeid)}</td>'
+            f"<td>{record.outcome}</td><td>{record.duration:.2f}s</td>"
+            f"<td>{html.escape(record.worker)}</td><td>{record.actions}</td><td>{links}</td>"
+            f"<td><pre>{html.escape(details)}</pre></td></tr>\n"
+        )
+        self._file.flush()
+
+    def relative(self, artifact_path: str) -> str:
+        try:
+            return Path(artifact_path).resolve().relative_to(self.path.parent.resolve()).as_posix()
+        except ValueError:
+            return Path(artifact_path).as_posix()
+
+    def close(self, state: RunState):
+        self._file.write(
+            f"</table><p>{state.count('passed')} passed, {state.count('failed')} failed, "
+            f"{state.count('error')} errors, {state.count('skipped')} skipped "
+            f"of {state.total} collected</p></body></html>\n"
+        )
+        self._file.close()
+        logger.info(f"Stream report written: {self.path}")
+
+
+def build_report(events, path, title: str = "Test Run") -> RunState:
+    state = RunState()
+    report = StreamHtmlReport(path, title)
+    for event in events:
+        record = state.feed(event)
+        if record is not None:
+            report.add(record)
+    report.close(state)
+    return state
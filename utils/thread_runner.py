@@ -0,0 +1,185 @@
+import os
+import queue
+import logging
+import threading
+from _pytest.fixtures import FixtureDef
+from _pytest.runner import SetupState, runtestprotocol
+from utils.scheduling import scope_group
+
+logger = logging.getLogger(__name__)
+
+
+# Thread mode (--threads N) runs tests in this process on N threads.
+#
+# Thread-confined: every fixture value. Fixture caching and pytest's setup
+# stack are made per-thread, so a session-scoped fixture is created once per
+# thread and lives for that thread's share of the run. That is what gives
+# each thread its own sync_playwright() and browser (the `browser` fixture),
+# and its own artifact store, static cache and seeder, whose SQLite
+# connections and HTTP sessions must not cross threads anyway. Playwright
+# objects (browser, context, page, request contexts) must never be handed to
+# another thread.
+#
+# Shared, and safe to share: config, the collected items, the event stream
+# (writes are locked), the log pipeline (one ring buffer per thread) and
+# the adaptive-timeout, stabilization, form-fill and route-latency
+# statistics (LatencyHistogram locks record and merge; the dicts holding
+# the histograms are only grown with setdefault, which is atomic).
+#
+# Main thread only: every reporting hook. Worker threads run the protocol
+# with log=False and hand their reports back; the main thread replays
+# logstart/logreport/logfinish, so the terminal, pytest-html, the session's
+# failure counts and this plugin's own bookkeeping never see two tests at
+# once.
+#
+# Tests sharing a class/module/package-scoped fixture, a readonly_page, or an
+# xdist_group run on one thread, in order, like they do on one xdist worker.
+
+
+class ThreadLocalAttribute:
+    # A data descriptor that overrides an instance attribute with one value
+    # per (instance, thread)
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def _values(self) -> dict:
+        values = getattr(self.local, "values", None)
+        if values is None:
+            values = self.local.values = {}
+        return values
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        values = self._values()
+        key = id(instance)
+        if key not in values:
+            values[key] = self.default()
+        return values[key]
+
+    def __set__(self, instance, value):
+        self._values()[id(instance)] = value
+
+
+class ThreadLocalSetupState:
+    # Stands in for session._setupstate: each thread keeps its own stack of
+    # set-up nodes, so one thread's teardown never touches another's tests
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def _state(self) -> SetupState:
+        state = getattr(self.local, "state", None)
+        if state is None:
+            state = self.local.state = SetupState()
+        return state
+
+    def __getattr__(self, name):
+        return getattr(self._state(), name)
+
+
+def isolate_fixtures(session):
+    FixtureDef.cached_result = ThreadLocalAttribute(lambda: None)
+    FixtureDef._finalizers = ThreadLocalAttribute(list)
+    session._setupstate = ThreadLocalSetupState()
+
+
+def current_worker() -> str:
+    # Used wherever a per-process worker name keyed shared state
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker:
+        return worker
+    name = threading.current_thread().name
+    return name if name.startswith("th") and name[2:].isdigit() else "main"
+
+
+def thread_group(item) -> str:
+    marker = item.get_closest_marker("xdist_group")
+    if marker is not None:
+        return marker.kwargs.get("name", marker.args[0] if marker.args else "")
+    return scope_group(item)
+
+
+class ThreadRunner:
+
+    def __init__(self, session, threads: int, test_scope):
+        self.session = session
+        self.threads = threads
+        self.test_scope = test_scope
+        self.work = queue.Queue()
+        self.results = queue.Queue()
+
+    def _next_item(self, pending: list):
+        if not pending:
+            if self.session.shouldstop or self.session.shouldfail:
+                return None
+            try:
+                pending.extend(self.work.get_nowait())
+            except queue.Empty:
+                return None
+        return pending.pop(0)
+
+    def _worker(self):
+        pending = []
+        item = self._next_item(pending)
+        try:
+            while item is not None:
+                # The next item decides what teardown_exact keeps alive, so
+                # it is claimed before this one runs
+                nextitem = self._next_item(pending)
+                self.results.put(("start", item, None))
+                with self.test_scope(item):
+                    reports = runtestprotocol(item, log=False, nextitem=nextitem)
+                self.results.put(("finish", item, reports))
+                item = nextitem
+        except BaseException as e:
+            self.results.put(("error", None, e))
+        finally:
+            # A stop request or an escaped error can leave the last test's
+            # broader fixtures up, this thread's browser among them
+            try:
+                self.session._setupstate.teardown_exact(None)
+            except BaseException as e:
+                self.results.put(("error", None, e))
+            self.results.put(("done", None, None))
+
+    def run(self):
+        groups = {}
+        for item in self.session.items:
+            groups.setdefault(thread_group(item), []).append(item)
+        for members in groups.values():
+            self.work.put(members)
+
+        isolate_fixtures(self.session)
+        threads = [
+            threading.Thread(target=self._worker, name=f"th{index}", daemon=True)
+            for index in range(min(self.threads, len(groups)))
+        ]
+        logger.info(f"Running {len(self.session.items)} tests in {len(groups)} groups on {len(threads)} threads")
+        for thread in threads:
+            thread.start()
+
+        running = len(threads)
+        error = None
+        while running:
+            kind, item, payload = self.results.get()
+            if kind == "start":
+                item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+            elif kind == "finish":
+                for report in payload:
+                    item.ihook.pytest_runtest_logreport(report=report)
+                item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+            elif kind == "error":
+                error = error or payload
+            elif kind == "done":
+                running -= 1
+        for thread in threads:
+            thread.join()
+        if error is not None:
+            raise error
+        if self.session.shouldfail:
+            raise self.session.Failed(self.session.shouldfail)
+        if self.session.shouldstop:
+            raise self.session.Interrupted(self.session.shouldstop)
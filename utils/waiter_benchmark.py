@@ -0,0 +1,70 @@
+"""
+Waiter latency benchmark
+Measures the time from a condition becoming true in the page to the test
+resuming, for locator.wait_for (the previous helpers) and the DOM waiters
+Usage: python -m utils.waiter_benchmark [--runs 30]
+"""
+
+import sys
+import time
+import argparse
+from statistics import mean, median
+from playwright.sync_api import sync_playwright
+from utils import dom_waiters
+
+PAGE = """
+<button id="go">go</button>
+<div id="target" style="display:none">ready</div>
+<script>
+  window.reveal = (delay) => setTimeout(() => {
+    document.getElementById('target').style.display = 'block';
+    window.__revealedAt = performance.timeOrigin + performance.now();
+  }, delay);
+</script>
+"""
+
+
+def percentile(values: list, percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+def measure(page, wait, runs: int, delay_ms: int) -> list:
+    latencies = []
+    for _ in range(runs):
+        page.set_content(PAGE)
+        page.evaluate(f"reveal({delay_ms})")
+        wait(page)
+        resumed = time.time() * 1000
+        latencies.append(resumed - page.evaluate("window.__revealedAt"))
+    return latencies
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare waiter resume latency")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--delay", type=int, default=150, help="ms before the element appears")
+    args = parser.parse_args(argv)
+
+    strategies = {
+        "locator.wait_for": lambda page: page.locator("#target").wait_for(state="visible"),
+        "dom_waiters": lambda page: dom_waiters.wait_for_conditions(page, [dom_waiters.visible("#target")]),
+    }
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context = browser.new_context()
+        dom_waiters.install(context)
+        page = context.new_page()
+
+        print(f"{'strategy':20} {'mean':>8} {'p50':>8} {'p95':>8}  (ms, condition-true to resume)")
+        for name, wait in strategies.items():
+            latencies = measure(page, wait, args.runs, args.delay)
+            print(f"{name:20} {mean(latencies):8.1f} {median(latencies):8.1f} {percentile(latencies, 95):8.1f}")
+
+        browser.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
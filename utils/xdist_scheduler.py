@@ -0,0 +1,68 @@
+import time
+import logging
+from xdist.scheduler import LoadGroupScheduling
+
+logger = logging.getLogger(__name__)
+
+
+class LongestFirstScheduling(LoadGroupScheduling):
+    # Work units are handed out in collection order, which pytest_plugins has
+    # already sorted longest-first. Only used under --dist loadgroup (plain
+    # -n is switched to it in pytest_configure): units are then xdist_group
+    # names (one per fixture-scope group) or single tests, so shared setup
+    # is never split.
+    # With a memory throttle, idle workers get no new unit while memory is
+    # above its threshold, as long as another worker still has tests.
+
+    def __init__(self, config, log=None, throttle=None):
+        super().__init__(config, log)
+        self.last_completion = {}
+        self.busy_time = {}
+        self.throttle = throttle
+        self.deferred = []
+
+    def _assign_work_unit(self, node):
+        if self.throttle is not None and self.throttle.high() and any(
+            self._pending_of(assigned) for other, assigned in self.assigned_work.items() if other is not node
+        ):
+            if node not in self.deferred:
+                self.deferred.append(node)
+                self.throttle.deferrals += 1
+            return
+        super()._assign_work_unit(node)
+
+    def mark_test_complete(self, node, item_index, duration=0):
+        worker = node.gateway.id
+        self.last_completion[worker] = time.monotonic()
+        self.busy_time[worker] = self.busy_time.get(worker, 0.0) + duration
+        # Paused workers go first; otherwise the worker that just finished
+        # takes the next unit and can drain the queue before they resume
+        self._resume_deferred()
+        super().mark_test_complete(node, item_index, duration)
+
+    def _resume_deferred(self):
+        deferred, self.deferred = self.deferred, []
+        for node in deferred:
+            if node in self.assigned_work and not self._pending_of(self.assigned_work[node]):
+                self._reschedule(node)
+
+    def remove_node(self, node):
+        if node in self.deferred:
+            self.deferred.remove(node)
+        return super().remove_node(node)
+
+    def idle_tail(self) -> dict:
+        if not self.last_completion:
+            return {}
+        finished_at = max(self.last_completion.values())
+        return {
+            worker: finished_at - last
+            for worker, last in sorted(self.last_completion.items())
+        }
+
+    def summary_lines(self) -> list:
+        lines = []
+        for worker, idle in self.idle_tail().items():
+            busy = self.busy_time.get(worker, 0.0)
+            lines.append(f"{worker}: busy {busy:.1f}s, idle tail {idle:.1f}s")
+        return lines
@@ -1,105 +1,157 @@
 """
 Setup Verification Script
-Run this to verify your automation testing environment is set up correctly
-Usage: python verify_setup.py
+Run this to verify your automation testing environment is set up correctly.
+Checks run concurrently; environment checks are cached until something they
+depend on changes, performance probes always run.
+Usage: python verify_setup.py [--json] [--no-cache] [--no-probes] [--strict]
 """
 
+import os
 import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
 import subprocess
 from pathlib import Path
+from statistics import median
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+
+CACHE_FILE = Path(".verify_setup_cache.json")
+REQUIRED_PACKAGES = ['pytest', 'playwright', 'faker']
+LATENCY_SAMPLES = 5
+
+PASS, WARN, FAIL = "pass", "warn", "fail"
+ICONS = {PASS: "✅", WARN: "⚠️ ", FAIL: "❌"}
+
+
+class CheckResult:
+
+    def __init__(self, status: str, message: str, hint: str = None, **data):
+        self.status = status
+        self.message = message
+        self.hint = hint
+        self.data = data
+        self.duration_ms = 0.0
+        self.cached = False
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "message": self.message,
+            "hint": self.hint,
+            "data": self.data,
+            "duration_ms": round(self.duration_ms, 1),
+            "cached": self.cached,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CheckResult":
+        result = cls(data["status"], data["message"], data.get("hint"), **data.get("data", {}))
+        result.duration_ms = data.get("duration_ms", 0.0)
+        result.cached = True
+        return result
+
+
+def _version(package: str) -> str:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return "missing"
+
+
+def _tree_state(*patterns) -> list:
+    return sorted(
+        (str(path), path.stat().st_mtime_ns, path.stat().st_size)
+        for pattern in patterns for path in Path(".").glob(pattern)
+    )
+
+
+def _browsers_dir() -> Path:
+    configured = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+    if configured and configured != "0":
+        return Path(configured)
+    if sys.platform == "win32":
+        return Path(os.environ.get("LOCALAPPDATA", "")) / "ms-playwright"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "ms-playwright"
+    return Path.home() / ".cache" / "ms-playwright"
+
+
+def fingerprint(inputs) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def environment_inputs() -> dict:
+    """Everything the cached checks depend on, grouped by check"""
+    interpreter = [sys.version, sys.prefix]
+    browsers = _browsers_dir()
+    return {
+        "Python Version": interpreter,
+        "Virtual Environment": interpreter,
+        "Required Packages": interpreter + [_version(package) for package in REQUIRED_PACKAGES],
+        "Playwright Browsers": interpreter + [
+            _version("playwright"), str(browsers),
+            sorted(path.name for path in browsers.iterdir()) if browsers.is_dir() else [],
+        ],
+        "Pytest Plugins": interpreter + [
+            f"{dist.metadata['Name']}=={dist.version}" for dist in metadata.distributions()
+            if (dist.metadata["Name"] or "").lower().startswith("pytest")
+        ] + _tree_state("*.py", "pytest.ini", ".env", "tests/*.py", "pages/*.py", "utils/*.py"),
+    }
 
 
 def check_python_version():
     """Check if Python version is 3.8 or higher"""
-    print("🔍 Checking Python version...", end=" ")
     version = sys.version_info
     if version.major >= 3 and version.minor >= 8:
-        print(f"✅ Python {version.major}.{version.minor}.{version.micro}")
-        return True
-    else:
-        print(f"❌ Python {version.major}.{version.minor} (need 3.8+)")
-        return False
+        return CheckResult(PASS, f"Python {version.major}.{version.minor}.{version.micro}")
+    return CheckResult(FAIL, f"Python {version.major}.{version.minor} (need 3.8+)")
 
 
 def check_virtual_env():
     """Check if virtual environment is activated"""
-    print("🔍 Checking virtual environment...", end=" ")
     in_venv = hasattr(sys, 'real_prefix') or (
         hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix
     )
     if in_venv:
-        print("✅ Virtual environment activated")
-        return True
-    else:
-        print("⚠️  Virtual environment not detected")
-        print("   Run: .\\env\\Scripts\\Activate.ps1")
-        return False
+        return CheckResult(PASS, "Virtual environment activated")
+    return CheckResult(WARN, "Virtual environment not detected", "Run: .\\env\\Scripts\\Activate.ps1")
 
 
 def check_required_packages():
     """Check if required packages are installed"""
-    print("🔍 Checking required packages...", end=" ")
-    required = ['pytest', 'playwright', 'faker']
-    missing = []
-
-    for package in required:
-        try:
-            __import__(package)
-        except ImportError:
-            missing.append(package)
-
+    missing = [package for package in REQUIRED_PACKAGES if _version(package) == "missing"]
     if not missing:
-        print("✅ All packages installed")
-        return True
-    else:
-        print(f"❌ Missing: {', '.join(missing)}")
-        print(f"   Run: pip install {' '.join(missing)}")
-        return False
+        return CheckResult(PASS, "All packages installed", versions={
+            package: _version(package) for package in REQUIRED_PACKAGES
+        })
+    return CheckResult(FAIL, f"Missing: {', '.join(missing)}", f"Run: pip install {' '.join(missing)}")
 
 
 def check_playwright_browsers():
-    """Check if Playwright browsers are installed"""
-    print("🔍 Checking Playwright browsers...", end=" ")
-    try:
-        result = subprocess.run(
-            ['playwright', 'install', '--dry-run'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        if result.returncode == 0:
-            print("✅ Playwright browsers installed")
-            return True
-        else:
-            print("❌ Playwright browsers not found")
-            print("   Run: playwright install chromium")
-            return False
-    except Exception as e:
-        print(f"⚠️  Could not verify: {str(e)}")
-        return False
+    """Check if the Chromium build this Playwright version drives is installed"""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        executable = p.chromium.executable_path
+    if Path(executable).exists():
+        return CheckResult(PASS, "Playwright browsers installed", executable=executable)
+    return CheckResult(FAIL, "Playwright browsers not found", "Run: playwright install chromium")
 
 
 def check_project_structure():
     """Check if all required directories exist"""
-    print("🔍 Checking project structure...", end=" ")
-    required_dirs = ['tests', 'pages', 'utils', 'reports']
-    missing_dirs = []
-
-    for dir_name in required_dirs:
-        if not Path(dir_name).exists():
-            missing_dirs.append(dir_name)
-
+    missing_dirs = [name for name in ['tests', 'pages', 'utils', 'reports'] if not Path(name).exists()]
     if not missing_dirs:
-        print("✅ All directories exist")
-        return True
-    else:
-        print(f"❌ Missing: {', '.join(missing_dirs)}")
-        return False
+        return CheckResult(PASS, "All directories exist")
+    return CheckResult(FAIL, f"Missing: {', '.join(missing_dirs)}")
 
 
 def check_required_files():
     """Check if all required files exist"""
-    print("🔍 Checking required files...", end=" ")
     required_files = [
         'conftest.py',
         'pytest.ini',
@@ -107,97 +159,227 @@ def check_required_files():
         'requirements.txt',
         'README.md'
     ]
-    missing_files = []
-
-    for file_name in required_files:
-        if not Path(file_name).exists():
-            missing_files.append(file_name)
-
+    missing_files = [name for name in required_files if not Path(name).exists()]
     if not missing_files:
-        print("✅ All files exist")
-        return True
-    else:
-        print(f"❌ Missing: {', '.join(missing_files)}")
-        return False
+        return CheckResult(PASS, "All files exist")
+    return CheckResult(FAIL, f"Missing: {', '.join(missing_files)}")
 
 
 def check_env_file():
     """Check if .env file exists"""
-    print("🔍 Checking .env file...", end=" ")
     if Path('.env').exists():
-        print("✅ .env file exists")
-        return True
-    else:
-        print("⚠️  .env file not found")
-        print("   Run: copy .env.example .env")
-        return False
+        return CheckResult(PASS, ".env file exists")
+    return CheckResult(WARN, ".env file not found", "Run: copy .env.example .env")
 
 
 def check_pytest_plugins():
-    """Check if pytest can find custom plugins"""
-    print("🔍 Checking pytest plugins...", end=" ")
+    """Check if pytest can load the plugins and collect the suite"""
+    result = subprocess.run(
+        [sys.executable, '-m', 'pytest', '--collect-only', '-q', '--no-site-health', '--no-event-stream'],
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    if result.returncode == 0:
+        collected = next((line for line in reversed(result.stdout.splitlines()) if "collected" in line), "")
+        return CheckResult(PASS, f"Pytest working correctly ({collected.strip('= ') or 'collected'})")
+    tail = (result.stdout + result.stderr).strip().splitlines()[-3:]
+    return CheckResult(FAIL, "Pytest issue detected", "\n".join(tail))
+
+
+def probe_browser():
+    """Time a Chromium launch and a new context with page, as the fixtures do"""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        started = time.perf_counter()
+        browser = p.chromium.launch(headless=True)
+        launch_ms = (time.perf_counter() - started) * 1000
+        contexts = []
+        for _ in range(3):
+            started = time.perf_counter()
+            context = browser.new_context()
+            context.new_page()
+            contexts.append((time.perf_counter() - started) * 1000)
+            context.close()
+        browser.close()
+    context_ms = median(contexts)
+    return CheckResult(
+        PASS, f"launch {launch_ms:.0f}ms, new context + page {context_ms:.0f}ms (median of {len(contexts)})",
+        launch_ms=round(launch_ms, 1), context_ms=round(context_ms, 1),
+    )
+
+
+def probe_site_latency():
+    """Time requests to BASE_URL over one kept-alive connection"""
+    import requests
+    from config import BASE_URL, SITE_HEALTH_TIMEOUT
+
+    url = f"{BASE_URL}/index.php?route=common/home"
+    samples = []
+    with requests.Session() as session:
+        for _ in range(LATENCY_SAMPLES):
+            started = time.perf_counter()
+            response = session.get(url, timeout=SITE_HEALTH_TIMEOUT)
+            samples.append((time.perf_counter() - started) * 1000)
+    if response.status_code >= 500:
+        return CheckResult(FAIL, f"{BASE_URL} answered HTTP {response.status_code}", base_url=BASE_URL)
+    # The first request pays for DNS, TCP and TLS; the rest reuse the connection
+    return CheckResult(
+        PASS, f"{BASE_URL}: first request {samples[0]:.0f}ms, then p50 {median(samples[1:]):.0f}ms",
+        base_url=BASE_URL, first_ms=round(samples[0], 1), p50_ms=round(median(samples[1:]), 1),
+    )
+
+
+CHECKS = [
+    ("Python Version", check_python_version),
+    ("Virtual Environment", check_virtual_env),
+    ("Required Packages", check_required_packages),
+    ("Playwright Browsers", check_playwright_browsers),
+    ("Project Structure", check_project_structure),
+    ("Required Files", check_required_files),
+    (".env File", check_env_file),
+    ("Pytest Plugins", check_pytest_plugins),
+]
+
+PROBES = [
+    ("Browser Startup", probe_browser),
+    ("Site Latency", probe_site_latency),
+]
+
+
+def run_check(check_func) -> CheckResult:
+    started = time.perf_counter()
     try:
-        result = subprocess.run(
-            ['pytest', '--collect-only', '-q'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        if result.returncode == 0:
-            print("✅ Pytest working correctly")
-            return True
-        else:
-            print("⚠️  Pytest issue detected")
-            return False
+        result = check_func()
     except Exception as e:
-        print(f"⚠️  Could not verify: {str(e)}")
-        return False
+        message = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+        result = CheckResult(FAIL, f"Error: {message[:200]}")
+    result.duration_ms = (time.perf_counter() - started) * 1000
+    return result
 
 
-def main():
-    """Run all checks"""
-    print("\n" + "="*50)
-    print("🧪 Automation Testing Setup Verification")
-    print("="*50 + "\n")
+def load_cache() -> dict:
+    try:
+        return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
 
-    checks = [
-        ("Python Version", check_python_version),
-        ("Virtual Environment", check_virtual_env),
-        ("Required Packages", check_required_packages),
-        ("Playwright Browsers", check_playwright_browsers),
-        ("Project Structure", check_project_structure),
-        ("Required Files", check_required_files),
-        (".env File", check_env_file),
-        ("Pytest Plugins", check_pytest_plugins),
-    ]
 
-    results = []
-    for name, check_func in checks:
-        try:
-            results.append(check_func())
-        except Exception as e:
-            print(f"❌ Error checking {name}: {str(e)}")
-            results.append(False)
+def save_cache(cache: dict):
+    try:
+        CACHE_FILE.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+    except OSError:
+        pass
+
 
-    print("\n" + "="*50)
-    passed = sum(results)
-    total = len(results)
+def apply_thresholds(results: dict, max_launch_ms: float, max_context_ms: float, max_latency_ms: float):
+    limits = [
+        ("Browser Startup", "launch_ms", max_launch_ms),
+        ("Browser Startup", "context_ms", max_context_ms),
+        ("Site Latency", "p50_ms", max_latency_ms),
+    ]
+    for name, key, limit in limits:
+        result = results.get(name)
+        if limit is None or result is None or result.status != PASS or key not in result.data:
+            continue
+        if result.data[key] > limit:
+            result.status = FAIL
+            result.hint = f"{key} {result.data[key]:.0f} exceeds the {limit:.0f}ms budget"
+
+
+def run(use_cache: bool, probes: bool) -> tuple:
+    inputs = environment_inputs()
+    cache = load_cache() if use_cache else {}
+    results = {}
+    pending = []
+    for name, check_func in CHECKS:
+        cached = cache.get(name)
+        key = fingerprint(inputs[name]) if name in inputs else None
+        # Only passing results are reused; a failure is re-checked every time
+        if key is not None and cached and cached.get("fingerprint") == key and cached["result"]["status"] == PASS:
+            results[name] = CheckResult.from_dict(cached["result"])
+        else:
+            pending.append((name, check_func))
+    if probes:
+        pending.extend(PROBES)
+
+    with ThreadPoolExecutor(max_workers=len(pending) or 1) as pool:
+        futures = {name: pool.submit(run_check, check_func) for name, check_func in pending}
+        for name, future in futures.items():
+            results[name] = future.result()
+
+    for name, result in results.items():
+        if name in inputs and not result.cached and result.status == PASS:
+            cache[name] = {"fingerprint": fingerprint(inputs[name]), "result": result.as_dict()}
+    save_cache(cache)
+    order = [name for name, _ in CHECKS + (PROBES if probes else [])]
+    return {name: results[name] for name in order}, fingerprint(inputs)
+
+
+def print_results(results: dict, passed: bool, elapsed: float):
+    for name, result in results.items():
+        suffix = " (cached)" if result.cached else f" ({result.duration_ms:.0f}ms)"
+        print(f"🔍 {name}... {ICONS[result.status]} {result.message}{suffix}")
+        if result.hint:
+            for line in result.hint.splitlines():
+                print(f"   {line}")
 
-    if all(results):
-        print(f"✅ All checks passed! ({passed}/{total})")
+    print("\n" + "="*50)
+    ok = sum(1 for result in results.values() if result.status == PASS)
+    if passed:
+        print(f"✅ All checks passed! ({ok}/{len(results)}) in {elapsed:.1f}s")
         print("\n🚀 You're ready to run tests!")
         print("\nQuick start:")
         print("  pytest -v              # Run all tests")
         print("  pytest -k login        # Run tests with 'login' in name")
         print("\n📊 View HTML report: reports/report.html")
     else:
-        print(f"⚠️  Some checks failed. ({passed}/{total})")
+        print(f"⚠️  Some checks failed. ({ok}/{len(results)}) in {elapsed:.1f}s")
         print("\n📋 Please fix the issues above and run this script again.")
 
     print("="*50 + "\n")
 
-    return 0 if all(results) else 1
+
+def main(argv=None):
+    """Run all checks"""
+    parser = argparse.ArgumentParser(description="Verify the test environment and measure its startup costs")
+    parser.add_argument("--json", action="store_true", help="print one JSON document for CI gating")
+    parser.add_argument("--no-cache", action="store_true", help="re-run every check instead of reusing cached passes")
+    parser.add_argument("--no-probes", action="store_true", help="skip the browser and site latency probes")
+    parser.add_argument("--strict", action="store_true", help="treat warnings (no venv, no .env) as failures")
+    parser.add_argument("--max-launch-ms", type=float, help="fail if the browser launch takes longer")
+    parser.add_argument("--max-context-ms", type=float, help="fail if a new context + page takes longer")
+    parser.add_argument("--max-latency-ms", type=float, help="fail if the site's p50 latency is higher")
+    args = parser.parse_args(argv)
+
+    if not args.json:
+        print("\n" + "="*50)
+        print("🧪 Automation Testing Setup Verification")
+        print("="*50 + "\n")
+
+    started = time.perf_counter()
+    results, env_fingerprint = run(use_cache=not args.no_cache, probes=not args.no_probes)
+    apply_thresholds(results, args.max_launch_ms, args.max_context_ms, args.max_latency_ms)
+    elapsed = time.perf_counter() - started
+
+    failing = {FAIL, WARN} if args.strict else {FAIL}
+    passed = not any(result.status in failing for result in results.values())
+
+    if args.json:
+        print(json.dumps({
+            "passed": passed,
+            "strict": args.strict,
+            "fingerprint": env_fingerprint,
+            "python": platform.python_version(),
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "checks": {name: result.as_dict() for name, result in results.items()},
+        }, indent=2))
+    else:
+        print_results(results, passed, elapsed)
+
+    return 0 if passed else 1
 
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())